@@ -1,6 +1,8 @@
 # Write the benchmarking functions here.
 # See "Writing benchmarks" in the asv docs for more information.
+import asyncio
 import os.path as osp
+import time
 import numpy as np
 from tempfile import TemporaryDirectory
 import h5py
@@ -15,6 +17,10 @@ class TimeSuite:
         path = osp.join(self._td.name, 'test.h5')
         with h5py.File(path, 'w') as f:
             f['a'] = np.arange(100000)
+            table = np.zeros(100000, dtype=[('x', 'f8'), ('y', 'f8'), ('id', 'i4')])
+            f['table'] = table
+            f.create_dataset('compressed', data=np.random.default_rng(0).random((20000, 64)),
+                             chunks=(1000, 64), compression='gzip')
 
         self.f = h5py.File(path, 'r')
 
@@ -27,6 +33,92 @@ class TimeSuite:
         for i in range(10000):
             arr = ds[i * 10:(i + 1) * 10]
 
+    def time_many_small_reads_batched(self):
+        ds = self.f['a']
+        arrs = ds.read_many([np.s_[i * 10:(i + 1) * 10] for i in range(10000)])
+
+    def time_many_small_reads_compound(self):
+        ds = self.f['table']
+        for i in range(10000):
+            arr = ds[i * 10:(i + 1) * 10]
+
+    def time_many_small_reads_field(self):
+        ds = self.f['table']
+        for i in range(10000):
+            arr = ds['x', i * 10:(i + 1) * 10]
+
+    def time_iter_rows_compressed(self):
+        for row in self.f['compressed']:
+            pass
+
+    def time_many_small_reads_mmap(self):
+        arr = self.f['a'].as_mmap()
+        for i in range(10000):
+            chunk = np.array(arr[i * 10:(i + 1) * 10])
+
+class FancyIndexTimeSuite:
+    """Reading with arrays of indices (fancy indexing) in different patterns"""
+    params = ['dense', 'sparse', 'clustered']
+    param_names = ['pattern']
+
+    def setup(self, pattern):
+        self._td = TemporaryDirectory()
+        path = osp.join(self._td.name, 'test.h5')
+        n = 10_000_000
+        with h5py.File(path, 'w') as f:
+            f['a'] = np.arange(n, dtype='i4')
+
+        rng = np.random.default_rng(0)
+        if pattern == 'dense':
+            self.index = np.arange(n // 10)
+        elif pattern == 'sparse':
+            self.index = np.sort(rng.choice(n, 100_000, replace=False))
+        else:
+            starts = rng.choice(n - 50, 2000, replace=False)
+            self.index = np.unique((starts[:, None] + np.arange(50)).ravel())
+
+        self.f = h5py.File(path, 'r')
+
+    def teardown(self, pattern):
+        self.f.close()
+        self._td.cleanup()
+
+    def time_read_fancy(self, pattern):
+        self.f['a'][self.index]
+
+class MaskTimeSuite:
+    """Reading with boolean masks, covering regions or scattered points"""
+    params = ['regions', 'scattered']
+    param_names = ['pattern']
+
+    def setup(self, pattern):
+        self._td = TemporaryDirectory()
+        path = osp.join(self._td.name, 'test.h5')
+        shape = (2000, 5000)
+        with h5py.File(path, 'w') as f:
+            f['a'] = np.ones(shape, dtype='f4')
+
+        rng = np.random.default_rng(0)
+        if pattern == 'regions':
+            # Circular blobs, like cloud cover in satellite images
+            yy, xx = np.ogrid[:shape[0], :shape[1]]
+            self.mask = np.zeros(shape, dtype=bool)
+            for _ in range(40):
+                cy, cx = rng.integers(0, shape[0]), rng.integers(0, shape[1])
+                r = rng.integers(50, 300)
+                self.mask |= (yy - cy) ** 2 + (xx - cx) ** 2 < r * r
+        else:
+            self.mask = rng.random(shape) < 0.01
+
+        self.f = h5py.File(path, 'r')
+
+    def teardown(self, pattern):
+        self.f.close()
+        self._td.cleanup()
+
+    def time_read_mask(self, pattern):
+        self.f['a'][self.mask]
+
 class WritingTimeSuite:
     """Based on example in GitHub issue 492:
     https://github.com/h5py/h5py/issues/492
@@ -55,3 +147,223 @@ class WritingTimeSuite:
         data = np.zeros(self.shape[:2])
         for i in range(self.shape[2]):
             ds[..., i:i+1] = data[..., np.newaxis]
+
+class ParallelCompressTimeSuite:
+    """Writing a large array to a gzip-compressed dataset"""
+    params = [None, 1, 4]
+    param_names = ['threads']
+
+    def setup(self, threads):
+        self._td = TemporaryDirectory()
+        path = osp.join(self._td.name, 'test.h5')
+        self.f = h5py.File(path, 'w')
+        rng = np.random.default_rng(0)
+        self.data = rng.integers(0, 100, size=(4000, 1000)).astype(np.float32)
+        self.ds = self.f.create_dataset(
+            'a', shape=self.data.shape, dtype=np.float32, chunks=(100, 1000),
+            compression='gzip', shuffle=True,
+        )
+
+    def teardown(self, threads):
+        self.f.close()
+        self._td.cleanup()
+
+    def time_write(self, threads):
+        if threads is None:
+            self.ds[()] = self.data
+        else:
+            self.ds.write_parallel(self.data, threads=threads)
+
+class ReduceTimeSuite:
+    """Finding the variance of a gzip-compressed dataset"""
+    params = [None, 1, 4]
+    param_names = ['workers']
+
+    def setup(self, workers):
+        self._td = TemporaryDirectory()
+        path = osp.join(self._td.name, 'test.h5')
+        rng = np.random.default_rng(0)
+        with h5py.File(path, 'w') as f:
+            f.create_dataset(
+                'a', data=rng.integers(0, 100, size=(4000, 1000)).astype(np.float32),
+                chunks=(100, 1000), compression='gzip', shuffle=True,
+            )
+        self.f = h5py.File(path, 'r')
+
+    def teardown(self, workers):
+        self.f.close()
+        self._td.cleanup()
+
+    def time_var(self, workers):
+        if workers is None:
+            self.f['a'][()].var()
+        else:
+            self.f['a'].reduce('var', workers=workers)
+
+class MapBlocksTimeSuite:
+    """Scaling one gzip-compressed dataset into another"""
+    params = [None, 1, 4]
+    param_names = ['workers']
+
+    def setup(self, workers):
+        self._td = TemporaryDirectory()
+        path = osp.join(self._td.name, 'test.h5')
+        self.f = h5py.File(path, 'w')
+        rng = np.random.default_rng(0)
+        self.src = self.f.create_dataset(
+            'a', data=rng.integers(0, 100, size=(4000, 1000)).astype(np.float32),
+            chunks=(100, 1000), compression='gzip', shuffle=True,
+        )
+        self.out = self.f.create_dataset(
+            'b', shape=self.src.shape, dtype=np.float32, chunks=(100, 1000),
+            compression='gzip', shuffle=True,
+        )
+
+    def teardown(self, workers):
+        self.f.close()
+        self._td.cleanup()
+
+    def time_scale(self, workers):
+        if workers is None:
+            for i in range(0, 4000, 100):
+                self.out[i:i + 100] = self.src[i:i + 100] * 0.5
+        else:
+            self.src.map_blocks(lambda a: a * 0.5, self.out, workers=workers)
+
+class AsStrTimeSuite:
+    """Decoding a million variable-length UTF-8 strings"""
+    params = ['object', 'T']
+    param_names = ['dtype']
+
+    def setup(self, dtype):
+        if dtype == 'T' and np.__version__ < '2':
+            raise NotImplementedError("StringDType needs NumPy 2")
+        self._td = TemporaryDirectory()
+        path = osp.join(self._td.name, 'test.h5')
+        with h5py.File(path, 'w') as f:
+            f.create_dataset(
+                'a', data=[f'fàilte {i}' for i in range(1_000_000)],
+                dtype=h5py.string_dtype(),
+            )
+        self.f = h5py.File(path, 'r')
+
+    def teardown(self, dtype):
+        self.f.close()
+        self._td.cleanup()
+
+    def time_asstr(self, dtype):
+        self.f['a'].asstr(dtype=dtype)[()]
+
+class RaggedTimeSuite:
+    """Reading and writing a million short variable-length sequences"""
+    params = ['objects', 'ragged']
+    param_names = ['api']
+
+    def setup(self, api):
+        self._td = TemporaryDirectory()
+        path = osp.join(self._td.name, 'test.h5')
+        self.f = h5py.File(path, 'w')
+        rng = np.random.default_rng(0)
+        lengths = rng.integers(0, 8, size=1_000_000)
+        self.offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.offsets[1:])
+        self.values = rng.random(self.offsets[-1])
+        self.seqs = np.empty(len(lengths), dtype=object)
+        self.seqs[:] = np.split(self.values, self.offsets[1:-1])
+        self.ds = self.f.create_dataset('a', (len(lengths),), dtype=h5py.vlen_dtype('f8'))
+        self.ds.write_ragged((), self.values, self.offsets)
+
+    def teardown(self, api):
+        self.f.close()
+        self._td.cleanup()
+
+    def time_read(self, api):
+        if api == 'objects':
+            self.ds[()]
+        else:
+            self.ds.read_ragged()
+
+    def time_write(self, api):
+        if api == 'objects':
+            self.ds[()] = self.seqs
+        else:
+            self.ds.write_ragged((), self.values, self.offsets)
+
+class StringsBuffersTimeSuite:
+    """Reading and writing a million variable-length strings"""
+    params = ['objects', 'buffers']
+    param_names = ['api']
+
+    def setup(self, api):
+        self._td = TemporaryDirectory()
+        path = osp.join(self._td.name, 'test.h5')
+        self.f = h5py.File(path, 'w')
+        self.strings = np.array([f'fàilte {i}'.encode() for i in range(1_000_000)], dtype=object)
+        self.ds = self.f.create_dataset('a', data=self.strings, dtype=h5py.string_dtype())
+        self.offsets, self.data = self.ds.read_strings_buffers()
+
+    def teardown(self, api):
+        self.f.close()
+        self._td.cleanup()
+
+    def time_read(self, api):
+        if api == 'objects':
+            self.ds[()]
+        else:
+            self.ds.read_strings_buffers()
+
+    def time_write(self, api):
+        if api == 'objects':
+            self.ds[()] = self.strings
+        else:
+            self.ds.write_strings_buffers((), self.offsets, self.data)
+
+class AsyncTimeSuite:
+    """Reads through the asyncio API, with other tasks sharing the event loop.
+
+    track_loop_latency measures the worst delay seen by a task which wakes
+    up every millisecond, while many reads are in flight.
+    """
+    def setup(self):
+        self._td = TemporaryDirectory()
+        path = osp.join(self._td.name, 'test.h5')
+        with h5py.File(path, 'w') as f:
+            f.create_dataset(
+                'a', data=np.arange(4_000_000, dtype='f8').reshape(1000, 4000),
+                chunks=(10, 4000), compression='gzip',
+            )
+
+        self.f = h5py.File(path, 'r')
+
+    def teardown(self):
+        self.f.close()
+        self._td.cleanup()
+
+    async def _concurrent_reads(self):
+        ds = self.f['a']
+        await asyncio.gather(*[
+            ds.aread(np.s_[i:i + 10]) for i in range(0, 1000, 10)
+        ])
+
+    def time_concurrent_areads(self):
+        asyncio.run(self._concurrent_reads())
+
+    def track_loop_latency(self):
+        async def ticker(stop, delays):
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                await asyncio.sleep(0.001)
+                delays.append(time.perf_counter() - t0 - 0.001)
+
+        async def main():
+            stop = asyncio.Event()
+            delays = []
+            tick = asyncio.create_task(ticker(stop, delays))
+            await self._concurrent_reads()
+            stop.set()
+            await tick
+            return max(delays)
+
+        return asyncio.run(main()) * 1000
+
+    track_loop_latency.unit = "ms"
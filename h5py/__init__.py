@@ -55,7 +55,7 @@ _register_lzf()
 
 from . import h5a, h5d, h5ds, h5f, h5fd, h5g, h5r, h5s, h5t, h5p, h5z, h5pl
 
-from ._hl import filters
+from ._hl import filters, reducers
 from ._hl.base import is_hdf5, HLObject, Empty
 from ._hl.files import (
     File,
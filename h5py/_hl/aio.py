@@ -0,0 +1,140 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2020 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Support for using datasets from asyncio code.
+
+    HDF5 calls are serialised by the global lock (phil), so running more than
+    one at a time on a thread pool gains nothing.  Instead, requests from all
+    event loops go to a single worker thread, which runs them back-to-back as
+    they arrive.  Awaiting code is resumed via call_soon_threadsafe, so the
+    event loop is never blocked on HDF5.  The queue is bounded: when it is
+    full, submitting callers await a free slot.
+"""
+
+import asyncio
+import queue
+import threading
+
+
+MAX_PENDING = 64
+
+
+class IOWorker:
+    """ A dedicated thread running queued blocking calls in order.
+
+    At most max_pending calls are queued or running at once; callers
+    submitting more wait, without blocking their event loop, until the
+    worker takes a call off the queue.
+    """
+
+    def __init__(self, name='h5py-aio', max_pending=MAX_PENDING):
+        self._name = name
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._max_pending = max_pending
+        self._pending = 0
+        self._waiters = []  # (loop, future) for callers waiting for a slot
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=self._name, daemon=True
+                )
+                self._thread.start()
+
+    async def run(self, func, *args):
+        """ Run func(*args) on the worker thread and return its result.
+
+        Waits for a free slot first if max_pending calls are already queued.
+        If the caller is cancelled before the worker gets to the call, it is
+        skipped.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._pending < self._max_pending:
+                    self._pending += 1
+                    break
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            await waiter
+
+        fut = loop.create_future()
+        self._ensure_started()
+        self._queue.put((loop, fut, func, args))
+        return await fut
+
+    def _release(self):
+        # A slot is free: wake every waiting caller to compete for it, so
+        # none is stuck behind a waiter which was cancelled meanwhile.
+        with self._lock:
+            self._pending -= 1
+            waiters, self._waiters = self._waiters, []
+        for loop, waiter in waiters:
+            _post(loop, _set_result, waiter, None)
+
+    def _run(self):
+        while True:
+            loop, fut, func, args = self._queue.get()
+            self._release()
+            if fut.cancelled():
+                continue
+            try:
+                result = func(*args)
+            except BaseException as e:  # pylint: disable=broad-except
+                _post(loop, _set_exception, fut, e)
+            else:
+                _post(loop, _set_result, fut, result)
+
+
+def _post(loop, callback, *args):
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass  # The event loop was closed while we were working
+
+
+def _set_result(fut, result):
+    if not fut.cancelled():
+        fut.set_result(result)
+
+
+def _set_exception(fut, exc):
+    if not fut.cancelled():
+        fut.set_exception(exc)
+
+
+worker = IOWorker()
+
+
+async def iter_chunks(dset, slices_iter):
+    """ Asynchronously yield (slices, data) for each item of slices_iter.
+
+    The next chunk is read while the caller works on the current one.
+    Cancelling the iteration stops it before the next chunk is read.
+    """
+    slices = next(slices_iter, None)
+    if slices is None:
+        return
+    fut = asyncio.ensure_future(worker.run(dset.__getitem__, slices))
+    try:
+        while True:
+            data = await fut
+            next_slices = next(slices_iter, None)
+            if next_slices is not None:
+                fut = asyncio.ensure_future(worker.run(dset.__getitem__, next_slices))
+            yield slices, data
+            if next_slices is None:
+                return
+            slices = next_slices
+    finally:
+        fut.cancel()
@@ -17,6 +17,7 @@
 import numpy
 
 from .. import h5, h5s, h5t, h5a, h5p
+from ..utils import decode_strings
 from . import base
 from .base import phil, with_phil, Empty, is_empty_dataspace, product
 from .datatype import Datatype
@@ -79,9 +80,7 @@ class AttributeManager(base.MutableMappingHDF5, base.CommonStateObject):
         string_info = h5t.check_string_dtype(dtype)
         if string_info and (string_info.length is None):
             # Vlen strings: convert bytes to Python str
-            arr = numpy.array([
-                b.decode('utf-8', 'surrogateescape') for b in arr.flat
-            ], dtype=dtype).reshape(arr.shape)
+            arr = decode_strings(arr, 'utf-8', 'surrogateescape').view(dtype)
 
         if arr.ndim == 0:
             return arr[()]
@@ -0,0 +1,572 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2020 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Chunk-level I/O for chunked datasets.
+
+    HDF5 decodes the chunks touched by a read one after another, inside a
+    single call holding the global lock.  The helpers here instead fetch raw
+    chunks with DatasetID.read_direct_chunk, and run the filter pipeline
+    in-process on a pool of threads (see filters.FilterPipeline).  Writing
+    works the same way in reverse, with DatasetID.write_direct_chunk.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import os
+import queue
+import threading
+
+import numpy
+
+from .. import _selector, h5d
+from .base import phil, product
+from . import filters
+from . import selections as sel
+
+
+def chunk_pipeline(dset):
+    """ Get an in-process FilterPipeline for dset, or None if its chunks
+    can't be handled outside of HDF5.
+    """
+    dtype = dset.dtype
+    chunks = dset.chunks
+    # The raw bytes in a chunk must be laid out exactly as NumPy expects
+    # them, so no conversion is needed after decoding.
+    if (
+        chunks is None
+        or dtype.kind not in 'biufc'
+        or dset.id.get_type().get_size() != dtype.itemsize
+    ):
+        return None
+    return filters.FilterPipeline.from_dcpl(dset._dcpl, dtype.itemsize, chunks)
+
+
+def _dim_chunk_spans(start, count, step, chunk):
+    """ Split the points selected along one axis by the chunks holding them.
+
+    Yields (chunk_start, source slice within the chunk, destination slice
+    within the selection) for each chunk containing at least one point.
+    """
+    k = 0
+    while k < count:
+        pos = start + k * step
+        chunk_start = (pos // chunk) * chunk
+        # First point index at or beyond the end of this chunk
+        k_end = min(count, (chunk_start + chunk - start + step - 1) // step)
+        last = start + (k_end - 1) * step
+        yield (
+            chunk_start,
+            slice(pos - chunk_start, last - chunk_start + 1, step),
+            slice(k, k_end),
+        )
+        k = k_end
+
+
+def iter_chunk_spans(chunks, start, count, step):
+    """ Yield (chunk offset, source slices, destination slices) for every
+    chunk intersecting a regular hyperslab selection.
+    """
+    per_dim = [
+        list(_dim_chunk_spans(s, c, st, ch))
+        for s, c, st, ch in zip(start, count, step, chunks, strict=True)
+    ]
+    for spans in itertools.product(*per_dim):
+        offset, src, dst = zip(*spans)
+        yield offset, src, dst
+
+
+def read_chunk(dsid, pipeline, dtype, chunks, offset):
+    """ Read and decode one chunk, returning an array with the full chunk
+    shape, or None if the chunk has not been allocated.
+    """
+    with phil:
+        try:
+            filter_mask, raw = dsid.read_direct_chunk(offset)
+        except Exception:  # pylint: disable=broad-except
+            # HDF5 has no specific error for an unwritten chunk (it varies
+            # with the filters and the version), so only look the chunk up
+            # when reading it fails.
+            if dsid.get_chunk_info_by_coord(offset).byte_offset is not None:
+                raise
+            return None
+    buf = pipeline.decode(raw, filter_mask)
+    return numpy.frombuffer(buf, dtype=dtype).reshape(chunks)
+
+
+def _chunk_numbers(offsets, chunks, shape):
+    """ Number chunks in C order, given an (n, rank) array of coordinates
+    inside them.
+    """
+    grid = tuple(-(-dim // chunk) for dim, chunk in zip(shape, chunks, strict=True))
+    coords = offsets // numpy.asarray(chunks, dtype=numpy.uint64)
+    return numpy.ravel_multi_index(tuple(coords.T.astype(numpy.intp)), grid)
+
+
+def build_chunk_index(dsid, chunks, shape):
+    """ Get the storage information for all written chunks, as returned by
+    DatasetID.get_chunk_index, sorted in C order of the chunk offsets.
+    """
+    index = dsid.get_chunk_index()
+    order = numpy.argsort(_chunk_numbers(index['offset'], chunks, shape), kind='stable')
+    index = index[order]
+    index.flags.writeable = False
+    return index
+
+
+def lookup_chunks(index, chunks, shape, coords):
+    """ Find the records in a sorted chunk index for the chunks containing
+    the given coordinates.  Chunks which are not written get a record with
+    size 0.
+    """
+    coords = numpy.asarray(coords)
+    rank = len(shape)
+    if coords.ndim == 0 or coords.shape[-1] != rank:
+        raise ValueError(f"Chunk coordinates must have length {rank} (got shape {coords.shape})")
+    flat = coords.reshape(-1, rank)
+    if flat.size and ((flat < 0).any() or (flat >= numpy.asarray(shape)).any()):
+        raise ValueError("Chunk coordinates out of range for dataset shape %s" % (shape,))
+    flat = flat.astype(numpy.uint64)
+
+    numbers = _chunk_numbers(flat, chunks, shape)
+    index_numbers = _chunk_numbers(index['offset'], chunks, shape)
+    pos = numpy.searchsorted(index_numbers, numbers)
+    pos = numpy.minimum(pos, max(len(index) - 1, 0))
+    if len(index):
+        found = index_numbers[pos] == numbers
+    else:
+        found = numpy.zeros(len(numbers), dtype=bool)
+
+    out = numpy.zeros(len(flat), dtype=index.dtype)
+    out[found] = index[pos[found]]
+    chunk_arr = numpy.asarray(chunks, dtype=numpy.uint64)
+    out['offset'][~found] = (flat[~found] // chunk_arr) * chunk_arr
+    return out.reshape(coords.shape[:-1])
+
+
+def _simple_hyperslab(dset, args):
+    """ Get (start, count, step, scalar, array_shape) describing a regular
+    selection, or None if the arguments select something else.
+    """
+    if any(isinstance(a, (str, _selector.MultiBlockSlice)) for a in args):
+        return None
+    try:
+        selection = sel.select(dset.shape, args, dataset=dset)
+    except TypeError:
+        return None
+    if type(selection) is not sel.SimpleSelection:
+        return None
+    start, count, step, scalar = selection._sel
+    return start, count, step, scalar, selection.array_shape
+
+
+def read_parallel(dset, args, threads, out=None):
+    """ Read a selection from a chunked dataset, decoding chunks on a pool
+    of threads.  If out is given, data is read into it and it is returned.
+
+    Returns NotImplemented if the dataset or the selection are not
+    suitable, so the caller can fall back to a normal read.
+    """
+    pipeline = dset._chunk_pipeline
+    if pipeline is None or (out is not None and out.dtype != dset.dtype):
+        return NotImplemented
+
+    with phil:
+        hyperslab = _simple_hyperslab(dset, args)
+        if hyperslab is None:
+            return NotImplemented
+        start, count, step, scalar, array_shape = hyperslab
+        dtype = dset.dtype
+        chunks = dset.chunks
+        fillvalue = dset.fillvalue
+        # Chunks still in the chunk cache may not be on disk yet
+        if not dset._readonly:
+            dset.id.flush()
+
+    if out is None:
+        arr = numpy.empty(count, dtype=dtype)
+    elif out.shape != array_shape:
+        raise ValueError(
+            f"out array has shape {out.shape}, but the selection has shape {array_shape}"
+        )
+    else:
+        arr = out.reshape(count)  # A view, as out is C-contiguous
+
+    def read_one(item):
+        offset, src, dst = item
+        chunk = read_chunk(dset.id, pipeline, dtype, chunks, offset)
+        if chunk is None:
+            arr[dst] = fillvalue
+        else:
+            arr[dst] = chunk[src]
+
+    if arr.size:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # Consume the results so any exception is raised here
+            for _ in executor.map(
+                read_one, iter_chunk_spans(chunks, start, count, step)
+            ):
+                pass
+
+    if out is not None:
+        return out
+    arr = arr.reshape(array_shape)
+    if arr.shape == ():
+        return arr[()]
+    return arr
+
+
+def _covers_chunk(offset, src, chunks, shape):
+    """ Check if the source slices of a chunk span cover every element of
+    the chunk which lies inside the dataset.
+    """
+    for start, s, chunk, dim in zip(offset, src, chunks, shape, strict=True):
+        extent = min(chunk, dim - start)
+        if s.start != 0 or s.stop != extent or (s.step != 1 and extent != 1):
+            return False
+    return True
+
+
+def write_parallel(dset, args, data, threads):
+    """ Write data to a selection in a chunked dataset, encoding chunks on a
+    pool of threads.  Chunks which are only partly selected are written the
+    normal way.
+
+    Returns the offsets of the chunks written directly, or NotImplemented
+    if the dataset or the selection are not suitable, so the caller can
+    fall back to a normal write.
+    """
+    pipeline = dset._chunk_pipeline
+    if pipeline is None:
+        return NotImplemented
+
+    data = numpy.asarray(data)
+    with phil:
+        dtype = dset.dtype
+        if data.dtype != dtype and not numpy.can_cast(data.dtype, dtype, 'safe'):
+            return NotImplemented
+        hyperslab = _simple_hyperslab(dset, args)
+        if hyperslab is None:
+            return NotImplemented
+        start, count, step, scalar, array_shape = hyperslab
+        chunks = dset.chunks
+        shape = dset.shape
+        fillvalue = dset.fillvalue
+        # Write out cached chunks first, so they can't overwrite ours later
+        dset.id.flush()
+
+    arr = numpy.broadcast_to(data.astype(dtype, copy=False), array_shape).reshape(count)
+
+    full, partial = [], []
+    for offset, src, dst in iter_chunk_spans(chunks, start, count, step):
+        if _covers_chunk(offset, src, chunks, shape):
+            full.append((offset, dst))
+        else:
+            partial.append((offset, src, dst))
+
+    def encode_one(item):
+        offset, dst = item
+        block = arr[dst]
+        if block.shape != chunks:
+            # Edge chunk extending beyond the dataset: pad with the fill value
+            padded = numpy.full(chunks, fillvalue, dtype=dtype)
+            padded[tuple(slice(0, n) for n in block.shape)] = block
+            block = padded
+        return pipeline.encode(numpy.ascontiguousarray(block))
+
+    if full:
+        workers = threads or min(32, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded number of chunks in flight, writing them in order
+            items = iter(full)
+            pending = deque()
+            for item in itertools.islice(items, 2 * workers):
+                pending.append((item[0], executor.submit(encode_one, item)))
+            while pending:
+                offset, fut = pending.popleft()
+                filter_mask, buf = fut.result()
+                with phil:
+                    dset.id.write_direct_chunk(offset, buf, filter_mask)
+                item = next(items, None)
+                if item is not None:
+                    pending.append((item[0], executor.submit(encode_one, item)))
+
+    for offset, src, dst in partial:
+        region = tuple(
+            slice(o + s.start, o + s.stop, s.step) for o, s in zip(offset, src, strict=True)
+        )
+        dset[region] = arr[dst]
+    return [offset for offset, _ in full]
+
+
+def fill(dset, args, value):
+    """ Set every element of a selection in a chunked dataset to value, a
+    0-d array with the dataset's dtype.
+
+    Each distinct chunk of the constant is encoded once, and written with
+    write_direct_chunk to every chunk the selection covers.  If value is the
+    fill value, chunks which have not been written are left alone.  Chunks
+    which are only partly selected are written the normal way.
+
+    Returns the offsets of the chunks written directly, or NotImplemented
+    if the dataset or the selection are not suitable.
+    """
+    pipeline = dset._chunk_pipeline
+    if pipeline is None:
+        return NotImplemented
+
+    with phil:
+        hyperslab = _simple_hyperslab(dset, args)
+        if hyperslab is None:
+            return NotImplemented
+        start, count, step, _, _ = hyperslab
+        dtype = dset.dtype
+        chunks = dset.chunks
+        shape = dset.shape
+        fillvalue = numpy.asarray(dset.fillvalue, dtype=dtype)
+        is_fill = (
+            value.tobytes() == fillvalue.tobytes()
+            and dset._dcpl.get_fill_time() != h5d.FILL_TIME_NEVER
+        )
+        # Write out cached chunks first, so they can't overwrite ours later
+        dset.id.flush()
+
+    spans = list(iter_chunk_spans(chunks, start, count, step))
+    if is_fill and spans:
+        # Unwritten chunks already read as the fill value
+        sizes = dset.chunk_index([offset for offset, _, _ in spans])['size']
+        spans = [span for span, size in zip(spans, sizes, strict=True) if size]
+
+    encoded = {}  # Encoded chunks by the shape of the part in the dataset
+    written = []
+    for offset, src, _ in spans:
+        if not _covers_chunk(offset, src, chunks, shape):
+            region = tuple(
+                slice(o + s.start, o + s.stop, s.step) for o, s in zip(offset, src, strict=True)
+            )
+            dset[region] = value
+            continue
+        extent = tuple(min(c, d - o) for c, d, o in zip(chunks, shape, offset, strict=True))
+        if extent not in encoded:
+            block = numpy.full(chunks, fillvalue, dtype=dtype)
+            block[tuple(slice(0, n) for n in extent)] = value
+            encoded[extent] = pipeline.encode(block)
+        filter_mask, buf = encoded[extent]
+        with phil:
+            dset.id.write_direct_chunk(offset, buf, filter_mask)
+        written.append(offset)
+    return written
+
+
+def normalize_axis(axis, ndim):
+    """ Convert an axis argument (None, an int or a sequence of ints) to a
+    sorted tuple of non-negative axis numbers.
+    """
+    if axis is None:
+        return tuple(range(ndim))
+    axes = (axis,) if isinstance(axis, (int, numpy.integer)) else tuple(axis)
+    result = []
+    for a in axes:
+        if not -ndim <= a < ndim:
+            raise ValueError(f"axis {a} is out of bounds for array of dimension {ndim}")
+        result.append(a % ndim)
+    if len(set(result)) != len(result):
+        raise ValueError("duplicate value in 'axis'")
+    return tuple(sorted(result))
+
+
+def _kept(items, scalar):
+    """ Drop the entries for axes selected with an integer """
+    return tuple(x for x, s in zip(items, scalar, strict=True) if not s)
+
+
+def reduce(dset, args, reducer, axis, blocks, workers):
+    """ Reduce a selection of dset with a reducers.Reducer, one block at a
+    time.  blocks is the shape of the blocks to read: the dataset's chunks,
+    or blocks of rows for a contiguous dataset.
+
+    Blocks are read and reduced on a pool of threads, decoding chunks of
+    compressed datasets outside of HDF5 where possible.  Only a few blocks
+    per thread are in flight at once.  Partial results are merged in the
+    order the blocks are read.
+
+    Returns NotImplemented if the selection is not a regular hyperslab.
+    """
+    with phil:
+        hyperslab = _simple_hyperslab(dset, args)
+        if hyperslab is None or not dset.shape or dset.dtype.subdtype is not None:
+            return NotImplemented
+        start, count, step, scalar, array_shape = hyperslab
+        dtype = dset.dtype
+        fillvalue = dset.fillvalue
+        pipeline = dset._chunk_pipeline if dset.chunks == blocks else None
+        if pipeline is not None and not dset._readonly:
+            # Chunks still in the chunk cache may not be on disk yet
+            dset.id.flush()
+
+    ndim = len(array_shape)
+    axis = normalize_axis(axis, ndim)
+    kept = [i for i in range(ndim) if i not in axis]
+
+    def reduce_one(item):
+        offset, src, dst = item
+        if pipeline is not None:
+            chunk = read_chunk(dset.id, pipeline, dtype, blocks, offset)
+            if chunk is None:
+                chunk = numpy.full(blocks, fillvalue, dtype=dtype)
+            block = chunk[src]
+        else:
+            block = dset[tuple(
+                slice(o + s.start, o + s.stop, s.step) for o, s in zip(offset, src, strict=True)
+            )]
+        block = block.reshape(_kept(block.shape, scalar))
+        dst = _kept(dst, scalar)
+        # Slices aren't hashable before Python 3.12
+        return tuple((dst[i].start, dst[i].stop) for i in kept), reducer.map(block, axis)
+
+    partials = {}
+
+    def merge(key, part):
+        partials[key] = part if key not in partials else reducer.combine(partials[key], part)
+
+    if product(count) == 0:
+        empty = numpy.empty(array_shape, dtype=dtype)
+        merge(tuple((0, array_shape[i]) for i in kept), reducer.map(empty, axis))
+    else:
+        workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded number of blocks in flight, merging them in order
+            items = iter_chunk_spans(blocks, start, count, step)
+            pending = deque(
+                executor.submit(reduce_one, item)
+                for item in itertools.islice(items, 2 * workers)
+            )
+            while pending:
+                merge(*pending.popleft().result())
+                item = next(items, None)
+                if item is not None:
+                    pending.append(executor.submit(reduce_one, item))
+
+    if not kept:
+        return reducer.finalize(partials[()])
+    out = None
+    for key, part in partials.items():
+        res = numpy.asarray(reducer.finalize(part))
+        if out is None:
+            out = numpy.empty(tuple(array_shape[i] for i in kept), dtype=res.dtype)
+        out[tuple(slice(*k) for k in key)] = res
+    return out
+
+
+def _read_ahead(read, items, depth):
+    """ Yield (item, read(item)) for each item, reading on a separate thread
+    up to depth items ahead of the consumer.
+    """
+    results = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def reader():
+        try:
+            for item in items:
+                if stop.is_set():
+                    return
+                results.put((item, read(item)))
+        except BaseException as e:  # pylint: disable=broad-except
+            results.put((done, e))
+        else:
+            results.put((done, None))
+
+    thread = threading.Thread(target=reader, name='h5py-map-blocks-reader', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, value = results.get()
+            if item is done:
+                if value is not None:
+                    raise value
+                return
+            yield item, value
+    finally:
+        stop.set()
+        # Unblock the reader if it is waiting for space in the queue
+        while thread.is_alive():
+            try:
+                results.get(timeout=0.01)
+            except queue.Empty:
+                pass
+
+
+def map_blocks(src, func, out, blocks, workers):
+    """ Write func(block) to out for each block of src, in chunk order.
+
+    Three stages run at once, linked by bounded queues: a thread reading
+    blocks from src, a pool of up to `workers` threads calling func (and
+    compressing the results, where out's chunks can be written directly),
+    and the calling thread writing the results to out in order.
+    """
+    with phil:
+        shape = src.shape
+        dtype = out.dtype
+        chunks = out.chunks
+        fillvalue = out.fillvalue
+        pipeline = out._chunk_pipeline if chunks == blocks else None
+        if out._has_chunk_stats:
+            # Write through out[...], which keeps its statistics up to date
+            pipeline = None
+        if pipeline is not None:
+            # Write out cached chunks first, so they can't overwrite ours later
+            out.id.flush()
+
+    def read(item):
+        _, _, region = item
+        return src[region]
+
+    def compute(item, data):
+        offset, src_slices, region = item
+        res = numpy.asarray(func(data))
+        if res.shape != data.shape:
+            raise ValueError(
+                f"func returned an array of shape {res.shape} for a block of shape {data.shape}"
+            )
+        res = res.astype(dtype, copy=False)
+        if pipeline is not None and _covers_chunk(offset, src_slices, chunks, shape):
+            if res.shape != chunks:
+                # Edge chunk extending beyond the dataset: pad with the fill value
+                padded = numpy.full(chunks, fillvalue, dtype=dtype)
+                padded[tuple(slice(0, n) for n in res.shape)] = res
+                res = padded
+            return offset, pipeline.encode(numpy.ascontiguousarray(res))
+        return region, res
+
+    def write(result):
+        key, value = result
+        if isinstance(value, tuple):
+            filter_mask, buf = value
+            with phil:
+                out.id.write_direct_chunk(key, buf, filter_mask)
+        else:
+            out[key] = value
+
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    items = iter_chunk_spans(blocks, (0,) * len(shape), shape, (1,) * len(shape))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            for item, data in _read_ahead(read, items, workers):
+                pending.append(executor.submit(compute, item, data))
+                # Write finished blocks in order, and wait if too many are queued
+                while pending and (len(pending) >= 2 * workers or pending[0].done()):
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+        finally:
+            for fut in pending:
+                fut.cancel()
@@ -0,0 +1,376 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2020 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Per-chunk summary statistics, for skipping chunks in queries.
+
+    The statistics are kept in a companion dataset, found through an object
+    reference in the CHUNK_STATS_ATTR attribute of the dataset.  It has one
+    record per chunk of the dataset, numbered in C order of the chunk grid,
+    with the minimum, maximum and number of NaNs of the data in the chunk
+    (or of each numeric field of a compound type).  The grid shape is kept
+    in its 'grid' attribute; if the dataset is reshaped so that this no
+    longer matches, the statistics are ignored until they are rebuilt.
+"""
+
+import itertools
+import re
+
+import numpy
+
+from .base import phil, product
+from .. import h5s
+from . import chunks as chunkio
+from . import selections as sel
+
+CHUNK_STATS_ATTR = '_h5py_chunk_stats'
+
+
+def _grid(shape, chunks):
+    return tuple(-(-n // c) for n, c in zip(shape, chunks, strict=True))
+
+
+def _chunk_region(number, grid, chunks, shape):
+    """ Slices selecting the part of a chunk inside the dataset """
+    index = numpy.unravel_index(number, grid)
+    return tuple(
+        slice(int(i) * c, min((int(i) + 1) * c, n))
+        for i, c, n in zip(index, chunks, shape, strict=True)
+    )
+
+
+def stat_fields(dtype, fields=None):
+    """ Get the fields to keep statistics for: [None] for a numeric dtype,
+    or by default every numeric field of a compound dtype.
+    """
+    if dtype.names is None:
+        if fields is not None:
+            raise ValueError("Field names only allowed for compound types")
+        if dtype.kind not in 'biuf':
+            raise TypeError(f"Can't keep chunk statistics for data of type {dtype}")
+        return [None]
+    if fields is None:
+        fields = [
+            name for name in dtype.names
+            if dtype[name].kind in 'biuf' and dtype[name].subdtype is None
+        ]
+        if not fields:
+            raise TypeError(f"No numeric fields to keep chunk statistics for in {dtype}")
+    else:
+        fields = [fields] if isinstance(fields, str) else list(fields)
+        for name in fields:
+            if name not in dtype.names:
+                raise ValueError(f"Field {name} does not appear in this type.")
+            if dtype[name].kind not in 'biuf' or dtype[name].subdtype is not None:
+                raise TypeError(f"Can't keep chunk statistics for field {name!r} of type {dtype[name]}")
+    return fields
+
+
+def _stats_dtype(dtype, fields):
+    def one(t):
+        return numpy.dtype([('min', t), ('max', t), ('nulls', '<u8')])
+
+    if fields == [None]:
+        return one(dtype)
+    return numpy.dtype([(name, one(dtype[name])) for name in fields])
+
+
+def _block_stats(block, fields, rec):
+    """ Store the statistics of a block of data in rec, a 0-d record array """
+    for name in fields:
+        data = block if name is None else block[name]
+        target = rec if name is None else rec[name]
+        nulls = 0
+        if data.dtype.kind == 'f':
+            mask = numpy.isnan(data)
+            nulls = int(numpy.count_nonzero(mask))
+            if nulls:
+                data = data[~mask]
+        target['nulls'] = nulls
+        if data.size:
+            target['min'] = data.min()
+            target['max'] = data.max()
+        else:
+            target['min'] = target['max'] = numpy.nan
+
+
+def _read_block(dset, fields, region):
+    if fields == [None]:
+        return dset[region]
+    return dset.fields(fields)[region]
+
+
+def build(dset, name, fields=None):
+    """ Compute statistics for every chunk of dset, and store them in a new
+    dataset called name, next to dset.  Chunks which have not been written
+    are given the statistics of the fill value without reading them.
+    """
+    with phil:
+        chunks = dset.chunks
+        if chunks is None:
+            raise TypeError("Dataset is not chunked")
+        dtype = dset.dtype
+        fields = stat_fields(dtype, fields)
+        shape = dset.shape
+        grid = _grid(shape, chunks)
+        records = numpy.zeros(product(grid), dtype=_stats_dtype(dtype, fields))
+
+        fill = numpy.zeros(1, dtype=dtype)
+        fill[0] = dset.fillvalue
+        fill_stats = numpy.zeros((), dtype=records.dtype)
+        _block_stats(fill, fields, fill_stats)
+        records[:] = fill_stats
+
+        index = dset.chunk_index()
+        written = chunkio._chunk_numbers(index['offset'], chunks, shape)
+        for number in written:
+            region = _chunk_region(number, grid, chunks, shape)
+            _block_stats(_read_block(dset, fields, region), fields, records[number:number + 1].reshape(()))
+
+        parent = dset.parent
+        if name in parent:
+            if CHUNK_STATS_ATTR not in dset.attrs or parent[name] != dset.file[dset.attrs[CHUNK_STATS_ATTR]]:
+                raise ValueError(f"An object named {name!r} already exists")
+            del parent[name]
+        stats = parent.create_dataset(name, data=records, maxshape=(None,), chunks=True)
+        stats.attrs['grid'] = numpy.array(grid, dtype='u8')
+        dset.attrs[CHUNK_STATS_ATTR] = stats.ref
+        return stats
+
+
+def open_stats(dset, check_grid=True):
+    """ Get the statistics dataset for dset, or None if there isn't one (or
+    it no longer matches the dataset's chunk grid).
+    """
+    with phil:
+        chunks = dset.chunks
+        if chunks is None or CHUNK_STATS_ATTR not in dset.attrs:
+            return None
+        stats = dset.file[dset.attrs[CHUNK_STATS_ATTR]]
+        if check_grid and tuple(stats.attrs['grid']) != _grid(dset.shape, chunks):
+            return None
+        return stats
+
+
+def _fields_of(stats):
+    if 'min' in stats.dtype.names:
+        return [None]
+    return list(stats.dtype.names)
+
+
+def _update_grid_box(dset, stats, lo, hi):
+    """ Recompute statistics for the chunks with grid indices from lo to hi
+    (inclusive) on each axis.
+    """
+    grid = _grid(dset.shape, dset.chunks)
+    _update_numbers(dset, stats, [
+        int(numpy.ravel_multi_index(index, grid))
+        for index in itertools.product(*(range(a, b + 1) for a, b in zip(lo, hi, strict=True)))
+    ])
+
+
+def _update_numbers(dset, stats, numbers):
+    """ Recompute statistics for the chunks with the given numbers, in
+    increasing order.
+    """
+    if not numbers:
+        return
+    chunks = dset.chunks
+    shape = dset.shape
+    grid = _grid(shape, chunks)
+    fields = _fields_of(stats)
+    records = numpy.zeros(len(numbers), dtype=stats.dtype)
+    for i, number in enumerate(numbers):
+        region = _chunk_region(number, grid, chunks, shape)
+        _block_stats(_read_block(dset, fields, region), fields, records[i:i + 1].reshape(()))
+    stats[numbers] = records
+
+
+def update(dset, args):
+    """ Recompute the statistics of the chunks touched by writing to the
+    selection args, if dset has statistics.
+    """
+    with phil:
+        args = tuple(a for a in args if not isinstance(a, str))
+        update_selection(dset, sel.select(dset.shape, args, dataset=dset))
+
+
+def _touched_chunks(space, chunks, grid):
+    """ Get the numbers of the chunks holding elements selected in space """
+    sel_type = space.get_select_type()
+    if sel_type == h5s.SEL_ALL:
+        return list(range(product(grid)))
+    touched = numpy.zeros(grid, dtype=bool)
+    chunks = numpy.array(chunks, dtype=numpy.uint64)
+    if sel_type == h5s.SEL_POINTS:
+        touched[tuple((space.get_select_elem_pointlist() // chunks).T)] = True
+    else:
+        blocks = space.get_select_hyper_blocklist() // chunks
+        lo, hi = blocks[:, 0], blocks[:, 1]
+        # Most blocks of a scattered selection are inside one chunk
+        single = (lo == hi).all(axis=1)
+        touched[tuple(lo[single].T)] = True
+        for block_lo, block_hi in zip(lo[~single], hi[~single]):
+            touched[tuple(slice(a, b + 1) for a, b in zip(block_lo, block_hi))] = True
+    return numpy.flatnonzero(touched).tolist()
+
+
+def update_selection(dset, selection):
+    """ Recompute the statistics of the chunks touched by writing to a
+    Selection, if dset has statistics.
+    """
+    with phil:
+        stats = open_stats(dset)
+        if stats is None or selection.nselect == 0:
+            return
+        chunks = dset.chunks
+        grid = _grid(dset.shape, chunks)
+        _update_numbers(dset, stats, _touched_chunks(selection.id, chunks, grid))
+
+
+def update_chunks(dset, offsets):
+    """ Recompute the statistics of the chunks at the given offsets (as for
+    write_direct_chunk), if dset has statistics.
+    """
+    with phil:
+        stats = open_stats(dset)
+        if stats is None or not offsets:
+            return
+        chunks = dset.chunks
+        grid = _grid(dset.shape, chunks)
+        numbers = {
+            int(numpy.ravel_multi_index(tuple(o // c for o, c in zip(offset, chunks, strict=True)), grid))
+            for offset in offsets
+        }
+        _update_numbers(dset, stats, sorted(numbers))
+
+
+def resized(dset):
+    """ Update the statistics after dset has been resized.
+
+    If only the first axis changed, the chunk numbers of existing chunks
+    are unchanged, so the statistics are extended or truncated, and the
+    last rows of chunks recomputed.  Otherwise they are left to be ignored.
+    """
+    with phil:
+        stats = open_stats(dset, check_grid=False)
+        if stats is None:
+            return
+        old_grid = tuple(int(n) for n in stats.attrs['grid'])
+        grid = _grid(dset.shape, dset.chunks)
+        if old_grid == grid or old_grid[1:] != grid[1:]:
+            return
+        stats.resize((product(grid),))
+        stats.attrs['grid'] = numpy.array(grid, dtype='u8')
+        if grid[0]:
+            first = max(min(old_grid[0], grid[0]) - 1, 0)
+            _update_grid_box(
+                dset, stats, [first] + [0] * (len(grid) - 1), [n - 1 for n in grid]
+            )
+
+
+def candidates(dset, lo=None, hi=None, field=None):
+    """ Get the regions (tuples of slices) of the chunks of dset which may
+    hold values between lo and hi (inclusive), in C order of the chunks.
+    Without usable statistics, every chunk is a candidate.
+    """
+    with phil:
+        chunks = dset.chunks
+        if chunks is None:
+            raise TypeError("Dataset is not chunked")
+        dtype = dset.dtype
+        if dtype.names is None:
+            if field is not None:
+                raise ValueError("Field names only allowed for compound types")
+        elif field is None:
+            raise ValueError("A field must be given for datasets with a compound type")
+        elif field not in dtype.names:
+            raise ValueError(f"Field {field} does not appear in this type.")
+        shape = dset.shape
+        grid = _grid(shape, chunks)
+        stats = open_stats(dset)
+        if stats is None or (field is not None and field not in stats.dtype.names):
+            numbers = range(product(grid))
+        else:
+            records = stats[()]
+            if field is not None:
+                records = records[field]
+            mask = records['min'] == records['min']  # Not NaN: some values
+            if lo is not None:
+                mask &= records['max'] >= lo
+            if hi is not None:
+                mask &= records['min'] <= hi
+            numbers = numpy.flatnonzero(mask)
+    return [_chunk_region(n, grid, chunks, shape) for n in numbers]
+
+
+_COMPARISON = re.compile(r'\s*(<=|>=|==|<|>)\s*(\S+)\s*')
+
+
+def parse_condition(cond):
+    """ Turn a condition - a comparison string like '> 40', or a (lo, hi)
+    tuple - into (lo, hi, test), where test takes an array and returns a
+    boolean mask.
+    """
+    if isinstance(cond, str):
+        m = _COMPARISON.fullmatch(cond)
+        try:
+            value = float(m[2]) if m else None
+        except ValueError:
+            value = None
+        if value is None:
+            raise ValueError(f"Can't parse condition {cond!r}; expected e.g. '> 40'")
+        op = m[1]
+        if op == '<':
+            return None, value, lambda a: a < value
+        if op == '<=':
+            return None, value, lambda a: a <= value
+        if op == '>':
+            return value, None, lambda a: a > value
+        if op == '>=':
+            return value, None, lambda a: a >= value
+        return value, value, lambda a: a == value
+    try:
+        lo, hi = cond
+    except (TypeError, ValueError):
+        raise TypeError(
+            f"Condition must be a comparison like '> 40' or a (lo, hi) tuple (got {cond!r})"
+        ) from None
+
+    def test(a):
+        mask = numpy.ones(a.shape, dtype=bool)
+        if lo is not None:
+            mask &= a >= lo
+        if hi is not None:
+            mask &= a <= hi
+        return mask
+
+    return lo, hi, test
+
+
+def where(dset, cond, field=None):
+    """ Find the coordinates of the elements of dset (or of one field)
+    matching cond, reading only the chunks which may hold them.  Returns a
+    tuple of arrays, one per axis, in C order like numpy.nonzero.
+    """
+    lo, hi, test = parse_condition(cond)
+    regions = candidates(dset, lo, hi, field)
+    parts = []
+    for region in regions:
+        block = dset[region] if field is None else dset.fields(field)[region]
+        hits = numpy.nonzero(test(block))
+        if hits[0].size:
+            parts.append(numpy.stack([h + r.start for h, r in zip(hits, region, strict=True)]))
+    rank = len(dset.shape)
+    if not parts:
+        return tuple(numpy.zeros(0, dtype=numpy.intp) for _ in range(rank))
+    coords = numpy.concatenate(parts, axis=1)
+    # Chunks are in C order of the grid, not of the elements
+    order = numpy.lexsort(coords[::-1])
+    return tuple(coords[:, order])
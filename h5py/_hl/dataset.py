@@ -11,20 +11,31 @@
     Implements support for high-level dataset access.
 """
 
+import operator
+import os
 import posixpath as pp
 import sys
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from warnings import warn
 
 import numpy
 
-from .. import h5, h5s, h5t, h5r, h5d, h5p, h5fd, h5ds, _selector
+from .. import h5, h5a, h5s, h5t, h5r, h5d, h5f, h5p, h5fd, h5ds, _selector
+from ..utils import decode_strings
+if h5t.NUMPY_RUNTIME_VERSION_TUPLE >= (2, 0, 0):
+    from .._npystrings import decode_npystrings
 from ..h5py_warnings import H5pyDeprecationWarning
 from .base import (
     array_for_new_object, cached_property, Empty, find_item_type, HLObject,
     phil, product, with_phil,
 )
+from . import aio
+from . import chunks as chunkio
+from . import chunkstats
 from . import filters
+from . import reducers
 from . import selections as sel
 from . import selections2 as sel2
 from .datatype import Datatype
@@ -34,6 +45,16 @@ from .vds import VDSmap, vds_support
 _LEGACY_GZIP_COMPRESSION_VALS = frozenset(range(10))
 MPI = h5.get_config().mpi
 
+# Target size in bytes of the blocks read when iterating over rows of a
+# dataset which is not chunked.
+ITER_BLOCK_SIZE = 1024 * 1024
+
+# Non-contiguous arrays assigned to a dataset are written in place, through
+# a strided memory dataspace, if their last axis is contiguous or they are at
+# least this many bytes.  Otherwise they are copied first: HDF5 moves
+# separate elements one at a time, which is slower than NumPy copying them.
+STRIDED_COPY_LIMIT = 64 * 1024 * 1024
+
 
 def make_new_dset(parent, shape=None, dtype=None, data=None, name=None,
                   chunks=None, compression=None, shuffle=None,
@@ -42,7 +63,7 @@ def make_new_dset(parent, shape=None, dtype=None, data=None, name=None,
                   external=None, track_order=None, dcpl=None, dapl=None,
                   efile_prefix=None, virtual_prefix=None, allow_unknown_filter=False,
                   rdcc_nslots=None, rdcc_nbytes=None, rdcc_w0=None, *,
-                  fill_time=None):
+                  fill_time=None, parallel_compress=None):
     """ Return a new low-level dataset identifier """
 
     # Convert data to a C-contiguous ndarray
@@ -188,7 +209,10 @@ def make_new_dset(parent, shape=None, dtype=None, data=None, name=None,
     dset_id = h5d.create(parent.id, name, tid, sid, dcpl=dcpl, dapl=dapl)
 
     if (data is not None) and (not isinstance(data, Empty)):
-        dset_id.write(h5s.ALL, h5s.ALL, data)
+        if parallel_compress is not None:
+            Dataset(dset_id).write_parallel(data, threads=parallel_compress)
+        else:
+            dset_id.write(h5s.ALL, h5s.ALL, data)
 
     return dset_id
 
@@ -282,29 +306,49 @@ class AsTypeView(AbstractView):
 
 class AsStrView(AbstractView):
     """Wrapper to decode strings on reading the dataset"""
-    def __init__(self, dset, encoding, errors='strict'):
+    def __init__(self, dset, encoding, errors='strict', dtype=None):
         super().__init__(dset)
         self.encoding = encoding
         self.errors = errors
+        self._dtype = numpy.dtype(object) if dtype is None else dtype
 
     @property
     def dtype(self):
-        return numpy.dtype(object)
+        return self._dtype
+
+    def _read_vlen(self, args):
+        """Read and decode variable-length strings with DatasetID.read_strings,
+        which skips the bytes objects made by a normal read.  Returns None for
+        selections left to Dataset.__getitem__.
+        """
+        dset = self._dset
+        if (dset._is_empty or dset.shape == () or any(
+                isinstance(a, (str, h5r.RegionReference)) for a in args)):
+            return None
+        selection = sel.select(dset.shape, args, dataset=dset, unsorted=True)
+        if getattr(selection, 'reorder', None) or selection.array_shape == ():
+            return None
+        return dset.id.read_strings(
+            h5s.create_simple(selection.mshape), selection.id,
+            selection.array_shape, self.encoding, self.errors, self._dtype,
+            dxpl=dset._dxpl,
+        )
 
     def __getitem__(self, idx):
+        args = idx if isinstance(idx, tuple) else (idx,)
+        if h5t.check_string_dtype(self._dset.dtype).length is None:
+            arr = self._read_vlen(args)
+            if arr is not None:
+                return arr
+
         bytes_arr = self._dset[idx]
-        # numpy.char.decode() seems like the obvious thing to use. But it only
-        # accepts numpy string arrays, not object arrays of bytes (which we
-        # return from HDF5 variable-length strings). And the numpy
-        # implementation is not faster than doing it with a loop; in fact, by
-        # not converting the result to a numpy unicode array, the
-        # naive way can be faster! (Comparing with numpy 1.18.4, June 2020)
         if numpy.isscalar(bytes_arr):
             return bytes_arr.decode(self.encoding, self.errors)
-
-        return numpy.array([
-            b.decode(self.encoding, self.errors) for b in bytes_arr.flat
-        ], dtype=object).reshape(bytes_arr.shape)
+        # Decode in one pass in C, rather than calling bytes.decode() from
+        # Python for each element.
+        if self._dtype.kind == 'T':
+            return decode_npystrings(bytes_arr, self.encoding, self.errors)
+        return decode_strings(bytes_arr, self.encoding, self.errors)
 
 
 class FieldsView(AbstractView):
@@ -327,11 +371,571 @@ class FieldsView(AbstractView):
         return t
 
     def __getitem__(self, idx):
-        data = self._dset.__getitem__(idx, new_dtype=self.read_dtype)
-        if self.extract_field is not None:
-            data = data[self.extract_field]
+        return self._read(idx)
+
+    def _read(self, idx, out=None):
+        if out is None:
+            data = self._dset.__getitem__(idx, new_dtype=self.read_dtype)
+            if self.extract_field is not None:
+                data = data[self.extract_field]
+            return data
+
+        if self.extract_field is None:
+            # HDF5 matches up compound fields by name
+            return self._dset.__getitem__(idx, new_dtype=out.dtype, out=out)
+
+        if self.dtype.subdtype is None:
+            # Read straight into out, seen as a struct with only this field
+            struct = out.view(numpy.dtype([(self.extract_field, out.dtype)]))
+            self._dset.__getitem__(idx, new_dtype=struct.dtype, out=struct)
+        else:
+            # Array fields are read separately, then copied
+            data = self._dset.__getitem__(idx, new_dtype=self.read_dtype)
+            out[...] = data[self.extract_field]
+        return out
+
+
+# Datatypes which the Cython fast reader can handle, provided the dtype
+# doesn't contain any objects (variable-length data or references)
+_FAST_READ_TYPES = (
+    h5t.TypeIntegerID, h5t.TypeFloatID, h5t.TypeEnumID, h5t.TypeCompoundID,
+    h5t.TypeStringID, h5t.TypeArrayID,
+)
+
+
+class OrthogonalIndexer:
+    """Wrapper for orthogonal (outer) indexing on a dataset (dset.oindex)"""
+
+    def __init__(self, dset):
+        self._dset = dset
+
+    def _args(self, idx, unsorted=False):
+        """Convert indexing args to field names plus a selection object"""
+        if not isinstance(idx, tuple):
+            idx = (idx,)
+        names = tuple(x for x in idx if isinstance(x, str))
+        args = tuple(x for x in idx if not isinstance(x, str))
+        with phil:
+            selection = sel.select(
+                self._dset.shape, args, dataset=self._dset,
+                orthogonal=True, unsorted=unsorted,
+            )
+        return names + (selection,)
+
+    def __getitem__(self, idx):
+        if not self._dset.shape:  # Scalar or empty dataset
+            return self._dset[idx]
+        return self._dset[self._args(idx, unsorted=True)]
+
+    def __setitem__(self, idx, val):
+        if not self._dset.shape:
+            self._dset[idx] = val
+        else:
+            self._dset[self._args(idx)] = val
+
+
+class LazyView:
+    """ A deferred selection from a dataset (dset.lazy[...]).
+
+    Indexing a LazyView with slices, integers or field names combines the
+    index with its selection and returns a new LazyView, without reading
+    anything.  read() or numpy.asarray() reads only the final region, with
+    a single call to HDF5.  The reductions sum(), mean(), min() and max()
+    read the view in blocks aligned to the dataset's chunks, so the whole
+    selection is never held in memory at once.
+    """
+
+    def __init__(self, dset, axes=None, names=()):
+        if axes is None:
+            if dset.shape is None:
+                raise TypeError("Empty datasets can't be viewed lazily")
+            axes = tuple(range(n) for n in dset.shape)
+        self._dset = dset
+        # One entry per dataset axis: a range of the coordinates selected,
+        # or an int where the axis was removed by integer indexing.
+        self._axes = axes
+        self._names = names
+
+    @property
+    def dtype(self):
+        if not self._names:
+            return self._dset.dtype
+        t = readtime_dtype(self._dset.dtype, self._names)
+        if len(self._names) == 1:
+            t = t[self._names[0]]
+        return t
+
+    @property
+    def shape(self):
+        return tuple(len(r) for r in self._axes if isinstance(r, range))
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return product(self.shape)
+
+    def __len__(self):
+        if not self.shape:
+            raise TypeError("Attempt to take len() of scalar view")
+        return self.shape[0]
+
+    def __repr__(self):
+        return f"<Lazy view of {self._dset!r}: shape {self.shape}, type {self.dtype.str!r}>"
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        names = tuple(k for k in key if isinstance(k, str))
+        key = tuple(k for k in key if not isinstance(k, str))
+        if names:
+            if len(self._names) == 1:
+                raise ValueError("Field names only allowed for compound types")
+            # Check the names exist among those already selected
+            readtime_dtype(self.dtype, names)
+        else:
+            names = self._names
+
+        free = [i for i, r in enumerate(self._axes) if isinstance(r, range)]
+        n_ellipsis = sum(k is Ellipsis for k in key)
+        if n_ellipsis > 1:
+            raise IndexError("an index can only have a single ellipsis ('...')")
+        if n_ellipsis:
+            i = next(i for i, k in enumerate(key) if k is Ellipsis)
+            key = key[:i] + (slice(None),) * (len(free) - len(key) + 1) + key[i + 1:]
+        if len(key) > len(free):
+            raise IndexError(
+                f"too many indices for view: view is {len(free)}-dimensional, but {len(key)} were indexed"
+            )
+
+        axes = list(self._axes)
+        for i, k in zip(free, key):
+            if isinstance(k, slice):
+                axes[i] = axes[i][k]
+            elif isinstance(k, (int, numpy.integer)) and not isinstance(k, bool):
+                try:
+                    axes[i] = axes[i][k]
+                except IndexError:
+                    raise IndexError(
+                        f"Index ({k}) out of range for axis with size {len(axes[i])}"
+                    ) from None
+            else:
+                raise TypeError(
+                    "Lazy views can only be indexed with slices, integers, "
+                    f"field names and Ellipsis (got {k!r})"
+                )
+        return LazyView(self._dset, tuple(axes), names)
+
+    def read(self):
+        """ Read the data selected by this view from the dataset. """
+        args = []
+        flip = []
+        for r in self._axes:
+            if isinstance(r, int):
+                args.append(r)
+                continue
+            if r.step < 0:
+                # HDF5 hyperslabs step forwards; reverse the data afterwards
+                flip.append(len(args) - sum(isinstance(a, int) for a in args))
+                r = r[::-1]
+            args.append(slice(r.start, r.stop, r.step) if r else slice(0, 0))
+        data = self._dset[tuple(args) + self._names]
+        if flip:
+            data = data[tuple(
+                slice(None, None, -1) if i in flip else slice(None)
+                for i in range(self.ndim)
+            )]
         return data
 
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError(
+                f"{self.__class__.__name__}.__array__ received {copy=} "
+                "but memory allocation cannot be avoided on read"
+            )
+        return numpy.asarray(self.read(), dtype=dtype)
+
+    def _chunk_end(self, r, i, chunk):
+        """ Index in range r of the first coordinate after the dataset chunk
+        holding r[i].
+        """
+        c = r[i]
+        if r.step > 0:
+            n = -(-((c // chunk + 1) * chunk - c) // r.step)
+        else:
+            n = (c - (c // chunk) * chunk) // -r.step + 1
+        return min(len(r), i + n)
+
+    def _blocks(self):
+        """ Yield the data of this view in blocks along its first axis, each
+        made of whole dataset chunks along that axis, or about
+        ITER_BLOCK_SIZE bytes if the dataset is not chunked.
+        """
+        free = [i for i, r in enumerate(self._axes) if isinstance(r, range)]
+        if not free or len(self._axes[free[0]]) == 0:
+            yield numpy.asarray(self.read())
+            return
+        d = free[0]
+        r = self._axes[d]
+        chunks = self._dset.chunks
+        row_nbytes = self.dtype.itemsize * product(self.shape[1:])
+        target = max(1, ITER_BLOCK_SIZE // max(row_nbytes, 1))
+        axes = list(self._axes)
+        start = 0
+        while start < len(r):
+            stop = start
+            while stop < len(r) and stop - start < target:
+                if chunks is None:
+                    stop = min(len(r), start + target)
+                else:
+                    stop = self._chunk_end(r, stop, chunks[d])
+            axes[d] = r[start:stop]
+            yield numpy.asarray(LazyView(self._dset, tuple(axes), self._names).read())
+            start = stop
+
+    def _reduce(self, ufunc, axis, dtype=None):
+        axis = chunkio.normalize_axis(axis, self.ndim)
+        result = None
+        parts = []
+        for block in self._blocks():
+            part = ufunc.reduce(block, axis=axis, dtype=dtype)
+            if block.ndim == 0 or 0 not in axis:
+                parts.append(part)
+            elif result is None:
+                result = part
+            else:
+                result = ufunc(result, part)
+        if result is not None:
+            return result
+        return parts[0] if len(parts) == 1 else numpy.concatenate(parts)
+
+    def sum(self, axis=None):
+        """ Sum of the selected data, read one block at a time. """
+        return self._reduce(numpy.add, axis)
+
+    def min(self, axis=None):
+        """ Minimum of the selected data, read one block at a time. """
+        return self._reduce(numpy.minimum, axis)
+
+    def max(self, axis=None):
+        """ Maximum of the selected data, read one block at a time. """
+        return self._reduce(numpy.maximum, axis)
+
+    def mean(self, axis=None):
+        """ Arithmetic mean of the selected data, read one block at a time. """
+        dtype = numpy.float64 if self.dtype.kind in 'biu' else None
+        count = product(self.shape[a] for a in chunkio.normalize_axis(axis, self.ndim))
+        return self._reduce(numpy.add, axis, dtype) / count
+
+
+class Appender:
+    """ Buffered appending along one axis of a resizable dataset.
+
+    Created by Dataset.appender().  Rows are collected in a buffer of one
+    chunk along the axis, and written when the chunk is full, so each chunk
+    is written (and compressed) once.  Unless a flush policy is given, the
+    dataset extent is grown geometrically, and trimmed to the rows appended
+    when the appender is flushed or closed.
+    """
+
+    def __init__(self, dset, axis=0, flush_rows=None, flush_interval=None):
+        with phil:
+            chunks = dset.chunks
+            if chunks is None:
+                raise TypeError("Only chunked datasets can be appended to")
+            shape = dset.shape
+            if not 0 <= axis < len(shape):
+                raise ValueError("Invalid axis (0 to %s allowed)" % (len(shape) - 1))
+            self._dset = dset
+            self._axis = axis
+            self._dtype = dset.dtype
+            self._shape = shape
+            self._chunk_rows = chunks[axis]
+            self._extent = shape[axis]
+            self._maxlen = dset.maxshape[axis]
+
+        self._flush_rows = flush_rows
+        self._flush_interval = flush_interval
+        self._exact_extent = flush_rows is not None or flush_interval is not None
+
+        # Rows before _start are final; the buffer holds those after it, up
+        # to the next chunk boundary.
+        self._start = self._extent
+        buf_shape = list(shape)
+        buf_shape[axis] = self._chunk_rows
+        self._buf = numpy.empty(buf_shape, dtype=self._dtype)
+        self._nbuf = 0
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        """ The length of the axis, including rows not yet written """
+        return self._start + self._nbuf
+
+    def _index(self, start, stop):
+        idx = [slice(None)] * len(self._shape)
+        idx[self._axis] = slice(start, stop)
+        return tuple(idx)
+
+    def _check_length(self, length):
+        """ Raise ValueError, before anything is buffered or written, if
+        the axis can't grow to length.
+        """
+        if self._maxlen is not None and length > self._maxlen:
+            raise ValueError(
+                f"Can't append beyond the maximum length {self._maxlen} of "
+                f"axis {self._axis} (appending would make it {length})"
+            )
+
+    def _write(self, start, block):
+        """ Write block along the axis from start, growing the extent """
+        stop = start + block.shape[self._axis]
+        if stop > self._extent:
+            if self._exact_extent:
+                new_extent = stop
+            else:
+                new_extent = max(stop, 2 * self._extent)
+                if self._maxlen is not None:
+                    new_extent = max(stop, min(new_extent, self._maxlen))
+            self._dset.resize(new_extent, axis=self._axis)
+            self._extent = new_extent
+        self._dset[self._index(start, stop)] = block
+
+    def append(self, data):
+        """ Append data along the axis.  data should have the dataset's
+        shape along the other axes; a single row may omit the axis.
+        """
+        if self._closed:
+            raise ValueError("Appender is closed")
+        data = numpy.asarray(data, dtype=self._dtype)
+        if data.ndim == len(self._shape) - 1:
+            data = numpy.expand_dims(data, self._axis)
+        expected = self._shape[:self._axis] + self._shape[self._axis + 1:]
+        if data.shape[:self._axis] + data.shape[self._axis + 1:] != expected:
+            raise ValueError(
+                f"Can't append data with shape {data.shape} to a dataset with "
+                f"shape {self._shape} along axis {self._axis}"
+            )
+        n = data.shape[self._axis]
+        self._check_length(len(self) + n)
+
+        c = self._chunk_rows
+        pos = 0
+        with phil:
+            while pos < n:
+                if self._nbuf == 0 and self._start % c == 0 and n - pos >= c:
+                    # Whole chunks go straight from the input to the file
+                    k = ((n - pos) // c) * c
+                    self._write(self._start, data[self._index(pos, pos + k)])
+                    self._start += k
+                    pos += k
+                    continue
+                boundary = (self._start // c + 1) * c
+                k = min(boundary - self._start - self._nbuf, n - pos)
+                self._buf[self._index(self._nbuf, self._nbuf + k)] = \
+                    data[self._index(pos, pos + k)]
+                self._nbuf += k
+                pos += k
+                if self._start + self._nbuf == boundary:
+                    self._write(self._start, self._buf[self._index(0, self._nbuf)])
+                    self._start = boundary
+                    self._nbuf = 0
+
+        self._unflushed += n
+        if (
+            (self._flush_rows is not None and self._unflushed >= self._flush_rows)
+            or (self._flush_interval is not None
+                and time.monotonic() - self._last_flush >= self._flush_interval)
+        ):
+            self.flush()
+
+    def flush(self):
+        """ Write the buffered rows, set the dataset extent to the rows
+        appended, and flush the dataset to the file (see Dataset.flush).
+
+        The buffered rows are kept, so the chunk they are in is written in
+        full once it is complete.
+        """
+        with phil:
+            if self._nbuf:
+                self._write(self._start, self._buf[self._index(0, self._nbuf)])
+            length = self._start + self._nbuf
+            if self._extent != length:
+                self._dset.resize(length, axis=self._axis)
+                self._extent = length
+            self._dset.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """ Flush the buffered rows and stop appending """
+        if not self._closed:
+            self.flush()
+            self._closed = True
+
+
+class ExternalMmap:
+    """ Memory-mapped, read-only view of a dataset whose raw data is split
+    over several external file segments.
+
+    Created by Dataset.as_mmap().  Each segment is mapped separately.
+    Indexing reads the rows it needs into a new array, copying from each
+    segment on its own thread when more than one is involved.
+    """
+
+    def __init__(self, segments, dtype, shape, mode='r', threads=None):
+        self.dtype = dtype
+        self.shape = shape
+        self.threads = threads
+        # (position of the segment in the data, bytes mapped from its file)
+        self._segments = [
+            (data_offset, numpy.memmap(path, dtype='u1', mode=mode,
+                                       offset=file_offset, shape=(length,)))
+            for path, file_offset, data_offset, length in segments
+        ]
+        self._row_nbytes = product(shape[1:]) * dtype.itemsize
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return product(self.shape)
+
+    def __len__(self):
+        if not self.shape:
+            raise TypeError("Attempt to take len() of scalar dataset")
+        return self.shape[0]
+
+    def __repr__(self):
+        return f"<ExternalMmap: shape {self.shape}, type {self.dtype.str!r}, {len(self._segments)} segments>"
+
+    def _read_bytes(self, start, stop):
+        out = numpy.empty(stop - start, dtype='u1')
+        jobs = [
+            (max(start, pos), min(stop, pos + len(m)), pos, m)
+            for pos, m in self._segments
+            if pos < stop and pos + len(m) > start
+        ]
+
+        def copy(job):
+            lo, hi, pos, m = job
+            out[lo - start:hi - start] = m[lo - pos:hi - pos]
+
+        if len(jobs) > 1:
+            workers = min(len(jobs), self.threads or min(32, (os.cpu_count() or 1) + 4))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(copy, jobs):
+                    pass
+        else:
+            for job in jobs:
+                copy(job)
+        return out
+
+    def read(self, start=0, stop=None):
+        """ Read rows [start:stop] (by default, all the data) into a new
+        array.
+        """
+        if not self.shape:
+            return self._read_bytes(0, self.dtype.itemsize).view(self.dtype).reshape(())
+        start, stop, _ = slice(start, stop).indices(self.shape[0])
+        stop = max(start, stop)
+        data = self._read_bytes(start * self._row_nbytes, stop * self._row_nbytes)
+        return data.view(self.dtype).reshape((stop - start,) + self.shape[1:])
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self.read()
+        if dtype is not None and dtype != arr.dtype:
+            arr = arr.astype(dtype)
+        return arr
+
+    def __getitem__(self, key):
+        key = key if isinstance(key, tuple) else (key,)
+        first = key[0] if (key and self.shape) else Ellipsis
+        if isinstance(first, slice):
+            rows = range(*first.indices(self.shape[0]))
+            if len(rows) == 0:
+                lo = hi = 0
+            else:
+                lo, hi = min(rows[0], rows[-1]), max(rows[0], rows[-1]) + 1
+            stop = rows.stop - lo
+            local = slice(rows.start - lo, stop if stop >= 0 else None, rows.step)
+            return self.read(lo, hi)[(local,) + key[1:]]
+        if isinstance(first, (int, numpy.integer)) and not isinstance(first, bool):
+            row = operator.index(first)
+            if not -self.shape[0] <= row < self.shape[0]:
+                raise IndexError(
+                    f"Index ({row}) out of range for (0-{self.shape[0] - 1})"
+                )
+            row %= self.shape[0]
+            return self.read(row, row + 1)[(0,) + key[1:]]
+        return self.read()[key]
+
+
+def _strided_selection(arr, selection, broadcast_shape=None):
+    """ Get (base, mspaces) to access a simple selection in a non-contiguous
+    array without copying it (see selections.strided_memory), or None.
+
+    If broadcast_shape is given, mspaces has a dataspace for each piece the
+    selection is broadcast to (as for Selection.broadcast); otherwise it
+    has one for the whole selection.
+    """
+    if type(selection) is not sel.SimpleSelection:
+        return None
+    if broadcast_shape is None:
+        start, count, step, _ = selection._sel
+        hyperslabs = [(start, count, step)]
+    else:
+        hyperslabs = selection.broadcast_hyperslabs(broadcast_shape)
+    return sel.strided_memory_pieces(arr, hyperslabs)
+
+
+def _out_array(out, shape, dtype):
+    """ Get an array to read a selection into: out if given, or a new array
+    of zeros.  Raises ValueError if out doesn't match the selection shape.
+    """
+    if out is None:
+        return numpy.zeros(shape, dtype=dtype, order='C')
+    if out.shape != tuple(shape):
+        raise ValueError(
+            f"out array has shape {out.shape}, but the selection has shape {tuple(shape)}"
+        )
+    return out
+
+
+def _take_ragged(values, offsets, order):
+    """Pick sequences from a ragged (values, offsets) pair by index"""
+    lengths = numpy.diff(offsets)[order]
+    new_offsets = numpy.zeros(len(order) + 1, dtype=offsets.dtype)
+    numpy.cumsum(lengths, out=new_offsets[1:])
+    # Position in values of each value kept
+    index = numpy.repeat(offsets[:-1][order] - new_offsets[:-1], lengths)
+    index += numpy.arange(new_offsets[-1], dtype=index.dtype)
+    return values[index], new_offsets
+
+
+def _reorder_ragged(selection, values, offsets):
+    """Put sequences read with sorted, unique indices in the order requested,
+    which may repeat some.
+    """
+    reorder = getattr(selection, 'reorder', None)
+    if reorder:
+        order = _selector.reorder_array(
+            numpy.arange(selection.nselect).reshape(selection.array_shape), reorder
+        ).ravel()
+        values, offsets = _take_ragged(values, offsets, order)
+    return values, offsets
+
 
 def readtime_dtype(basetype, names):
     """Make a NumPy compound dtype with a subset of available fields"""
@@ -482,7 +1086,7 @@ class Dataset(HLObject):
 
         return AsTypeView(self, dtype)
 
-    def asstr(self, encoding=None, errors='strict'):
+    def asstr(self, encoding=None, errors='strict', *, dtype=object):
         """Get a wrapper to read string data as Python strings:
 
         >>> str_array = dataset.asstr()[:]
@@ -491,6 +1095,10 @@ class Dataset(HLObject):
         If ``encoding`` is unspecified, it will use the encoding in the HDF5
         datatype (either ascii or utf-8).
 
+        Strings are returned in an object array, or, with ``dtype='T'``
+        (NumPy 2.0 and later), a NumPy variable-width string array. Either
+        way, they are decoded in a single pass in C.
+
         .. note::
            On NumPy 2.0 and later, it is recommended to use native NumPy
            variable-width strings instead:
@@ -503,9 +1111,14 @@ class Dataset(HLObject):
                 "dset.asstr() can only be used on datasets with "
                 "an HDF5 string datatype"
             )
+        dtype = numpy.dtype(dtype)
+        if dtype.kind not in 'OT':
+            raise TypeError(
+                f"dset.asstr() can only return object or StringDType arrays, not {dtype}"
+            )
         if encoding is None:
             encoding = string_info.encoding
-        return AsStrView(self, encoding, errors=errors)
+        return AsStrView(self, encoding, errors=errors, dtype=dtype)
 
     def fields(self, names, *, _prior_dtype=None):
         """Get a wrapper to read a subset of fields from a compound data type:
@@ -520,6 +1133,30 @@ class Dataset(HLObject):
             _prior_dtype = self.dtype
         return FieldsView(self, _prior_dtype, names)
 
+    @property
+    def oindex(self):
+        """Index with lists of indices on several axes independently:
+
+        >>> dset.oindex[[1, 5, 9], :, [0, 3]]  # shape (3, dset.shape[1], 2)
+
+        Each list or array selects along its own axis, so the result holds
+        the outer product of the indices, like ``numpy.ix_``. The selection
+        is read or written with a single HDF5 call.
+        """
+        return OrthogonalIndexer(self)
+
+    @property
+    def lazy(self):
+        """Index without reading, to build up a selection in several steps:
+
+        >>> view = dset.lazy[100:5000][::2][:, 3]  # nothing read yet
+        >>> arr = view.read()  # reads only the final selection
+
+        Views also have sum(), mean(), min() and max() methods, which read
+        the selection in chunk-sized blocks.
+        """
+        return LazyView(self)
+
     if MPI:
         @property
         @with_phil
@@ -614,6 +1251,18 @@ class Dataset(HLObject):
             self._cache_props['_fast_reader'] = rdr
         return rdr
 
+    def _fields_reader(self, dtype):
+        """Internal object for optimised reading of a subset of fields"""
+        readers = self._cache_props.get('_fields_readers')
+        if readers is not None and dtype in readers:
+            return readers[dtype]
+
+        rdr = _selector.Reader(self.id, dtype)
+
+        if self._readonly:
+            self._cache_props.setdefault('_fields_readers', {})[dtype] = rdr
+        return rdr
+
     @property
     @with_phil
     def dtype(self):
@@ -745,6 +1394,33 @@ class Dataset(HLObject):
         """
         return filters.get_filters(self._dcpl)
 
+    @property
+    def _has_chunk_stats(self):
+        """ Does this dataset have per-chunk statistics to keep up to date? """
+        if '_has_chunk_stats' in self._cache_props:
+            return self._cache_props['_has_chunk_stats']
+
+        with phil:
+            has_stats = (
+                self._dcpl.get_layout() == h5d.CHUNKED
+                and h5a.exists(self.id, chunkstats.CHUNK_STATS_ATTR.encode())
+            )
+
+        # Statistics may be built through another Dataset object, so this
+        # is only cached if the file is read-only, like the shape.
+        if self._readonly:
+            self._cache_props['_has_chunk_stats'] = has_stats
+        return has_stats
+
+    @cached_property
+    @with_phil
+    def _chunk_pipeline(self):
+        """
+        In-process version of the filter pipeline, for decoding raw chunks
+        outside HDF5, or None if this dataset's chunks can't be handled.
+        """
+        return chunkio.chunk_pipeline(self)
+
     @with_phil
     def __init__(self, bind, *, readonly=False):
         """ Create a new Dataset object by binding to a low-level DatasetID.
@@ -788,6 +1464,8 @@ class Dataset(HLObject):
             size = tuple(size)
             self.id.set_extent(size)
             #h5f.flush(self.id)  # THG recommends
+            if self._has_chunk_stats:
+                chunkstats.resized(self)
 
     @with_phil
     def __len__(self):
@@ -816,13 +1494,212 @@ class Dataset(HLObject):
     def __iter__(self):
         """ Iterate over the first axis.  TypeError if scalar.
 
+        Rows are read in blocks, see iter_rows().
+
+        BEWARE: Modifications to the yielded data are *NOT* written to file.
+        """
+        return self.iter_rows()
+
+    def iter_rows(self, block_rows=None):
+        """ Iterate over the first axis, reading block_rows rows at a time.
+
+        By default, blocks of about ITER_BLOCK_SIZE bytes are read.  For
+        chunked datasets, they are a whole number of chunks along the first
+        axis (at least one), so each chunk is read and decompressed only
+        once.  The yielded rows are views of the block they were read in.
+
         BEWARE: Modifications to the yielded data are *NOT* written to file.
         """
-        shape = self.shape
-        if len(shape) == 0:
-            raise TypeError("Can't iterate over a scalar dataset")
-        for i in range(shape[0]):
-            yield self[i]
+        with phil:
+            shape = self.shape
+            if len(shape) == 0:
+                raise TypeError("Can't iterate over a scalar dataset")
+            if block_rows is None:
+                row_nbytes = product(shape[1:]) * self.dtype.itemsize
+                block_rows = max(ITER_BLOCK_SIZE // max(row_nbytes, 1), 1)
+                chunks = self.chunks
+                if chunks is not None:
+                    block_rows = max(block_rows // chunks[0], 1) * chunks[0]
+            elif block_rows < 1:
+                raise ValueError(f"block_rows must be at least 1 (got {block_rows})")
+        return self._iter_blocks(shape[0], block_rows)
+
+    def _iter_blocks(self, nrows, block_rows):
+        for start in range(0, nrows, block_rows):
+            block = self[start:min(start + block_rows, nrows)]
+            yield from block
+
+    def chunk_index(self, coords=None):
+        """ Get storage information about the written chunks of a chunked
+        dataset, as a structured array with fields offset, filter_mask,
+        byte_offset and size, sorted in C order of the chunk offsets.
+
+        If coords is given, it should be a sequence of coordinates (or an
+        array with shape (..., rank)); the records for the chunks containing
+        those coordinates are returned instead.  Chunks which have not been
+        written get a record with size 0.
+
+        The index is cached for datasets in read-only files.
+
+        A TypeError will be raised if the dataset is not chunked.
+        """
+        with phil:
+            chunks = self.chunks
+            if chunks is None:
+                raise TypeError("Dataset is not chunked")
+            index = self._cache_props.get('_chunk_index')
+            if index is None:
+                if not self._readonly:
+                    # Chunks still in the chunk cache may not be on disk yet
+                    self.id.flush()
+                index = chunkio.build_chunk_index(self.id, chunks, self.shape)
+                if self._readonly:
+                    self._cache_props['_chunk_index'] = index
+            shape = self.shape
+
+        if coords is None:
+            return index
+        return chunkio.lookup_chunks(index, chunks, shape, coords)
+
+    def build_chunk_stats(self, fields=None, name=None):
+        """ Compute the minimum, maximum and number of NaNs in each chunk,
+        and store them in a companion dataset, for where() and
+        select_chunks() to skip chunks which can't match a query.
+
+        For a compound type, fields lists the numeric fields to keep
+        statistics for (by default, all of them).  The companion dataset is
+        created next to this one, with the given name (by default, this
+        dataset's name plus '_chunk_stats'), and replaces any previous
+        statistics.  Once built, the statistics are updated when data is
+        written through h5py, which reads back the chunks written.
+
+        Returns the companion dataset.
+        """
+        if name is None:
+            if self.name is None:
+                raise ValueError("A name is needed for the statistics of an anonymous dataset")
+            name = pp.basename(self.name) + '_chunk_stats'
+        return chunkstats.build(self, name, fields)
+
+    def chunk_stats(self):
+        """ Get the per-chunk statistics made by build_chunk_stats(), as a
+        structured array with one record per chunk in C order of the chunk
+        grid, or None if there are none (or they are out of date because
+        the dataset was resized along an axis other than the first).
+        """
+        stats = chunkstats.open_stats(self)
+        return None if stats is None else stats[()]
+
+    def select_chunks(self, lo=None, hi=None, *, field=None):
+        """ Get the chunks which may hold values from lo to hi (inclusive;
+        None for no limit), as a list of tuples of slices, in chunk order.
+
+        Chunks are ruled out using the statistics from build_chunk_stats();
+        without them, every chunk is returned.  For a compound type, field
+        names the field to compare.
+        """
+        return chunkstats.candidates(self, lo, hi, field)
+
+    def where(self, cond, *, field=None):
+        """ Find the elements matching a condition, reading only the chunks
+        which may hold them (see select_chunks).
+
+        cond is a comparison like '> 40' (with <, <=, >, >= or ==), or a
+        (lo, hi) tuple for lo <= value <= hi.  For a compound type, field
+        names the field to compare.  Returns a tuple of index arrays, one
+        per axis, like numpy.nonzero.
+        """
+        return chunkstats.where(self, cond, field)
+
+    def as_mmap(self, mode='r', *, threads=None):
+        """ Map the raw data of a contiguous dataset into memory.
+
+        Returns a numpy.memmap of the dataset's shape and dtype, which reads
+        straight from the file through the OS page cache, without going
+        through HDF5 or taking the global lock.  The dataset must be stored
+        contiguously (not chunked, compact or virtual), its storage must be
+        allocated, and the file must be open with the 'sec2' or 'stdio'
+        driver.  Types without a fixed-size NumPy equivalent (e.g. variable
+        length strings) can't be mapped.
+
+        For datasets with external storage, the external files are mapped
+        instead.  If the data is split over more than one segment, an
+        ExternalMmap is returned, which maps each segment and reads from
+        them on up to `threads` threads when indexed.  It is read-only, so
+        mode 'r+' raises ValueError in this case.
+
+        mode is passed to numpy.memmap: 'r' (read-only), 'c' (copy on
+        write) or 'r+' (writes go to the file; the HDF5 file must be open
+        for writing).  Data written through HDF5 after the map is made may
+        not be visible through it until the file is flushed, and vice versa.
+
+        A dataset with no elements has nothing to map; an empty array is
+        returned for it.
+        """
+        if mode not in ('r', 'r+', 'c'):
+            raise ValueError(f"mode must be 'r', 'r+' or 'c' (got {mode!r})")
+        with phil:
+            if self._dcpl.get_layout() != h5d.CONTIGUOUS:
+                raise TypeError("Only contiguous datasets can be memory-mapped")
+            dtype = self.dtype
+            if dtype.hasobject or self.id.get_type().get_size() != dtype.itemsize:
+                raise TypeError(f"Data of type {dtype} can't be memory-mapped")
+            if mode == 'r+' and self._readonly:
+                raise ValueError("File must be open for writing to map it with mode 'r+'")
+            if self._is_empty:
+                raise TypeError("Empty datasets have no numpy representation")
+            shape = self.shape
+            if product(shape) == 0:
+                empty = numpy.empty(shape, dtype=dtype)
+                empty.flags.writeable = mode != 'r'
+                return empty
+            if self._dcpl.get_external_count() > 0:
+                segments = self._external_segments()
+                if len(segments) == 1:
+                    path, offset, _, _ = segments[0]
+                    return numpy.memmap(path, dtype=dtype, mode=mode,
+                                        offset=offset, shape=shape)
+                if mode == 'r+':
+                    raise ValueError(
+                        "Data split over several external files can't be mapped with mode 'r+'"
+                    )
+                return ExternalMmap(segments, dtype, shape, mode, threads)
+            if self.file.driver not in ('sec2', 'stdio'):
+                raise ValueError(
+                    f"Can't memory-map data in a file opened with the {self.file.driver!r} driver"
+                )
+            if not self._readonly:
+                # Data may still be in HDF5's buffers
+                self.file.flush()
+            offset = self.id.get_offset()
+            if offset is None:
+                raise ValueError("Dataset storage is not allocated")
+            return numpy.memmap(self.file.filename, dtype=dtype, mode=mode,
+                                offset=offset, shape=shape)
+
+    def _external_segments(self):
+        """ Get (path, file offset, data offset, length) for each external
+        file segment holding part of the dataset's data, in order.
+        """
+        nbytes = product(self.shape) * self.dtype.itemsize
+        # HDF5 gives the prefix with ${ORIGIN} or $HDF5_EXTFILE_PREFIX applied
+        prefix = filename_decode(self.id.get_access_plist().get_efile_prefix())
+        segments = []
+        pos = 0
+        for name, offset, size in self.external:
+            if pos >= nbytes:
+                break
+            length = nbytes - pos if size == h5f.UNLIMITED else min(size, nbytes - pos)
+            if length == 0:
+                continue
+            path = name if (not prefix or os.path.isabs(name)) else os.path.join(prefix, name)
+            if os.path.getsize(path) < offset + length:
+                raise ValueError(
+                    f"External file {path!r} is too short to map {length} bytes at offset {offset}"
+                )
+            segments.append((path, offset, pos, length))
+            pos += length
+        return segments
 
     @with_phil
     def iter_chunks(self, sel=None):
@@ -841,16 +1718,329 @@ class Dataset(HLObject):
         """
         return ChunkIterator(self, sel)
 
+    def read(self, sel=(), *, out=None, threads=None):
+        """ Read a selection from the dataset, like ``dset[sel]``.
+
+        ``sel`` is anything that could go inside the square brackets, e.g.
+        ``numpy.s_[:100, 5]``.
+
+        If ``out`` is given, the data is read into it and it is returned, as
+        a NumPy array, instead of allocating a new array.  It may be any
+        writable, C-contiguous buffer with the shape of the selection.  If
+        its dtype differs from the dataset, HDF5 converts the data.
+
+        If ``threads`` is given, chunks of a compressed dataset are read raw
+        and decompressed on a pool of that many threads, outside the HDF5
+        library lock.  This works for gzip, lzf, shuffle and fletcher32
+        filters with simple numeric types, and regular (slice and integer)
+        selections; anything else is read the normal way.
+        """
+        args = sel if isinstance(sel, tuple) else (sel,)
+        if out is not None:
+            out = numpy.asarray(out)
+            if not out.flags.writeable:
+                raise ValueError("out must be a writable array")
+            if not out.flags.c_contiguous:
+                return self._read_strided(args, out)
+        if threads is not None:
+            if threads < 1:
+                raise ValueError(f"threads must be at least 1 (got {threads})")
+            arr = chunkio.read_parallel(self, args, threads, out)
+            if arr is not NotImplemented:
+                return arr
+        return self.__getitem__(args, out=out)
+
+    def appender(self, axis=0, *, flush_rows=None, flush_interval=None):
+        """ Get an Appender to add data along an axis of a resizable dataset.
+
+        Rows are buffered in memory and written a chunk at a time.  Use it
+        as a context manager, or call close() when done, to write the rest::
+
+            with dset.appender() as app:
+                for rows in source:
+                    app.append(rows)
+
+        If flush_rows or flush_interval (in seconds) is given, the appender
+        is flushed after that many rows or that much time, so readers (e.g.
+        with SWMR) see the data, and the extent grows only to the rows
+        written.
+        """
+        return Appender(self, axis, flush_rows, flush_interval)
+
+    def fill(self, value, sel=()):
+        """ Set every element of a selection to value, like ``dset[sel] =
+        value`` for a scalar value.
+
+        For chunked datasets with gzip, lzf, shuffle or fletcher32 filters
+        (or none), each chunk covered by the selection is written from one
+        constant chunk, which is compressed only once.  If value is the fill
+        value, chunks which have not been written are skipped.  Otherwise,
+        the data is written in blocks from a buffer of up to ITER_BLOCK_SIZE
+        bytes.
+        """
+        args = sel if isinstance(sel, tuple) else (sel,)
+        if self.dtype.subdtype is not None:
+            raise TypeError("Scalar broadcasting is not supported for array dtypes")
+        value = numpy.asarray(value, dtype=self.dtype)
+        if value.shape != ():
+            raise ValueError(f"fill value must be a scalar (got shape {value.shape})")
+        written = chunkio.fill(self, args, value)
+        if written is NotImplemented:
+            self._fill_blocks(args, value)
+        elif self._has_chunk_stats:
+            # Chunks partly filled were written through __setitem__
+            chunkstats.update_chunks(self, written)
+
+    def _fill_blocks(self, args, value):
+        """ Fill a selection along the first axis, writing a constant buffer
+        of up to ITER_BLOCK_SIZE bytes at a time.
+        """
+        with phil:
+            selection = sel.select(self.shape, args, dataset=self)
+            if type(selection) is not sel.SimpleSelection:
+                # Complex selections can't broadcast from a smaller buffer
+                self.__setitem__(args, numpy.full(selection.array_shape, value, dtype=self.dtype))
+                return
+            start, count, step, _ = selection._sel
+            row_nbytes = product(count[1:]) * self.dtype.itemsize
+            if len(count) == 0 or row_nbytes > ITER_BLOCK_SIZE:
+                self.__setitem__(args, value)
+                return
+
+        block_rows = max(ITER_BLOCK_SIZE // max(row_nbytes, 1), 1)
+        buf = numpy.full((min(block_rows, count[0]),) + count[1:], value, dtype=self.dtype)
+        rest = tuple(
+            slice(s, s + c * st, st) for s, c, st in zip(start[1:], count[1:], step[1:], strict=True)
+        )
+        for i in range(0, count[0], block_rows):
+            n = min(block_rows, count[0] - i)
+            first = start[0] + i * step[0]
+            self[(slice(first, first + n * step[0], step[0]),) + rest] = buf[:n]
+
+    def write_parallel(self, data, sel=(), *, threads=None):
+        """ Write data to a selection, like ``dset[sel] = data``, compressing
+        chunks on a pool of threads.
+
+        Chunks covered by the selection are encoded outside the HDF5
+        library lock, by up to ``threads`` threads at once, and written with
+        :meth:`~.DatasetID.write_direct_chunk`.  Chunks which are only partly
+        covered are written the normal way.  This works for gzip, lzf,
+        shuffle and fletcher32 filters with simple numeric types, and regular
+        (slice and integer) selections; anything else is written the normal
+        way.
+        """
+        args = sel if isinstance(sel, tuple) else (sel,)
+        if threads is not None and threads < 1:
+            raise ValueError(f"threads must be at least 1 (got {threads})")
+        written = chunkio.write_parallel(self, args, data, threads)
+        if written is NotImplemented:
+            self.__setitem__(args, data)
+        elif self._has_chunk_stats:
+            # Chunks partly written went through __setitem__
+            chunkstats.update_chunks(self, written)
+
+    def map_blocks(self, func, out=None, *, block=None, workers=None):
+        """ Apply func to the dataset block by block, writing the results to
+        out: another dataset of the same shape, or by default this one.
+
+        func is called with a NumPy array for each block, and must return an
+        array of the same shape, which is converted to out's dtype.  Blocks
+        are the shape given by `block`, or by default out's chunks (or this
+        dataset's, or rows of about ITER_BLOCK_SIZE bytes), and are
+        processed in C order.
+
+        Reading, calling func on a pool of up to `workers` threads, and
+        writing (in order) all run at the same time, with a bounded number
+        of blocks held between them.  When blocks match out's chunks and
+        its filters can be run by h5py, results are also compressed on the
+        pool and written with write_direct_chunk.
+
+        Returns out.
+        """
+        if out is None:
+            out = self
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be at least 1 (got {workers})")
+        with phil:
+            shape = self.shape
+            if shape is None:
+                raise TypeError("Empty datasets can't be mapped")
+            if out.shape != shape:
+                raise ValueError(
+                    f"out has shape {out.shape}, but this dataset has shape {shape}"
+                )
+            if block is None:
+                block = out.chunks or self.chunks
+                if block is None and shape:
+                    row_nbytes = product(shape[1:]) * self.dtype.itemsize
+                    block = (max(ITER_BLOCK_SIZE // max(row_nbytes, 1), 1),) + shape[1:]
+            else:
+                block = tuple(block)
+                if len(block) != len(shape) or any(n < 1 for n in block):
+                    raise ValueError(
+                        f"block must have {len(shape)} positive lengths (got {block})"
+                    )
+        if not shape:
+            out[()] = func(self[()])
+        else:
+            chunkio.map_blocks(self, func, out, block, workers)
+        return out
+
+    def reduce(self, op, axis=None, sel=(), *, workers=None):
+        """ Reduce a selection of the dataset without reading it all at once.
+
+        op is 'sum', 'min', 'max', 'mean', 'var' or 'std', or an instance
+        of a h5py.reducers.Reducer subclass, such as Histogram.  axis is as
+        for the NumPy function, counting the axes of ``dset[sel]``.
+
+        The selection is read one chunk at a time (or blocks of about
+        ITER_BLOCK_SIZE bytes, for datasets which are not chunked), in
+        chunk order, on a pool of up to ``workers`` threads.  Chunks of
+        compressed datasets are decompressed outside the HDF5 library lock
+        where possible.  Selections other than slices and integers are read
+        in one go.
+        """
+        reducer = reducers.get_reducer(op)
+        args = sel if isinstance(sel, tuple) else (sel,)
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be at least 1 (got {workers})")
+        with phil:
+            shape = self.shape
+            blocks = self.chunks
+            if blocks is None and shape:
+                row_nbytes = product(shape[1:]) * self.dtype.itemsize
+                blocks = (max(ITER_BLOCK_SIZE // max(row_nbytes, 1), 1),) + shape[1:]
+        if shape is None:
+            raise TypeError("Empty datasets can't be reduced")
+        res = chunkio.reduce(self, args, reducer, axis, blocks, workers)
+        if res is NotImplemented:
+            data = numpy.asarray(self[args])
+            res = reducer.finalize(
+                reducer.map(data, chunkio.normalize_axis(axis, data.ndim))
+            )
+        return res
+
+    @with_phil
+    def _read_strided(self, args, out):
+        """ Read a selection into a non-contiguous out array, if it is a
+        strided view which HDF5 can write into directly.
+        """
+        selection = sel.select(self.shape, args, dataset=self)
+        if out.shape != selection.array_shape:
+            raise ValueError(
+                f"out array has shape {out.shape}, but the selection has shape {selection.array_shape}"
+            )
+        if out.size == 0:
+            return out
+        strided = sel.strided_memory(out)
+        if strided is None:
+            raise ValueError(
+                "out must be C-contiguous, or a strided view with its axes in C order"
+            )
+        if selection.nselect:
+            base, mspace = strided
+            self.id.read(mspace, selection.id, base, dxpl=self._dxpl)
+        return out
+
+    @with_phil
+    def read_many(self, selections):
+        """ Read several selections, returning a list of arrays.
+
+        ``dset.read_many([np.s_[0:10], np.s_[50:60]])`` gives the same
+        results as ``[dset[0:10], dset[50:60]]``.  If the selections are
+        slices and integers, and don't overlap along the first axis, they
+        are read with a single HDF5 call into one buffer, and the arrays
+        returned are views into that buffer.
+        """
+        selections = [s if isinstance(s, tuple) else (s,) for s in selections]
+        arrs = self._read_many_combined(selections)
+        if arrs is None:
+            arrs = [self[args] for args in selections]
+        return arrs
+
+    def _read_many_combined(self, selections):
+        """Read a list of selections with one H5Dread, or return None"""
+        if (
+            self._extent_type != h5s.SIMPLE
+            or any(isinstance(a, str) for args in selections for a in args)
+        ):
+            return None
+        try:
+            fspace, info = self._selector.make_union(selections)
+        except TypeError:
+            return None
+
+        # HDF5 reads the union in row-major order, so the data for each
+        # selection is a contiguous block of the buffer only if they are
+        # separate along the first axis.  Overlaps are also excluded here, as
+        # HDF5 would read overlapping points once.
+        order = sorted(
+            (i for i, (_, npoints, _, _) in enumerate(info) if npoints),
+            key=lambda i: info[i][2]
+        )
+        for i, j in zip(order[:-1], order[1:]):
+            if info[i][3] >= info[j][2]:
+                return None
+
+        offsets = [0] * len(info)
+        total = 0
+        for i in order:
+            offsets[i] = total
+            total += info[i][1]
+
+        buf = numpy.empty((total,), dtype=self.dtype)
+        if total:
+            mspace = h5s.create_simple((total,))
+            mtype = h5t.py_create(self.dtype)
+            self.id.read(mspace, fspace, buf, mtype, dxpl=self._dxpl)
+
+        arrs = []
+        for (shape, npoints, _, _), offset in zip(info, offsets):
+            arr = buf[offset:offset + npoints].reshape(shape)
+            arrs.append(arr[()] if shape == () else arr)
+        return arrs
+
+    async def aread(self, sel=(), **kwargs):
+        """ Read a selection without blocking the asyncio event loop.
+
+        ``await dset.aread(np.s_[:10])`` is equivalent to
+        ``dset.read(np.s_[:10])``, and takes the same keyword arguments.
+        The read runs on a dedicated h5py I/O thread, shared by all datasets.
+        """
+        return await aio.worker.run(lambda: self.read(sel, **kwargs))
+
+    async def awrite(self, sel, data):
+        """ Write data to a selection without blocking the asyncio event loop.
+
+        ``await dset.awrite(np.s_[:10], arr)`` is equivalent to
+        ``dset[:10] = arr``.
+        """
+        args = sel if isinstance(sel, tuple) else (sel,)
+        await aio.worker.run(self.__setitem__, args, data)
+
+    def aiter_chunks(self, sel=None):
+        """ Asynchronously iterate over the chunks of a chunked dataset.
+
+        Yields ``(slices, data)`` for each chunk within the selection, like
+        reading ``dset[slices]`` for each item of :meth:`iter_chunks`.
+        The next chunk is read while the current one is being processed::
+
+            async for slices, block in dset.aiter_chunks():
+                ...
+        """
+        return aio.iter_chunks(self, self.iter_chunks(sel))
+
     @cached_property
     def _fast_read_ok(self):
         """Is this dataset suitable for simple reading"""
         return (
             self._extent_type == h5s.SIMPLE
-            and isinstance(self.id.get_type(), (h5t.TypeIntegerID, h5t.TypeFloatID))
+            and isinstance(self.id.get_type(), _FAST_READ_TYPES)
+            and not self.dtype.hasobject  # e.g. vlen or reference fields
         )
 
     @with_phil
-    def __getitem__(self, args, new_dtype=None):
+    def __getitem__(self, args, new_dtype=None, out=None):
         """ Read a slice from the HDF5 dataset.
 
         Takes slices and recarray-style field names (more than one is
@@ -860,19 +2050,28 @@ class Dataset(HLObject):
         Also supports:
 
         * Boolean "mask" array indexing
+
+        If out is given (a writable, C-contiguous array with the shape of
+        the selection), data is read into it and it is returned.
         """
         args = args if isinstance(args, tuple) else (args,)
 
         if any(a is None for a in args):  # 'None in args' would fail on arrays
             raise TypeError("Indexing with None (or np.newaxis) is not supported")
 
-        if self._fast_read_ok and (new_dtype is None):
+        if self._fast_read_ok and not any(isinstance(a, str) for a in args):
             try:
-                return self._fast_reader.read(args)
+                if new_dtype is None:
+                    return self._fast_reader.read(args, out)
+                if new_dtype.names is not None and not new_dtype.hasobject:
+                    # Reading a subset of fields (see FieldsView)
+                    return self._fields_reader(new_dtype).read(args, out)
             except TypeError:
                 pass  # Fall back to Python read pathway below
 
         if self._is_empty:
+            if out is not None:
+                raise TypeError("Empty datasets have no numpy representation")
             # Check 'is Ellipsis' to avoid equality comparison with an array:
             # array equality returns an array, not a boolean.
             if args == () or (len(args) == 1 and args[0] is Ellipsis):
@@ -887,10 +2086,10 @@ class Dataset(HLObject):
             if len(names) == 1:
                 names = names[0]  # Read with simpler dtype of this field
             args = tuple(x for x in args if not isinstance(x, str))
-            return self.fields(names, _prior_dtype=new_dtype)[args]
+            return self.fields(names, _prior_dtype=new_dtype)._read(args, out)
 
         if new_dtype is None:
-            new_dtype = self.dtype
+            new_dtype = self.dtype if out is None else out.dtype
         mtype = h5t.py_create(new_dtype)
 
         # === Special-case region references ====
@@ -905,8 +2104,10 @@ class Dataset(HLObject):
             mshape = sel.guess_shape(sid)
             if mshape is None:
                 # 0D with no data (NULL or deselected SCALAR)
+                if out is not None:
+                    raise TypeError("Region reference selects no data to read")
                 return Empty(new_dtype)
-            out = numpy.zeros(mshape, dtype=new_dtype)
+            out = _out_array(out, mshape, new_dtype)
             if out.size == 0:
                 return out
 
@@ -921,7 +2122,7 @@ class Dataset(HLObject):
             # Check 'is Ellipsis' to avoid equality comparison with an array:
             # array equality returns an array, not a boolean.
             if args == () or (len(args) == 1 and args[0] is Ellipsis):
-                return numpy.zeros(self.shape, dtype=new_dtype)
+                return _out_array(out, self.shape, new_dtype)
 
         # === Scalar dataspaces =================
 
@@ -929,32 +2130,41 @@ class Dataset(HLObject):
             fspace = self.id.get_space()
             selection = sel2.select_read(fspace, args)
             if selection.mshape is None:
-                arr = numpy.zeros((), dtype=new_dtype)
+                arr = _out_array(out, (), new_dtype)
             else:
-                arr = numpy.zeros(selection.mshape, dtype=new_dtype)
+                arr = _out_array(out, selection.mshape, new_dtype)
             for mspace, fspace in selection:
                 self.id.read(mspace, fspace, arr, mtype)
-            if selection.mshape is None:
+            if selection.mshape is None and out is None:
                 return arr[()]
             return arr
 
         # === Everything else ===================
 
         # Perform the dataspace selection.
-        selection = sel.select(self.shape, args, dataset=self)
+        selection = sel.select(self.shape, args, dataset=self, unsorted=True)
+        reorder = getattr(selection, 'reorder', None)
 
-        if selection.nselect == 0:
-            return numpy.zeros(selection.array_shape, dtype=new_dtype)
+        if reorder:
+            # Read sorted, unique indices, then rearrange to the order requested
+            _out_array(
+                out, _selector.reorder_shape(selection.array_shape, reorder), new_dtype
+            )
+            arr = numpy.zeros(selection.array_shape, dtype=new_dtype)
+        else:
+            arr = _out_array(out, selection.array_shape, new_dtype)
 
-        arr = numpy.zeros(selection.array_shape, new_dtype, order='C')
+        if selection.nselect != 0:
+            # Perform the actual read
+            mspace = h5s.create_simple(selection.mshape)
+            fspace = selection.id
+            self.id.read(mspace, fspace, arr, mtype, dxpl=self._dxpl)
 
-        # Perform the actual read
-        mspace = h5s.create_simple(selection.mshape)
-        fspace = selection.id
-        self.id.read(mspace, fspace, arr, mtype, dxpl=self._dxpl)
+        if reorder:
+            return _selector.reorder_array(arr, reorder, out)
 
         # Patch up the output for NumPy
-        if arr.shape == ():
+        if arr.shape == () and out is None:
             return arr[()]   # 0 dim array -> numpy scalar
         return arr
 
@@ -967,13 +2177,19 @@ class Dataset(HLObject):
         match.
         """
         args = args if isinstance(args, tuple) else (args,)
+        self._write(args, val)
+        if self._has_chunk_stats:
+            chunkstats.update(self, args)
 
+    def _write(self, args, val):
+        """ Write val to the selection args (a tuple), for __setitem__ """
         # Sort field indices from the slicing
         names = tuple(x for x in args if isinstance(x, str))
         args = tuple(x for x in args if not isinstance(x, str))
 
         # Generally we try to avoid converting the arrays on the Python
         # side.  However, for compound literals this is unavoidable.
+        strided = None
         vlen = h5t.check_vlen_dtype(self.dtype)
         if vlen is not None and vlen not in (bytes, str):
             try:
@@ -1030,7 +2246,13 @@ class Dataset(HLObject):
             # If the input data is already an array, let HDF5 do the conversion.
             # If it's a list or similar, don't make numpy guess a dtype for it.
             dt = None if isinstance(val, numpy.ndarray) else self.dtype.base
-            val = numpy.asarray(val, order='C', dtype=dt)
+            if dt is None and not val.flags.c_contiguous and self.dtype.subdtype is None:
+                # Views like arr[:, 10:20] can be written without a copy
+                inner = [st for n, st in zip(val.shape, val.strides) if n > 1]
+                if val.nbytes >= STRIDED_COPY_LIMIT or (inner and inner[-1] == val.itemsize):
+                    strided = sel.strided_memory(val)
+            if strided is None:
+                val = numpy.asarray(val, order='C', dtype=dt)
 
         # Check for array dtype compatibility and convert
         if self.dtype.subdtype is not None:
@@ -1103,6 +2325,13 @@ class Dataset(HLObject):
             val = val2
             mshape = val.shape
 
+        if strided is not None:
+            if mshape == selection.array_shape:
+                base, mspace = strided
+                self.id.write(mspace, selection.id, base, mtype, dxpl=self._dxpl)
+                return
+            val = numpy.ascontiguousarray(val)
+
         # Perform the write, with broadcasting
         mspace = h5s.create_simple(selection.expand_shape(mshape))
         for fspace in selection.broadcast(mshape):
@@ -1111,10 +2340,14 @@ class Dataset(HLObject):
     def read_direct(self, dest, source_sel=None, dest_sel=None):
         """ Read data directly from HDF5 into an existing NumPy array.
 
-        The destination array must be C-contiguous and writable.
-        Selections must be the output of numpy.s_[<args>].
+        The destination array must be writable, and either C-contiguous or
+        a strided view of a C-contiguous array, with its axes in the same
+        order (e.g. ``arr[:, ::2]``).  Selections must be the output of
+        numpy.s_[<args>].
 
-        Broadcasting is supported for simple indexing.
+        Broadcasting is supported for simple indexing, into either kind of
+        destination array.  Other strided arrays (e.g. transposed) raise
+        TypeError.
         """
         with phil:
             if self._is_empty:
@@ -1130,14 +2363,23 @@ class Dataset(HLObject):
             else:
                 dest_sel = sel.select(dest.shape, dest_sel)
 
+            if isinstance(dest, numpy.ndarray) and not dest.flags.c_contiguous:
+                strided = _strided_selection(dest, dest_sel, source_sel.array_shape)
+                if strided is not None:
+                    base, mspaces = strided
+                    for mspace in mspaces:
+                        self.id.read(mspace, fspace, base, dxpl=self._dxpl)
+                    return
+
             for mspace in dest_sel.broadcast(source_sel.array_shape):
                 self.id.read(mspace, fspace, dest, dxpl=self._dxpl)
 
     def write_direct(self, source, source_sel=None, dest_sel=None):
         """ Write data directly to HDF5 from a NumPy array.
 
-        The source array must be C-contiguous.  Selections must be
-        the output of numpy.s_[<args>].
+        The source array must be C-contiguous, or a strided view of a
+        C-contiguous array, with its axes in the same order (e.g.
+        ``arr[:, ::2]``).  Selections must be the output of numpy.s_[<args>].
 
         Broadcasting is supported for simple indexing.
         """
@@ -1150,6 +2392,11 @@ class Dataset(HLObject):
                 source_sel = sel.select(source.shape, source_sel)  # for numpy.s_
             mspace = source_sel.id
 
+            if isinstance(source, numpy.ndarray) and not source.flags.c_contiguous:
+                strided = _strided_selection(source, source_sel)
+                if strided is not None:
+                    source, (mspace,) = strided
+
             if dest_sel is None:
                 dest_sel = sel.SimpleSelection(self.shape)
             else:
@@ -1158,6 +2405,103 @@ class Dataset(HLObject):
             for fspace in dest_sel.broadcast(source_sel.array_shape):
                 self.id.write(mspace, fspace, source, dxpl=self._dxpl)
 
+            if self._has_chunk_stats:
+                chunkstats.update_selection(self, dest_sel)
+
+    def _ragged_base(self):
+        base = h5t.check_vlen_dtype(self.dtype)
+        if base is None or base in (bytes, str):
+            raise TypeError(
+                "Ragged reads and writes need a variable-length sequence dataset "
+                "(see h5py.vlen_dtype)"
+            )
+        return base
+
+    def read_ragged(self, sel=(), *, dtype=None):
+        """ Read variable-length sequences as two flat arrays, (values,
+        offsets), in the layout of an Apache Arrow list array: element i of
+        the selection (in C order) is values[offsets[i]:offsets[i+1]].
+
+        This avoids making a NumPy array for each element, as indexing the
+        dataset does.  dtype is the type to read values as; by default, the
+        base type of the sequences.
+        """
+        args = sel if isinstance(sel, tuple) else (sel,)
+        base = self._ragged_base()
+        return self._read_ragged(args, base if dtype is None else numpy.dtype(dtype))
+
+    def _read_ragged(self, args, dtype):
+        with phil:
+            selection = sel.select(self.shape, args, dataset=self, unsorted=True)
+            values, offsets = self.id.read_ragged(selection.id, dtype, dxpl=self._dxpl)
+        return _reorder_ragged(selection, values, offsets)
+
+    def write_ragged(self, sel, values, offsets):
+        """ Write variable-length sequences from two flat arrays, in the
+        layout of an Apache Arrow list array: element i of the selection (in
+        C order) is set to values[offsets[i]:offsets[i+1]].
+
+        The sequences are passed to HDF5 straight from values, without
+        making an array for each one.
+        """
+        args = sel if isinstance(sel, tuple) else (sel,)
+        base = self._ragged_base()
+        if not isinstance(values, numpy.ndarray):
+            values = numpy.asarray(values, dtype=base)
+        self._write_ragged(args, values, offsets)
+
+    def _write_ragged(self, args, values, offsets):
+        with phil:
+            if self._is_empty:
+                raise TypeError("Empty datasets cannot be written to")
+            selection = sel.select(self.shape, args, dataset=self)
+            self.id.write_ragged(selection.id, values, offsets, dxpl=self._dxpl)
+
+    def _strings_buffers_check(self):
+        string_info = h5t.check_string_dtype(self.dtype)
+        if string_info is None or string_info.length is not None:
+            raise TypeError("String buffers need a variable-length string dataset")
+
+    def read_strings_buffers(self, sel=()):
+        """ Read variable-length strings as two flat arrays, (offsets, data),
+        in the layout of an Apache Arrow string array: element i of the
+        selection (in C order) is the encoded string data[offsets[i]:offsets[i+1]].
+
+        offsets is an int64 array, and data a uint8 array, filled straight
+        from the strings HDF5 reads, without making a Python object for each.
+        """
+        args = sel if isinstance(sel, tuple) else (sel,)
+        self._strings_buffers_check()
+        return self._read_strings_buffers(args)
+
+    def _read_strings_buffers(self, args):
+        with phil:
+            selection = sel.select(self.shape, args, dataset=self, unsorted=True)
+            offsets, data = self.id.read_strings_buffers(selection.id, dxpl=self._dxpl)
+        data, offsets = _reorder_ragged(selection, data, offsets)
+        return offsets, data
+
+    def write_strings_buffers(self, sel, offsets, data):
+        """ Write variable-length strings from two flat arrays, in the layout
+        of an Apache Arrow string array: element i of the selection (in C
+        order) is set to the encoded string data[offsets[i]:offsets[i+1]].
+
+        data may be a uint8 array or a bytes-like object.  The bytes are
+        stored as they are, so they should be in the dataset's encoding.
+        """
+        args = sel if isinstance(sel, tuple) else (sel,)
+        self._strings_buffers_check()
+        if not isinstance(data, numpy.ndarray):
+            data = numpy.frombuffer(data, dtype=numpy.uint8)
+        self._write_strings_buffers(args, offsets, data)
+
+    def _write_strings_buffers(self, args, offsets, data):
+        with phil:
+            if self._is_empty:
+                raise TypeError("Empty datasets cannot be written to")
+            selection = sel.select(self.shape, args, dataset=self)
+            self.id.write_strings_buffers(selection.id, offsets, data, dxpl=self._dxpl)
+
     @with_phil
     def __array__(self, dtype=None, copy=None):
         """ Create a Numpy array containing the whole dataset.  DON'T THINK
@@ -39,6 +39,7 @@
 """
 from collections.abc import Mapping
 import operator
+import zlib
 
 import numpy as np
 from .base import product
@@ -354,6 +355,146 @@ def get_filters(plist):
 
     return pipeline
 
+class FilterPipeline:
+    """ In-process implementation of a dataset's filter pipeline.
+
+    Decodes raw chunks read with DatasetID.read_direct_chunk, and encodes
+    chunks for DatasetID.write_direct_chunk, without going through HDF5.
+    Only gzip, lzf, shuffle and fletcher32 are supported; use from_dcpl() to
+    check whether a dataset's pipeline can be handled.
+
+    The work is done by zlib, NumPy and the h5z codecs, which release the
+    GIL, so one pipeline may be used from several threads at once.
+
+    Undocumented and subject to change without warning.
+    """
+
+    supported = frozenset((h5z.FILTER_DEFLATE, h5z.FILTER_LZF,
+                           h5z.FILTER_SHUFFLE, h5z.FILTER_FLETCHER32))
+
+    def __init__(self, filters, chunk_nbytes):
+        # filters is a sequence of (code, flags, cd_values) in pipeline order
+        self.filters = tuple(filters)
+        self.chunk_nbytes = chunk_nbytes
+
+    @classmethod
+    def from_dcpl(cls, plist, itemsize, chunks):
+        """ Build a pipeline for a chunked dataset, or return None if any
+        filter in it can't be handled in-process.
+        """
+        filters = []
+        for i in range(plist.get_nfilters()):
+            code, flags, vals, _ = plist.get_filter(i)
+            if code not in cls.supported:
+                return None
+            if code == h5z.FILTER_SHUFFLE and not vals:
+                vals = (itemsize,)  # Set by HDF5 when the dataset is created
+            filters.append((code, flags, vals))
+        return cls(filters, product(chunks) * itemsize)
+
+    def decode(self, raw, filter_mask=0):
+        """ Undo the filters applied to a raw chunk.
+
+        Filters with their bit set in filter_mask were skipped when the chunk
+        was written, and are skipped here too.  Returns a bytes-like object
+        of the uncompressed chunk.
+        """
+        buf = raw
+        for i in range(len(self.filters) - 1, -1, -1):
+            if filter_mask & (1 << i):
+                continue
+            code, flags, vals = self.filters[i]
+            if code == h5z.FILTER_DEFLATE:
+                buf = zlib.decompress(buf, bufsize=self.chunk_nbytes)
+            elif code == h5z.FILTER_LZF:
+                buf = self._lzf_decompress(buf, vals)
+            elif code == h5z.FILTER_SHUFFLE:
+                buf = _unshuffle(buf, vals[0])
+            elif code == h5z.FILTER_FLETCHER32:
+                buf = _fletcher32_check(buf)
+        return buf
+
+    def encode(self, data):
+        """ Apply the filters to an uncompressed chunk.
+
+        Returns a tuple (filter_mask, bytes-like), suitable for passing to
+        DatasetID.write_direct_chunk.
+        """
+        buf = memoryview(data).cast('B')
+        filter_mask = 0
+        for i, (code, flags, vals) in enumerate(self.filters):
+            if code == h5z.FILTER_DEFLATE:
+                level = vals[0] if vals else DEFAULT_GZIP
+                buf = zlib.compress(buf, level)
+            elif code == h5z.FILTER_LZF:
+                out = bytearray(len(buf))
+                nbytes = h5z.lzf_compress_buffer(buf, out)
+                if nbytes == 0:
+                    # Data didn't shrink: the filter is optional, so HDF5
+                    # stores the chunk unfiltered and records that in the mask
+                    filter_mask |= 1 << i
+                else:
+                    buf = memoryview(out)[:nbytes]
+            elif code == h5z.FILTER_SHUFFLE:
+                buf = _shuffle(buf, vals[0])
+            elif code == h5z.FILTER_FLETCHER32:
+                checksum = h5z.fletcher32(buf)
+                buf = bytes(buf) + checksum.to_bytes(4, 'little')
+        return filter_mask, buf
+
+    def _lzf_decompress(self, buf, vals):
+        # The third filter parameter is the uncompressed chunk size
+        outsize = vals[2] if len(vals) >= 3 and vals[2] else self.chunk_nbytes
+        while True:
+            out = bytearray(outsize)
+            nbytes = h5z.lzf_decompress_buffer(buf, out)
+            if nbytes:
+                return memoryview(out)[:nbytes]
+            outsize += max(len(buf), 1)
+
+
+def _shuffle(buf, itemsize):
+    """ Byte-shuffle a buffer, as the HDF5 shuffle filter does """
+    src = np.frombuffer(buf, dtype=np.uint8)
+    if itemsize <= 1:
+        return src
+    n = len(src) // itemsize
+    out = np.empty_like(src)
+    out[:n * itemsize].reshape(itemsize, n)[...] = \
+        src[:n * itemsize].reshape(n, itemsize).T
+    out[n * itemsize:] = src[n * itemsize:]  # Leftover bytes are not moved
+    return out
+
+
+def _unshuffle(buf, itemsize):
+    """ Reverse the HDF5 shuffle filter """
+    src = np.frombuffer(buf, dtype=np.uint8)
+    if itemsize <= 1:
+        return src
+    n = len(src) // itemsize
+    out = np.empty_like(src)
+    out[:n * itemsize].reshape(n, itemsize)[...] = \
+        src[:n * itemsize].reshape(itemsize, n).T
+    out[n * itemsize:] = src[n * itemsize:]
+    return out
+
+
+def _fletcher32_check(buf):
+    """ Verify and strip the checksum added by the Fletcher32 filter """
+    data = memoryview(buf).cast('B')
+    if len(data) < 4:
+        raise OSError("Chunk too small to hold a Fletcher32 checksum")
+    stored = int.from_bytes(data[-4:], 'little')
+    data = data[:-4]
+    checksum = h5z.fletcher32(data)
+    # HDF5 before 1.6.3 computed the checksum with bytes swapped in each
+    # 16-bit half; it still accepts that, so we do too.
+    swapped = ((checksum & 0x00ff00ff) << 8) | ((checksum >> 8) & 0x00ff00ff)
+    if stored not in (checksum, swapped):
+        raise OSError("Fletcher32 checksum mismatch in chunk data")
+    return data
+
+
 CHUNK_BASE = 16*1024    # Multiplier by which chunks are adjusted
 CHUNK_MIN = 8*1024      # Soft lower limit (8k)
 CHUNK_MAX = 1024*1024   # Hard upper limit (1M)
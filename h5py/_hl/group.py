@@ -219,6 +219,9 @@ class Group(HLObject, MutableMappingHDF5):
             rdcc_nbytes bytes. For maximum performance, this value should be set
             approximately 100 times that number of chunks. The default value is
             521.
+        parallel_compress
+            (Integer) Compress the chunks of "data" on this many threads,
+            as Dataset.write_parallel() does.
         """
         if 'track_order' not in kwds:
             kwds['track_order'] = h5.get_config().track_order
@@ -0,0 +1,191 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2020 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Reductions for Dataset.reduce().
+
+    A dataset is reduced one block (normally one chunk) at a time.  Each
+    block is turned into a partial result, and partial results for blocks
+    covering the same output elements are merged in chunk order.  The
+    reducers here merge sums, extremes, means and variances without losing
+    precision to the order of the blocks; subclass Reducer for others.
+"""
+
+from abc import ABC, abstractmethod
+import math
+
+import numpy
+
+
+class Reducer(ABC):
+    """ Base class for reductions used with Dataset.reduce().
+
+    Subclasses implement map() and combine(), and may override finalize().
+    combine() must be associative, as partial results are merged as blocks
+    are read, but it needn't be commutative: blocks along a reduced axis
+    are always merged in order.
+    """
+
+    @abstractmethod
+    def map(self, block, axis):
+        """ Reduce a NumPy array along axis (a tuple of ints) to a partial
+        result.
+        """
+        ...  # pragma: nocover
+
+    @abstractmethod
+    def combine(self, a, b):
+        """ Merge partial results from two adjacent blocks. """
+        ...  # pragma: nocover
+
+    def finalize(self, partial):
+        """ Turn the partial result for all blocks into the answer. """
+        return partial
+
+
+class Sum(Reducer):
+    """ Sum of the elements, like numpy.sum """
+
+    def map(self, block, axis):
+        return numpy.sum(block, axis=axis)
+
+    def combine(self, a, b):
+        return a + b
+
+
+class Min(Reducer):
+    """ Smallest element, like numpy.min """
+
+    def map(self, block, axis):
+        return numpy.min(block, axis=axis)
+
+    def combine(self, a, b):
+        return numpy.minimum(a, b)
+
+
+class Max(Reducer):
+    """ Largest element, like numpy.max """
+
+    def map(self, block, axis):
+        return numpy.max(block, axis=axis)
+
+    def combine(self, a, b):
+        return numpy.maximum(a, b)
+
+
+def _acc_dtype(dtype):
+    """ Type to accumulate sums in, as for numpy.mean """
+    return numpy.dtype('f8') if dtype.kind in 'biu' else dtype
+
+
+class Mean(Reducer):
+    """ Arithmetic mean, like numpy.mean """
+
+    def map(self, block, axis):
+        n = math.prod(block.shape[a] for a in axis)
+        return n, numpy.sum(block, axis=axis, dtype=_acc_dtype(block.dtype))
+
+    def combine(self, a, b):
+        return a[0] + b[0], a[1] + b[1]
+
+    def finalize(self, partial):
+        n, total = partial
+        return numpy.true_divide(total, n, dtype=total.dtype)
+
+
+class Var(Reducer):
+    """ Variance, like numpy.var.
+
+    Each block's count, mean and sum of squared deviations are found with
+    NumPy, and merged with the pairwise update of Chan et al. (the parallel
+    form of Welford's algorithm), so no large sums are subtracted.
+    """
+
+    def __init__(self, ddof=0):
+        self.ddof = ddof
+
+    def map(self, block, axis):
+        n = math.prod(block.shape[a] for a in axis)
+        block = block.astype(_acc_dtype(block.dtype), copy=False)
+        mean = numpy.mean(block, axis=axis, keepdims=True)
+        dev = block - mean
+        m2 = numpy.sum((dev * dev.conj()).real, axis=axis)
+        return n, numpy.squeeze(mean, axis=axis), m2
+
+    def combine(self, a, b):
+        na, mean_a, m2_a = a
+        nb, mean_b, m2_b = b
+        n = na + nb
+        if na == 0 or nb == 0:
+            return b if na == 0 else a
+        delta = mean_b - mean_a
+        mean = mean_a + delta * (nb / n)
+        m2 = m2_a + m2_b + (delta * delta.conj()).real * (na * nb / n)
+        return n, mean, m2
+
+    def finalize(self, partial):
+        n, _, m2 = partial
+        return numpy.true_divide(m2, max(n - self.ddof, 0), dtype=m2.dtype)
+
+
+class Std(Var):
+    """ Standard deviation, like numpy.std """
+
+    def finalize(self, partial):
+        return numpy.sqrt(super().finalize(partial))
+
+
+class Histogram(Reducer):
+    """ Histogram of the elements, like numpy.histogram.
+
+    bins is a number of equal-width bins, which needs range=(min, max),
+    or a sequence of bin edges.  The result is (counts, edges).  Only
+    reductions over all axes (axis=None) are supported.
+    """
+
+    def __init__(self, bins=10, range=None):  # pylint: disable=redefined-builtin
+        if numpy.ndim(bins) == 0 and range is None:
+            raise ValueError(
+                "Histogram needs a range if bins is a number, as the data "
+                "is only read once"
+            )
+        self.edges = numpy.histogram_bin_edges([], bins, range)
+
+    def map(self, block, axis):
+        if len(axis) != block.ndim:
+            raise ValueError("Histograms can only be found over all axes")
+        return numpy.histogram(block, self.edges)[0]
+
+    def combine(self, a, b):
+        return a + b
+
+    def finalize(self, partial):
+        return partial, self.edges
+
+
+_OPS = {
+    'sum': Sum,
+    'min': Min,
+    'max': Max,
+    'mean': Mean,
+    'var': Var,
+    'std': Std,
+}
+
+
+def get_reducer(op):
+    """ Get a Reducer from a name like 'sum', or a Reducer instance """
+    if isinstance(op, Reducer):
+        return op
+    try:
+        return _OPS[op]()
+    except (KeyError, TypeError):
+        raise ValueError(
+            f"op must be one of {', '.join(map(repr, _OPS))} or a Reducer (got {op!r})"
+        ) from None
@@ -11,12 +11,14 @@
     High-level access to HDF5 dataspace selections
 """
 
+import math
+
 import numpy as np
 
 from .base import product
 from .. import h5s, h5r, _selector
 
-def select(shape, args, dataset=None):
+def select(shape, args, dataset=None, orthogonal=False, unsorted=False):
     """ High-level routine to generate a selection from arbitrary arguments
     to __getitem__.  The arguments should be the following:
 
@@ -30,13 +32,25 @@ def select(shape, args, dataset=None):
     dataset
         A h5py.Dataset instance representing the source dataset.
 
+    orthogonal
+        If True, lists or arrays of indices may be given for several axes,
+        and select the outer product of the indices (as for Dataset.oindex).
+
+    unsorted
+        If True, lists or arrays of indices may be in any order, and contain
+        duplicates. The FancySelection returned selects the sorted, unique
+        indices; its reorder attribute describes how to rearrange the data
+        read into the order requested. Only useful for reading.
+
     Argument classes:
 
     Single Selection instance
         Returns the argument.
 
     numpy.ndarray
-        Must be a boolean mask.  Returns a PointSelection instance.
+        Must be a boolean mask.  Returns a PointSelection instance, or a
+        Selection of hyperslabs if the True elements form runs (see
+        select_mask).
 
     RegionReference
         Returns a Selection instance.
@@ -61,7 +75,7 @@ def select(shape, args, dataset=None):
 
         elif isinstance(arg, np.ndarray) and arg.dtype.kind == 'b':
             if arg.shape == shape:
-                return PointSelection.from_mask(arg)
+                return select_mask(arg)
             # Allow 1D boolean array on the 1st dim
             elif arg.shape != shape[:1]:
                 raise TypeError("Boolean indexing array has incompatible shape")
@@ -80,9 +94,234 @@ def select(shape, args, dataset=None):
         selector = dataset._selector
     else:
         space = h5s.create_simple(shape)
-        selector = _selector.Selector(space)
+        # Without a dataset, the selection may be used to map a virtual
+        # dataset, which can't use point selections.
+        selector = _selector.Selector(space, allow_points=False)
+
+    return selector.make_selection(args, orthogonal=orthogonal, unsorted=unsorted)
+
+
+# select_mask uses a point selection if the hyperslabs would have no more
+# than this many coordinates (points * rank) each on average.
+MASK_POINTS_PER_BLOCK = 4
+
+# Masks are scanned for runs in pieces of about this many elements, to
+# limit the memory used.
+MASK_BATCH_SIZE = 2**24
+
+
+def _mask_runs(mask):
+    """ Find runs of True along the last axis of a 2D boolean array.
+
+    Returns arrays (rows, starts, lengths), in C order.
+    """
+    nrows, ncols = mask.shape
+    batch = max(1, MASK_BATCH_SIZE // max(ncols, 1))
+    rows, starts, lengths = [], [], []
+    for r0 in range(0, nrows, batch):
+        padded = np.zeros((min(batch, nrows - r0), ncols + 2), dtype=np.int8)
+        padded[:, 1:-1] = mask[r0:r0 + batch]
+        # +1 where a run starts, -1 after it ends; flat indices are quicker
+        edges = np.diff(padded, axis=1).ravel()
+        run_rows, run_starts = np.divmod(np.flatnonzero(edges == 1), ncols + 1)
+        run_ends = np.flatnonzero(edges == -1) % (ncols + 1)
+        rows.append(run_rows + r0)
+        starts.append(run_starts)
+        lengths.append(run_ends - run_starts)
+    return np.concatenate(rows), np.concatenate(starts), np.concatenate(lengths)
+
+
+def _min_blocks(mask):
+    """ A lower bound on the number of blocks select_mask() would combine
+    runs into: the runs along the last axis which don't start in the same
+    column as a run in the row above.
+
+    Like _mask_runs(), this works through the mask in batches of rows.
+    """
+    plane = mask.shape[-2] if mask.ndim > 1 else 1
+    mask = mask.reshape(-1, mask.shape[-1])
+    nrows, ncols = mask.shape
+    batch = max(1, MASK_BATCH_SIZE // max(ncols, 1))
+    count = 0
+    prev = np.zeros(ncols, dtype=bool)  # Run starts in the row above
+    for r0 in range(0, nrows, batch):
+        rows = mask[r0:r0 + batch]
+        starts = rows.copy()
+        starts[:, 1:] &= ~rows[:, :-1]
+        count += np.count_nonzero(starts)
+        if plane > 1:
+            above = np.empty_like(starts)
+            above[0] = prev
+            above[1:] = starts[:-1]
+            # Runs aren't merged across 2D planes
+            above[-r0 % plane::plane] = False
+            count -= np.count_nonzero(above & starts)
+            prev = starts[-1].copy()
+    return count
+
+
+def select_mask(mask):
+    """ Select the True elements of a boolean array with the dataspace shape.
+
+    Runs of True along the last axis are selected as hyperslab blocks, and
+    identical runs in consecutive rows are merged into 2D blocks.  If the
+    True elements are scattered, a PointSelection is returned instead.
+    Either way, the elements are read in C order, like ``arr[mask]``.
+    """
+    npoints = np.count_nonzero(mask)
+    if mask.ndim == 0 or npoints == 0:
+        return PointSelection.from_mask(mask)
+
+    rank = mask.ndim
+    if npoints * rank <= MASK_POINTS_PER_BLOCK * _min_blocks(mask):
+        # Too scattered for hyperslabs, whichever runs can be merged
+        return PointSelection.from_mask(mask)
+
+    rows, starts, lengths = _mask_runs(mask.reshape(-1, mask.shape[-1]))
+    if rank > 1:
+        # Combine runs with the same start & length in consecutive rows,
+        # without crossing into the next 2D plane.
+        order = np.lexsort((rows, lengths, starts))
+        rows, starts, lengths = rows[order], starts[order], lengths[order]
+        new_block = np.ones(len(rows), dtype=bool)
+        new_block[1:] = (
+            (starts[1:] != starts[:-1]) | (lengths[1:] != lengths[:-1])
+            | (rows[1:] != rows[:-1] + 1) | (rows[1:] % mask.shape[-2] == 0)
+        )
+        block_ix = np.flatnonzero(new_block)
+        nrows = np.diff(np.append(block_ix, len(rows)))
+        rows, starts, lengths = rows[block_ix], starts[block_ix], lengths[block_ix]
+        # Increasing order makes combining the hyperslabs much faster
+        order = np.lexsort((starts, rows))
+        rows, starts, lengths, nrows = (
+            rows[order], starts[order], lengths[order], nrows[order]
+        )
+
+    if npoints * rank <= MASK_POINTS_PER_BLOCK * len(rows):
+        return PointSelection.from_mask(mask)
+
+    slabs = np.ones((len(rows), 4, rank), dtype=np.uint64)
+    slabs[:, 0, -1] = starts
+    if rank > 1:
+        slabs[:, 0, :-1] = np.transpose(np.unravel_index(rows, mask.shape[:-1]))
+        slabs[:, 3, -2] = nrows
+    slabs[:, 3, -1] = lengths
+
+    selection = Selection(mask.shape)
+    _selector.select_hyperslabs(selection.id, slabs)
+    return selection
+
+
+def _smallest_divisor(n, minimum):
+    """ Smallest divisor of n which is at least minimum, or None """
+    best = None
+    d = 1
+    while d * d <= n:
+        if n % d == 0:
+            for x in (d, n // d):
+                if x >= minimum and (best is None or x < best):
+                    best = x
+        d += 1
+    return best
+
+
+def strided_memory(arr, hyperslab=None):
+    """ Describe a non-contiguous array as a hyperslab in a C-contiguous
+    array, so HDF5 can read or write its elements without a copy.
+
+    Returns (base, mspace): base is a C-contiguous view starting at the
+    first element of arr, and mspace a dataspace selecting the elements of
+    arr within it.  If hyperslab is given as (start, count, step) in the
+    coordinates of arr, only those elements are selected.
+
+    base may extend past the end of the memory arr is a view of, but only
+    the selected elements are ever accessed.  Returns None if arr can't be
+    described this way: if it has object or zero-size items, if its strides
+    are not positive multiples of the item size, or if its axes are not in
+    C order (e.g. a transposed array).
+    """
+    layout = _strided_layout(arr)
+    if layout is None:
+        return None
+    base, steps = layout
+    if hyperslab is None:
+        hyperslab = ((0,) * arr.ndim, arr.shape, (1,) * arr.ndim)
+    return base, _strided_mspace(base, steps, hyperslab)
 
-    return selector.make_selection(args)
+
+def strided_memory_pieces(arr, hyperslabs):
+    """ Like strided_memory(), for several hyperslabs in arr.
+
+    Returns (base, mspaces), where mspaces is an iterator over a dataspace
+    for each hyperslab, or None.
+    """
+    layout = _strided_layout(arr)
+    if layout is None:
+        return None
+    base, steps = layout
+    return base, (_strided_mspace(base, steps, h) for h in hyperslabs)
+
+
+def _strided_layout(arr):
+    """ Get (base, steps) for strided_memory(): the C-contiguous view, and
+    the step in it along each axis between elements of arr.
+    """
+    itemsize = arr.dtype.itemsize
+    if arr.ndim == 0 or arr.size == 0 or itemsize == 0 or arr.dtype.hasobject:
+        return None
+    if any(s <= 0 or s % itemsize for n, s in zip(arr.shape, arr.strides) if n > 1):
+        return None
+
+    # Work outwards from the last axis.  Each axis is given the smallest
+    # extent in the base array which holds the elements selected along it,
+    # and divides the strides of all the axes further out (in units of the
+    # current row size).  Axes of length 1 have arbitrary strides, and are
+    # given extent 1.
+    ndim = arr.ndim
+    axes = [i for i in range(ndim) if arr.shape[i] > 1]
+    strides = {i: arr.strides[i] // itemsize for i in axes}
+    dims = [1] * ndim
+    steps = [1] * ndim
+    row = 1  # Elements in one step along the current axis of the base array
+    for k in reversed(range(len(axes))):
+        i = axes[k]
+        outer = [strides[j] for j in axes[:k]]
+        if strides[i] % row or any(x % row for x in outer):
+            return None
+        steps[i] = strides[i] // row
+        span = (arr.shape[i] - 1) * steps[i] + 1
+        if outer:
+            dims[i] = _smallest_divisor(math.gcd(*outer) // row, span)
+            if dims[i] is None:
+                return None
+        else:
+            dims[i] = span
+        row *= dims[i]
+
+    base_strides = [itemsize] * ndim
+    for i in reversed(range(ndim - 1)):
+        base_strides[i] = base_strides[i + 1] * dims[i + 1]
+    base = np.lib.stride_tricks.as_strided(
+        arr, shape=dims, strides=base_strides, writeable=arr.flags.writeable
+    )
+    return base, steps
+
+
+def _strided_mspace(base, steps, hyperslab):
+    """ Select a (start, count, step) hyperslab of the strided array in its
+    base array (see _strided_layout).
+    """
+    start, count, step = hyperslab
+    mspace = h5s.create_simple(base.shape)
+    if product(count) == 0:
+        mspace.select_none()
+    else:
+        mspace.select_hyperslab(
+            tuple(a * s for a, s in zip(start, steps, strict=True)),
+            tuple(count),
+            tuple(b * s for b, s in zip(step, steps, strict=True)),
+        )
+    return mspace
 
 
 class Selection:
@@ -308,6 +547,20 @@ class SimpleSelection(Selection):
                 sid.offset_simple(offset)
                 yield sid
 
+    def broadcast_hyperslabs(self, source_shape):
+        """ Like broadcast(), but yield the hyperslab for each piece as
+        (start, count, step), in the same order.
+        """
+        start, count, step, _ = self._sel
+        tshape = self.expand_shape(source_shape)
+        if any(d == 0 for d in count):
+            return
+
+        chunks = tuple(x//y for x, y in zip(count, tshape, strict=True))
+        for idx in range(product(chunks)):
+            offset = tuple(x*y*z + s for x, y, z, s in zip(np.unravel_index(idx, chunks), tshape, step, start, strict=True))
+            yield offset, tshape, step
+
 
 class FancySelection(Selection):
 
@@ -319,6 +572,10 @@ class FancySelection(Selection):
         per-axis (1D) boolean arrays.
 
         Broadcasting is not supported for these selections.
+
+        If made with unsorted indices, array_shape is the shape of the data
+        selected (sorted & unique), and reorder is a list of (axis, indices)
+        to rearrange it with _selector.reorder_array().
     """
 
     @property
@@ -329,7 +586,7 @@ class FancySelection(Selection):
     def array_shape(self):
         return self._array_shape
 
-    def __init__(self, shape, spaceid=None, mshape=None, array_shape=None):
+    def __init__(self, shape, spaceid=None, mshape=None, array_shape=None, reorder=()):
         super().__init__(shape, spaceid)
         if mshape is None:
             mshape = self.shape
@@ -337,6 +594,7 @@ class FancySelection(Selection):
             array_shape = mshape
         self._mshape = mshape
         self._array_shape = array_shape
+        self.reorder = list(reorder)
 
     def expand_shape(self, source_shape):
         if not source_shape == self.array_shape:
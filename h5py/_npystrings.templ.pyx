@@ -5,8 +5,12 @@ to work with NumPy 1.x installed, this module must be imported conditionally
 and can't be cimport'ed.
 """
 from .defs cimport *
-from .utils cimport emalloc
-from numpy cimport PyArray_Descr
+from .utils cimport (emalloc, string_codec, decode_chars, fixed_length,
+                     CODEC_OTHER, CODEC_UTF8)
+from numpy cimport PyArray_Descr, ndarray, PyArray_DATA
+from cpython.bytes cimport PyBytes_Check, PyBytes_AS_STRING, PyBytes_GET_SIZE
+from cpython.ref cimport PyObject
+from cpython.unicode cimport PyUnicode_AsUTF8AndSize
 import numpy as np
 
 assert {{NUMPY_BUILD_VERSION_TUPLE >= (2, 0, 0)}}  # See pyproject.toml
@@ -261,3 +265,153 @@ cdef char * _npystrings_unpack(hid_t space, void *contig, void *noncontig,
         NpyString_release_allocator(info.allocator)
         H5Tclose(tid)
         # after H5Dwrite, user must free(zero_terminated_buf)
+
+
+# =========================================================================
+# Decoding bytes straight into NumPy StringDType arrays
+
+cdef bint is_utf8(const char *buf, Py_ssize_t size, bint ascii_only):
+    # Check that buf holds valid UTF-8 (or only ASCII), which can be packed
+    # into a NpyString as it is.  Overlong forms, surrogates and code points
+    # above U+10FFFF are invalid, as for Python's UTF-8 codec.
+    cdef const unsigned char *p = <const unsigned char *>buf
+    cdef Py_ssize_t i = 0, j, n
+    cdef unsigned char c
+    while i < size:
+        c = p[i]
+        if c < 0x80:
+            i += 1
+            continue
+        if ascii_only:
+            return False
+        if 0xC2 <= c <= 0xDF:
+            n = 1
+        elif 0xE0 <= c <= 0xEF:
+            n = 2
+        elif 0xF0 <= c <= 0xF4:
+            n = 3
+        else:
+            return False
+        if i + n >= size:
+            return False
+        for j in range(1, n + 1):
+            if p[i + j] & 0xC0 != 0x80:
+                return False
+        if (c == 0xE0 and p[i + 1] < 0xA0) or (c == 0xED and p[i + 1] > 0x9F):
+            return False
+        if (c == 0xF0 and p[i + 1] < 0x90) or (c == 0xF4 and p[i + 1] > 0x8F):
+            return False
+        i += n + 1
+    return True
+
+
+def decode_npystrings(ndarray arr not None, encoding, errors='strict',
+                      bint pointers=False):
+    """Decode an array of bytes to a NpyString array with the same shape,
+    like calling bytes.decode(encoding, errors) on each element.
+
+    Parameters
+    ----------
+    arr : ndarray
+        Object array of bytes, as read from variable-width strings, or a
+        fixed-width bytes ('S') array
+    encoding : str
+        Encoding of the bytes
+    errors : str
+        Error handling scheme, as for bytes.decode()
+    pointers : bool
+        If True, arr is a uintp array of char* pointers to zero-terminated
+        strings, as read from variable-width strings, which are freed as
+        they are decoded (see utils.decode_strings)
+
+    Notes
+    -----
+    NpyStrings are stored as UTF-8, so valid UTF-8 (for the utf-8 codec)
+    or plain ASCII (for ascii and latin-1) is packed as it is; other
+    strings are decoded, and packed without keeping the intermediate str.
+    """
+    cdef ndarray out
+    cdef char *out_data
+    cdef PyObject **in_objs = NULL
+    cdef const char *in_chars = NULL
+    cdef char **in_ptrs = NULL
+    cdef const char *buf = NULL
+    cdef Py_ssize_t i = 0, n, size = 0, itemsize = 0
+    cdef int codec
+    cdef int res
+    cdef npy_string_allocator *allocator = NULL
+    cdef npy_packed_static_string *packed
+
+    if pointers:
+        if arr.dtype != np.uintp:
+            raise TypeError("Pointers must be passed as a uintp array")
+    elif arr.dtype.kind == 'S':
+        itemsize = arr.dtype.itemsize
+    elif arr.dtype.kind != 'O':
+        raise TypeError(f"Can't decode array of type {arr.dtype}")
+
+    arr = np.require(arr, requirements='C')
+    n = arr.size
+    if pointers:
+        in_ptrs = <char **>PyArray_DATA(arr)
+    elif itemsize:
+        in_chars = <const char *>PyArray_DATA(arr)
+    else:
+        in_objs = <PyObject **>PyArray_DATA(arr)
+
+    try:
+        codec = string_codec(encoding)
+        b_encoding = encoding.encode('ascii')
+        b_errors = errors.encode('ascii')
+        out = np.empty((<object>arr).shape, dtype=np.dtypes.StringDType())
+        out_data = <char *>PyArray_DATA(out)
+
+        descr = out.dtype
+        allocator = NpyString_acquire_allocator(<PyArray_StringDTypeObject *><PyObject *>descr)
+        if allocator is NULL:
+            raise RuntimeError("Failed to acquire string allocator")
+
+        while i < n:
+            s = None
+            packed = <npy_packed_static_string *>(out_data + i * SIZEOF_NPY_PACKED_STATIC_STRING)
+            if pointers:
+                buf = in_ptrs[i]
+                if buf is NULL:
+                    # As for npystrings_pack_cb
+                    res = NpyString_pack_null(allocator, packed)
+                    if res < 0:
+                        raise MemoryError("Failed to pack string")
+                    i += 1
+                    continue
+                size = strlen(buf)
+            elif itemsize:
+                buf = in_chars + i * itemsize
+                size = fixed_length(buf, itemsize)
+            else:
+                b = <object>in_objs[i]
+                if PyBytes_Check(b):
+                    buf = PyBytes_AS_STRING(b)
+                    size = PyBytes_GET_SIZE(b)
+                else:
+                    s = b.decode(encoding, errors)
+            if s is None and (codec == CODEC_OTHER or not is_utf8(buf, size, codec != CODEC_UTF8)):
+                s = decode_chars(buf, size, codec, b_encoding, b_errors)
+            if s is not None:
+                buf = PyUnicode_AsUTF8AndSize(s, &size)
+            res = NpyString_pack(allocator, packed, buf, size)
+            if pointers:
+                free(in_ptrs[i])
+                in_ptrs[i] = NULL
+            if res < 0:
+                raise MemoryError("Failed to pack string")
+            i += 1
+    finally:
+        if allocator is not NULL:
+            NpyString_release_allocator(allocator)
+        if pointers:
+            while i < n:
+                free(in_ptrs[i])
+                in_ptrs[i] = NULL
+                i += 1
+
+    return out
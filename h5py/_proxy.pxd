@@ -19,4 +19,7 @@ cdef herr_t dset_rw_vlen_strings(hid_t dset, hid_t mspace, hid_t fspace,
                     hid_t dxpl, void* progbuf, PyArray_Descr* descr,
                     int read) except -1
 
+cdef herr_t dset_read_vlen_pointers(hid_t dset, hid_t mspace, hid_t fspace,
+                    hid_t dxpl, void* progbuf) except -1
+
 cdef htri_t needs_bkg_buffer(hid_t src, hid_t dst) except -1
@@ -233,6 +233,58 @@ cdef herr_t dset_rw_vlen_strings(
     return 0
 
 
+cdef herr_t dset_read_vlen_pointers(
+    hid_t dset, hid_t mspace, hid_t fspace, hid_t dxpl, void* progbuf) except -1:
+    """Variant of dset_rw which reads variable-length strings as the char*
+    HDF5 allocates for them, laid out in progbuf according to mspace.
+    The caller owns the strings and must free them.
+    """
+
+    cdef hid_t dstype = -1      # Dataset datatype
+    cdef hid_t h5_vlen_string = -1
+    cdef hid_t dspace = -1      # Dataset dataspace
+    cdef hid_t cspace = -1      # Temporary contiguous dataspaces
+
+    cdef void* conv_buf = NULL
+    cdef hsize_t npoints
+
+    try:
+        dstype = H5Dget_type(dset)
+        # Same character set as the dataset, so there's nothing to convert
+        # beyond reading the strings into memory.
+        h5_vlen_string = H5Tcopy(H5T_C_S1)
+        H5Tset_size(h5_vlen_string, H5T_VARIABLE)
+        H5Tset_cset(h5_vlen_string, H5Tget_cset(dstype))
+
+        if mspace == H5S_ALL and fspace != H5S_ALL:
+            mspace = fspace
+        elif mspace != H5S_ALL and fspace == H5S_ALL:
+            fspace = mspace
+        elif mspace == H5S_ALL and fspace == H5S_ALL:
+            fspace = mspace = dspace = H5Dget_space(dset)
+
+        npoints = H5Sget_select_npoints(mspace)
+        if npoints == 0:
+            return 0
+        cspace = H5Screate_simple(1, &npoints, NULL)
+
+        conv_buf = create_buffer(H5Tget_size(dstype), H5Tget_size(h5_vlen_string), npoints)
+        H5Dread(dset, h5_vlen_string, cspace, fspace, dxpl, conv_buf)
+        h5py_copy(h5_vlen_string, mspace, conv_buf, progbuf, H5PY_SCATTER)
+    finally:
+        free(conv_buf)
+        if h5_vlen_string > 0:
+            H5Tclose(h5_vlen_string)
+        if dstype > 0:
+            H5Tclose(dstype)
+        if dspace > 0:
+            H5Sclose(dspace)
+        if cspace > 0:
+            H5Sclose(cspace)
+
+    return 0
+
+
 cdef hid_t make_reduced_type(hid_t mtype, hid_t dstype):
     # Go through dstype, pick out the fields which also appear in mtype, and
     # return a new compound type with the fields packed together
@@ -13,14 +13,17 @@ from numpy cimport (
     PyArray_IsNativeByteOrder,
 )
 from cpython cimport PyNumber_Index
+from libc.stdint cimport int64_t
 
 import numpy as np
 from .defs cimport *
 from .h5d cimport DatasetID
+from .h5p cimport PropID
 from .h5s cimport SpaceID
 from .h5t cimport TypeID, typewrap, py_create
 from .utils cimport emalloc, efree, convert_dims
 from ._objects import phil, with_phil
+from . import h5p
 
 import_array()
 
@@ -37,11 +40,74 @@ cdef object convert_bools(bint* data, hsize_t rank):
     return tuple(bools_l)
 
 
+# select_fancy uses a point selection if the hyperslabs would have no more
+# than this many coordinates (points * rank) each on average.
+cdef hsize_t FANCY_POINTS_PER_BLOCK = 4
+
+
+cdef build_hyperslab_union(hid_t space, int rank, hsize_t* dims,
+                           hsize_t* slabs, Py_ssize_t n):
+    """Recursive merge algorithm to quickly OR many hyperslabs into space
+
+    slabs holds start, stride, count & block arrays for each of n
+    hyperslabs, preferably in increasing order.
+    """
+    cdef hid_t space2
+    cdef Py_ssize_t i, half
+    cdef hsize_t* p
+
+    # With fewer than 16 hyperslabs, adding them one at a time is faster
+    if n < 16:
+        for i in range(n):
+            p = slabs + i * 4 * rank
+            H5Sselect_hyperslab(space, H5S_SELECT_OR, p, p + rank,
+                                p + 2 * rank, p + 3 * rank)
+    else:
+        half = n // 2
+        build_hyperslab_union(space, rank, dims, slabs, half)
+        space2 = H5Screate_simple(rank, dims, NULL)
+        try:
+            H5Sselect_none(space2)
+            build_hyperslab_union(space2, rank, dims, slabs + half * 4 * rank, n - half)
+            H5Smodify_select(space, H5S_SELECT_OR, space2)
+        finally:
+            H5Sclose(space2)
+
+
+@with_phil
+def select_hyperslabs(SpaceID space not None, slabs):
+    """Select the union of many regular hyperslabs, replacing any selection
+
+    slabs is an array of shape (n, 4, rank), holding start, stride, count &
+    block for each hyperslab. This is much faster with the hyperslabs sorted
+    in increasing order.
+    """
+    cdef ndarray slabs_arr
+    cdef int rank
+    cdef hsize_t* dims
+
+    rank = H5Sget_simple_extent_ndims(space.id)
+    slabs_arr = np.ascontiguousarray(slabs, dtype=np.uint64)
+    if slabs_arr.ndim != 3 or slabs_arr.shape[1] != 4 or slabs_arr.shape[2] != rank:
+        raise ValueError(f"slabs must have shape (n, 4, {rank})")
+
+    dims = <hsize_t*>emalloc(sizeof(hsize_t) * rank)
+    try:
+        H5Sget_simple_extent_dims(space.id, dims, NULL)
+        H5Sselect_none(space.id)
+        build_hyperslab_union(space.id, rank, dims,
+                              <hsize_t*>PyArray_DATA(slabs_arr), slabs_arr.shape[0])
+    finally:
+        efree(dims)
+
+
 cdef class Selector:
     cdef SpaceID spaceobj
     cdef hid_t space
     cdef int rank
     cdef bint is_fancy
+    cdef bint allow_points
+    cdef list reorder
     cdef hsize_t* dims
     cdef hsize_t* start
     cdef hsize_t* stride
@@ -49,10 +115,13 @@ cdef class Selector:
     cdef hsize_t* block
     cdef bint* scalar
 
-    def __cinit__(self, SpaceID space):
+    def __cinit__(self, SpaceID space, *, bint allow_points=True):
         self.spaceobj = space
         self.space = space.id
         self.is_fancy = False
+        self.reorder = []
+        # Some uses, e.g. virtual dataset mappings, only support hyperslabs
+        self.allow_points = allow_points
 
         with phil:
             self.rank = H5Sget_simple_extent_ndims(self.space)
@@ -73,14 +142,28 @@ cdef class Selector:
         efree(self.block)
         efree(self.scalar)
 
-    cdef bint apply_args(self, tuple args) except 0:
-        """Apply indexing arguments to this Selector object"""
+    cdef bint apply_args(self, tuple args, bint orthogonal=False, bint unsorted=False) except 0:
+        """Apply indexing arguments to this Selector object
+
+        If orthogonal is True, lists/arrays of indices may be used for several
+        dimensions, and select the outer product of the indices.
+
+        If unsorted is True, lists/arrays of indices may be in any order and
+        contain duplicates. The sorted, unique indices are selected, and
+        self.reorder gets (axis, indices) pairs to rearrange the data read
+        (see reorder_array()).
+        """
         cdef:
-            int nargs, ellipsis_ix, array_ix = -1
+            int nargs, ellipsis_ix
             bint seen_ellipsis = False
             int dim_ix = -1
             hsize_t l
-            ndarray array_arg
+            ndarray idx_arr
+            int64_t* idx
+            int64_t v
+            Py_ssize_t i
+            bint copied, increasing, in_bounds
+            list array_dims = [], array_args = [], reorder_dims = [], reorder_ixs = []
 
         # If no explicit ellipsis, implicit ellipsis is after args
         nargs = ellipsis_ix = len(args)
@@ -186,7 +269,7 @@ cdef class Selector:
                     a = a.astype(np.intp)
 
             if a.dtype.kind == 'b':
-                if self.rank == 1:
+                if self.rank == 1 and not orthogonal:
                     # The dataset machinery should fall back to a faster
                     # alternative (using PointSelection) in this case.
                     # https://github.com/h5py/h5py/issues/2189
@@ -196,27 +279,48 @@ cdef class Selector:
                 a = a.nonzero()[0]
             if not np.issubdtype(a.dtype, np.integer):
                 raise TypeError("Indexing arrays must have integer dtypes")
-            if array_ix != -1:
+            if array_dims and not orthogonal:
                 raise TypeError("Only one indexing vector or array is currently allowed for fancy indexing")
 
-            # Convert negative indices to positive
-            if np.any(a < 0):
-                a = a.copy()
-                a[a < 0] += l
-
-            # Bounds check
-            if np.any((a < 0) | (a > l)):
+            # Convert negative indices to positive, check the bounds, and
+            # whether the indices increase, in one pass.
+            in_bounds = not (a.dtype.kind == 'u' and a.size and a.max() >= l)
+            increasing = True
+            idx_arr = np.ascontiguousarray(a, dtype=np.int64)
+            idx = <int64_t*>PyArray_DATA(idx_arr)
+            copied = idx_arr is not a
+            for i in range(idx_arr.shape[0]):
+                v = idx[i]
+                if v < 0:
+                    if not copied:
+                        idx_arr = idx_arr.copy()
+                        idx = <int64_t*>PyArray_DATA(idx_arr)
+                        copied = True
+                    v += <int64_t>l
+                    idx[i] = v
+                if not 0 <= v < <int64_t>l:
+                    in_bounds = False
+                    break
+                if i and v <= idx[i - 1]:
+                    increasing = False
+
+            if not in_bounds:
                 if l == 0:
                     msg = "Fancy indexing out of range for empty dimension"
                 else:
                     msg = f"Fancy indexing out of range for (0-{l-1})"
                 raise IndexError(msg)
 
-            if np.any(np.diff(a) <= 0):
-                raise TypeError("Indexing elements must be in increasing order")
+            a = idx_arr
+            if not increasing:
+                if not unsorted:
+                    raise TypeError("Indexing elements must be in increasing order")
+                a, inverse = np.unique(a, return_inverse=True)
+                reorder_dims.append(dim_ix)
+                reorder_ixs.append(inverse)
 
-            array_ix = dim_ix
-            array_arg = a
+            array_dims.append(dim_ix)
+            array_args.append(a)
             self.start[dim_ix] = 0
             self.stride[dim_ix] = 1
             self.count[dim_ix] = a.shape[0]
@@ -233,60 +337,217 @@ cdef class Selector:
                 self.block[dim_ix] = 1
                 self.scalar[dim_ix] = False
 
+        # Axes of the output array (without scalar dimensions) to rearrange
+        self.reorder = [
+            (sum([not self.scalar[i] for i in range(dim_ix)]), inverse)
+            for dim_ix, inverse in zip(reorder_dims, reorder_ixs)
+        ]
+
         if nargs == 0:
             H5Sselect_all(self.space)
             self.is_fancy = False
-        elif array_ix != -1:
-            self.select_fancy(array_ix, array_arg)
+        elif array_dims:
+            self.select_fancy(array_dims, array_args)
             self.is_fancy = True
         else:
             H5Sselect_hyperslab(self.space, H5S_SELECT_SET, self.start, self.stride, self.count, self.block)
             self.is_fancy = False
         return True
 
-    cdef build_fancy_hyperslab(self, space, ndarray array_arg, int array_ix, hsize_t* tmp_start, hsize_t* tmp_count):
-        """Recursive merge algorithm to help select_fancy quickly apply selection to the dataspace"""
-
-        # With fewer than 16 elements, looping through fancy indices is faster
-        if len(array_arg)<16:
-            for i in array_arg:
-                tmp_start[array_ix] = i
-                H5Sselect_hyperslab(space, H5S_SELECT_OR, tmp_start, self.stride, tmp_count, self.block)
-            return space
-        else:
-            self.build_fancy_hyperslab(space, array_arg[:len(array_arg)//2], array_ix, tmp_start, tmp_count)
-            space2 = H5Screate_simple(self.rank, self.dims, NULL)
-            H5Sselect_none(space2)
-            self.build_fancy_hyperslab(space2, array_arg[len(array_arg)//2:], array_ix, tmp_start, tmp_count)
-            H5Smodify_select(space, H5S_SELECT_OR, space2)
-            H5Sclose(space2)
+    cdef ndarray fancy_blocks(self, ndarray array_arg):
+        """Describe increasing indices as a list of regular hyperslabs
 
-    cdef select_fancy(self, int array_ix, ndarray array_arg):
-        """Apply a 'fancy' selection (array of indices) to the dataspace"""
-        cdef hsize_t* tmp_start
-        cdef hsize_t* tmp_count
-        cdef uint64_t i
+        Consecutive indices are combined into blocks, and consecutive blocks
+        of the same length and spacing into one strided hyperslab. Returns
+        an (n, 4) array of hsize_t with start, stride, count & block for each.
+        """
+        cdef ndarray idx_arr, blocks_arr
+        cdef const int64_t* idx
+        cdef hsize_t* run_starts = NULL
+        cdef hsize_t* run_lens = NULL
+        cdef hsize_t* blocks
+        cdef Py_ssize_t i, j, n, nruns = 0, nblocks = 0
+        cdef hsize_t step
+
+        idx_arr = np.ascontiguousarray(array_arg, dtype=np.int64)
+        idx = <const int64_t*>PyArray_DATA(idx_arr)
+        n = idx_arr.shape[0]
+        blocks_arr = np.empty((n, 4), dtype=np.uint64)
+        blocks = <hsize_t*>PyArray_DATA(blocks_arr)
+
+        run_starts = <hsize_t*>emalloc(sizeof(hsize_t) * n)
+        run_lens = <hsize_t*>emalloc(sizeof(hsize_t) * n)
+        try:
+            # Find runs of consecutive indices in one pass
+            for i in range(n):
+                if nruns and idx[i] == idx[i - 1] + 1:
+                    run_lens[nruns - 1] += 1
+                else:
+                    run_starts[nruns] = idx[i]
+                    run_lens[nruns] = 1
+                    nruns += 1
+
+            i = 0
+            while i < nruns:
+                # Extend a hyperslab over following runs of the same length,
+                # as long as they are evenly spaced.
+                j = i + 1
+                step = 1
+                if j < nruns and run_lens[j] == run_lens[i]:
+                    step = run_starts[j] - run_starts[i]
+                    while (j < nruns and run_lens[j] == run_lens[i]
+                           and run_starts[j] - run_starts[j - 1] == step):
+                        j += 1
+                blocks[4 * nblocks] = run_starts[i]
+                blocks[4 * nblocks + 1] = step
+                blocks[4 * nblocks + 2] = j - i
+                blocks[4 * nblocks + 3] = run_lens[i]
+                nblocks += 1
+                i = j
+        finally:
+            efree(run_starts)
+            efree(run_lens)
+
+        return blocks_arr[:nblocks]
+
+    cdef select_fancy_points(self, list array_dims, list array_args):
+        """Select every point of a fancy selection individually"""
+        cdef hsize_t** dim_indices = NULL
+        cdef hsize_t* lens = NULL
+        cdef hsize_t* pos = NULL
+        cdef hsize_t* coords = NULL
+        cdef hsize_t npoints = 1, n, c, b, j
+        cdef const int64_t* idx
+        cdef ndarray idx_arr
+        cdef int i, k
+
+        dim_indices = <hsize_t**>emalloc(sizeof(hsize_t*) * self.rank)
+        lens = <hsize_t*>emalloc(sizeof(hsize_t) * self.rank)
+        pos = <hsize_t*>emalloc(sizeof(hsize_t) * self.rank)
+        try:
+            for i in range(self.rank):
+                dim_indices[i] = NULL
+            # The coordinates selected along each dimension
+            for i in range(self.rank):
+                if i in array_dims:
+                    idx_arr = np.ascontiguousarray(
+                        array_args[array_dims.index(i)], dtype=np.int64
+                    )
+                    idx = <const int64_t*>PyArray_DATA(idx_arr)
+                    n = idx_arr.shape[0]
+                    dim_indices[i] = <hsize_t*>emalloc(sizeof(hsize_t) * n)
+                    for j in range(n):
+                        dim_indices[i][j] = idx[j]
+                else:
+                    n = self.count[i] * self.block[i]
+                    dim_indices[i] = <hsize_t*>emalloc(sizeof(hsize_t) * n)
+                    j = 0
+                    for c in range(self.count[i]):
+                        for b in range(self.block[i]):
+                            dim_indices[i][j] = self.start[i] + self.stride[i] * c + b
+                            j += 1
+                lens[i] = n
+                pos[i] = 0
+                npoints *= n
+
+            # Points are read & written in the order they are listed, so this
+            # must match the C order of the memory array.
+            coords = <hsize_t*>emalloc(sizeof(hsize_t) * npoints * self.rank)
+            for j in range(npoints):
+                for i in range(self.rank):
+                    coords[j * self.rank + i] = dim_indices[i][pos[i]]
+                k = self.rank - 1
+                while k >= 0:
+                    pos[k] += 1
+                    if pos[k] < lens[k]:
+                        break
+                    pos[k] = 0
+                    k -= 1
+
+            H5Sselect_elements(self.space, H5S_SELECT_SET, npoints, coords)
+        finally:
+            for i in range(self.rank):
+                efree(dim_indices[i])
+            efree(dim_indices)
+            efree(lens)
+            efree(pos)
+            efree(coords)
 
-        H5Sselect_none(self.space)
+    cdef select_fancy(self, list array_dims, list array_args):
+        """Apply a 'fancy' selection (arrays of indices) to the dataspace
 
-        tmp_start = <hsize_t*>emalloc(sizeof(hsize_t) * self.rank)
-        tmp_count = <hsize_t*>emalloc(sizeof(hsize_t) * self.rank)
-        try:
-            memcpy(tmp_start, self.start, sizeof(hsize_t) * self.rank)
-            memcpy(tmp_count, self.count, sizeof(hsize_t) * self.rank)
-            tmp_count[array_ix] = 1
+        With more than one array, the outer product of the indices is selected.
+        """
+        cdef ndarray slabs, blocks_arr
+        cdef hsize_t npoints = 1
+        cdef hsize_t* blocks
+        cdef hsize_t* p
+        cdef Py_ssize_t nslabs = 1, j
+        cdef int i, k, dim
 
-            self.build_fancy_hyperslab(self.space, array_arg, array_ix, tmp_start, tmp_count)
-        finally:
-            efree(tmp_start)
-            efree(tmp_count)
+        H5Sselect_none(self.space)
+        for i in range(self.rank):
+            npoints *= self.count[i] * self.block[i]
+        if npoints == 0:
+            return
+
+        dim_blocks = [self.fancy_blocks(a) for a in array_args]
+        for blocks_arr in dim_blocks:
+            nslabs *= blocks_arr.shape[0]
+
+        # If the hyperslabs hold only a few points each, selecting individual
+        # points is much quicker than combining them.
+        if self.allow_points and npoints * self.rank <= FANCY_POINTS_PER_BLOCK * nslabs:
+            self.select_fancy_points(array_dims, array_args)
+            return
+
+        if len(array_dims) == 1:
+            # With one index array, the hyperslabs are the blocks along that
+            # dimension; fill them in directly.
+            dim = array_dims[0]
+            blocks = <hsize_t*>PyArray_DATA(dim_blocks[0])
+            p = <hsize_t*>emalloc(sizeof(hsize_t) * nslabs * 4 * self.rank)
+            try:
+                for j in range(nslabs):
+                    for i in range(self.rank):
+                        p[(4 * j) * self.rank + i] = self.start[i]
+                        p[(4 * j + 1) * self.rank + i] = self.stride[i]
+                        p[(4 * j + 2) * self.rank + i] = self.count[i]
+                        p[(4 * j + 3) * self.rank + i] = self.block[i]
+                    for k in range(4):
+                        p[(4 * j + k) * self.rank + dim] = blocks[4 * j + k]
+                build_hyperslab_union(self.space, self.rank, self.dims, p, nslabs)
+            finally:
+                efree(p)
+            return
+
+        # Start, stride, count & block for each hyperslab. The dimensions
+        # without index arrays are the same for all of them.
+        slabs = np.empty((nslabs, 4, self.rank), dtype=np.uint64)
+        for i in range(self.rank):
+            slabs[:, 0, i] = self.start[i]
+            slabs[:, 1, i] = self.stride[i]
+            slabs[:, 2, i] = self.count[i]
+            slabs[:, 3, i] = self.block[i]
+
+        # Every combination of blocks from the indexed dimensions, in C order
+        grids = np.meshgrid(*[np.arange(len(b)) for b in dim_blocks],
+                            indexing='ij', copy=False)
+        for k in range(len(array_dims)):
+            slabs[:, :, array_dims[k]] = dim_blocks[k][grids[k].ravel()]
+
+        build_hyperslab_union(self.space, self.rank, self.dims,
+                              <hsize_t*>PyArray_DATA(slabs), nslabs)
 
     @with_phil
-    def make_selection(self, tuple args):
+    def make_selection(self, tuple args, *, bint orthogonal=False, bint unsorted=False):
         """Apply indexing/slicing args and create a high-level selection object
 
         Returns an instance of SimpleSelection or FancySelection, with a copy
-        of the selector's dataspace.
+        of the selector's dataspace. If orthogonal is True, index arrays for
+        several dimensions select their outer product. If unsorted is True,
+        index arrays may be in any order; the FancySelection then has a
+        reorder attribute to pass to reorder_array() (see apply_args).
         """
         cdef:
             SpaceID space
@@ -294,7 +555,7 @@ cdef class Selector:
             int arr_rank, i
             npy_intp* arr_shape_p
 
-        self.apply_args(args)
+        self.apply_args(args, orthogonal, unsorted)
         space = SpaceID(H5Scopy(self.space))
 
         shape = convert_dims(self.dims, self.rank)
@@ -308,45 +569,156 @@ cdef class Selector:
             arr_shape = tuple(
                 mshape[i] for i in range(self.rank) if not self.scalar[i]
             )
-            return FancySelection(shape, space, count, arr_shape)
+            return FancySelection(shape, space, mshape, arr_shape, self.reorder)
         else:
             start = convert_dims(self.start, self.rank)
             step = convert_dims(self.stride, self.rank)
             scalar = convert_bools(self.scalar, self.rank)
             return SimpleSelection(shape, space, (start, mshape, step, scalar))
 
+    @with_phil
+    def make_union(self, list selections):
+        """Apply several sets of indexing args, and OR them into one selection
+
+        Each item of selections is a tuple of args as for make_selection,
+        which must describe a regular hyperslab (slices, integers and
+        MultiBlockSlice objects only). Returns (space, info), where space is
+        a new SpaceID with the union selected, and info has a tuple
+        (array_shape, npoints, first, last) for each selection: first and
+        last are the range of indices covered along the first axis.
+        """
+        cdef:
+            SpaceID union_space
+            list info = []
+            tuple args
+            int i, j, n = len(selections)
+            hsize_t npoints, last
+            hsize_t* params = NULL
+            hsize_t* p
+
+        if self.rank == 0:
+            raise TypeError("Can't combine selections on a scalar dataspace")
+
+        # start, stride, count & block for each selection
+        params = <hsize_t*>emalloc(sizeof(hsize_t) * 4 * self.rank * max(n, 1))
+        try:
+            for j in range(n):
+                args = selections[j]
+                self.apply_args(args)
+                if self.is_fancy:
+                    raise TypeError("Fancy indexing can't be combined into one selection")
+
+                p = params + j * 4 * self.rank
+                memcpy(p, self.start, sizeof(hsize_t) * self.rank)
+                memcpy(p + self.rank, self.stride, sizeof(hsize_t) * self.rank)
+                memcpy(p + 2 * self.rank, self.count, sizeof(hsize_t) * self.rank)
+                memcpy(p + 3 * self.rank, self.block, sizeof(hsize_t) * self.rank)
+
+                npoints = 1
+                arr_shape = []
+                for i in range(self.rank):
+                    npoints *= self.count[i] * self.block[i]
+                    if not self.scalar[i]:
+                        arr_shape.append(self.count[i] * self.block[i])
+
+                if npoints == 0:
+                    info.append((tuple(arr_shape), 0, 0, 0))
+                else:
+                    last = (self.start[0] + (self.count[0] - 1) * self.stride[0]
+                            + self.block[0] - 1)
+                    info.append((tuple(arr_shape), npoints, self.start[0], last))
+
+            union_space = SpaceID(H5Scopy(self.space))
+            H5Sselect_none(union_space.id)
+
+            # Combining hyperslabs is much quicker in increasing order
+            for j in sorted(range(n), key=lambda k: info[k][2]):
+                if info[j][1] == 0:
+                    continue
+                p = params + j * 4 * self.rank
+                H5Sselect_hyperslab(union_space.id, H5S_SELECT_OR, p,
+                                    p + self.rank, p + 2 * self.rank,
+                                    p + 3 * self.rank)
+        finally:
+            efree(params)
+
+        return union_space, info
+
+
+# The default size of HDF5's type conversion buffer (see H5Pset_buffer)
+cdef size_t TCONV_BUF_SIZE = 1024 * 1024
+
 
 cdef class Reader:
     cdef hid_t dataset
     cdef Selector selector
     cdef TypeID h5_memory_datatype
+    cdef bint convert
+    cdef size_t max_type_size
+    cdef size_t max_tconv_size
+    cdef PropID dxpl
     cdef int np_typenum
+    cdef bint use_typenum
     cdef bint native_byteorder
+    cdef object np_dtype
+    cdef object arr_dtype
+    cdef tuple item_shape
 
-    def __cinit__(self, DatasetID dsid):
+    def __cinit__(self, DatasetID dsid, dtype=None):
         self.dataset = dsid.id
         self.selector = Selector(dsid.get_space())
 
-        # HDF5 can use e.g. custom float datatypes which don't have an exact
-        # match in numpy. Translating it to a numpy dtype chooses the smallest
-        # dtype which won't lose any data, then we translate that back to a
-        # HDF5 datatype (h5_memory_datatype).
         with phil:
             h5_stored_datatype = typewrap(H5Dget_type(self.dataset))
-        np_dtype = h5_stored_datatype.py_dtype()
+        if dtype is None:
+            # HDF5 can use e.g. custom float datatypes which don't have an
+            # exact match in numpy. Translating it to a numpy dtype chooses the
+            # smallest dtype which won't lose any data, then we translate that
+            # back to a HDF5 datatype (h5_memory_datatype).
+            np_dtype = h5_stored_datatype.py_dtype()
+        else:
+            # Read with a different memory type, e.g. a subset of the fields
+            # of a compound type. HDF5 converts the data.
+            np_dtype = np.dtype(dtype)
+        self.np_dtype = np_dtype
+        self.h5_memory_datatype = py_create(np_dtype)
+
+        # When HDF5 converts data, by default it allocates 1 MiB buffers for
+        # each read, which dominates the time to read a few elements. We pass
+        # a transfer property list to make these only as big as needed.
+        # Without conversion, reads use the default property list.
+        self.convert = not h5_stored_datatype.equal(self.h5_memory_datatype)
+        if self.convert:
+            self.max_type_size = max(
+                h5_stored_datatype.get_size(), self.h5_memory_datatype.get_size()
+            )
+            self.max_tconv_size = max(TCONV_BUF_SIZE, self.max_type_size)
+            self.dxpl = h5p.create(h5p.DATASET_XFER)
+
+        # Plain numeric arrays are created from the typenum, which is quickest.
+        # Anything else (compound, enum, string...) needs the full dtype.
+        self.use_typenum = np_dtype.kind in 'biufc' and np_dtype.metadata is None
         self.np_typenum = np_dtype.num
         self.native_byteorder = PyArray_IsNativeByteOrder(ord(np_dtype.byteorder))
-        self.h5_memory_datatype = py_create(np_dtype)
+
+        # NumPy expands an array dtype (e.g. ('i4', (3,))) into extra dimensions
+        if np_dtype.subdtype is None:
+            self.arr_dtype = np_dtype
+            self.item_shape = ()
+        else:
+            self.arr_dtype, self.item_shape = np_dtype.subdtype
 
     cdef ndarray make_array(self, hsize_t* mshape):
         """Create an array to read the selected data into.
 
         .apply_args() should be called first, to set self.count and self.scalar.
-        Only works for simple numeric dtypes which can be defined with typenum.
         """
         cdef int i, arr_rank = 0
         cdef npy_intp* arr_shape
 
+        if not self.use_typenum:
+            return np.zeros(self.sel_shape(mshape), dtype=self.np_dtype)
+
         arr_shape = <npy_intp*>emalloc(sizeof(npy_intp) * self.selector.rank)
         try:
             # Copy any non-scalar selection dimensions for the array shape
@@ -363,44 +735,117 @@ cdef class Reader:
 
         return arr
 
+    cdef tuple sel_shape(self, hsize_t* mshape):
+        """Get the shape of the selection, dropping scalar dimensions.
+
+        .apply_args() should be called first, to set self.scalar.
+        """
+        cdef int i
+        return tuple([
+            mshape[i] for i in range(self.selector.rank)
+            if not self.selector.scalar[i]
+        ])
+
+    cdef check_out(self, ndarray out, hsize_t* mshape):
+        """Check that a caller-provided array can hold the selected data.
+
+        .apply_args() should be called first, to set self.scalar.
+        Raises TypeError for a different dtype, so the caller can fall back
+        to a path where HDF5 converts the data.
+        """
+        out_shape = (<object>out).shape
+        arr_shape = reorder_shape(self.sel_shape(mshape), self.selector.reorder) + self.item_shape
+        if out_shape != arr_shape:
+            raise ValueError(
+                f"out array has shape {out_shape}, but the selection has shape {arr_shape}"
+            )
+        if out.dtype != self.arr_dtype:
+            raise TypeError("out array dtype does not match the dataset")
+
     @with_phil
-    def read(self, tuple args):
-        """Index the dataset using args and read into a new numpy array
+    def read(self, tuple args, ndarray out=None):
+        """Index the dataset using args and read into a numpy array
+
+        If out is given, it must be a writable, C-contiguous array with the
+        same dtype as the dataset and the shape of the selection; the data is
+        read into it, and it is returned.  Otherwise, a new array is created.
 
-        Only works for simple numeric dtypes.
+        Index arrays may be unsorted or contain duplicates; each index is
+        read once, then the data is rearranged.
+
+        Only works for dtypes with a fixed size (no object fields).
         """
         cdef void* buf
         cdef ndarray arr
         cdef hsize_t* mshape
         cdef hid_t mspace
+        cdef hsize_t npoints = 1
+        cdef hid_t dxpl_id = H5P_DEFAULT
         cdef int i
 
-        self.selector.apply_args(args)
+        self.selector.apply_args(args, False, True)
 
         # The selected length of each dimension is count * block
         mshape = <hsize_t*>emalloc(sizeof(hsize_t) * self.selector.rank)
         try:
             for i in range(self.selector.rank):
                 mshape[i] = self.selector.count[i] * self.selector.block[i]
-            arr = self.make_array(mshape)
+                npoints *= mshape[i]
+            if out is not None:
+                self.check_out(out, mshape)
+            if out is None or self.selector.reorder:
+                arr = self.make_array(mshape)
+            else:
+                arr = out
             buf = PyArray_DATA(arr)
 
             mspace = H5Screate_simple(self.selector.rank, mshape, NULL)
         finally:
             efree(mshape)
 
+        if self.convert:
+            # Bigger selections are converted in 1 MiB pieces, as by default
+            dxpl_id = self.dxpl.id
+            H5Pset_buffer(
+                dxpl_id,
+                min(max(npoints, 1) * self.max_type_size, self.max_tconv_size),
+                NULL, NULL,
+            )
+
         try:
             H5Dread(self.dataset, self.h5_memory_datatype.id, mspace,
-                    self.selector.space, H5P_DEFAULT, buf)
+                    self.selector.space, dxpl_id, buf)
         finally:
             H5Sclose(mspace)
 
-        if arr.ndim == 0:
+        if self.selector.reorder:
+            return reorder_array(arr, self.selector.reorder, out)
+        if arr.ndim == 0 and out is None:
             return arr[()]
         else:
             return arr
 
 
+def reorder_shape(tuple shape, list reorder):
+    """Get the shape of an array after reorder_array()"""
+    shape_l = list(shape)
+    for axis, indices in reorder:
+        shape_l[axis] = len(indices)
+    return tuple(shape_l)
+
+
+def reorder_array(arr, list reorder, out=None):
+    """Rearrange data read with sorted, unique indices into the order requested
+
+    reorder holds (axis, indices) pairs, from a Selector with unsorted=True.
+    If out is given, the result is written into it.
+    """
+    for i, (axis, indices) in enumerate(reorder):
+        arr = np.take(arr, indices, axis=axis,
+                      out=out if i == len(reorder) - 1 else None)
+    return arr
+
+
 class MultiBlockSlice:
     """
         A conceptual extension of the built-in slice object to allow selections
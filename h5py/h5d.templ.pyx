@@ -12,7 +12,9 @@
 
 # Compile-time imports
 cimport cython
-from libc.string cimport strcmp
+from libc.string cimport strcmp, strlen, memcpy, memset
+from libc.stdlib cimport free
+from libc.stdint cimport int64_t
 from ._objects cimport pdefault
 from numpy cimport ndarray, import_array, PyArray_DATA, PyArray_Descr, PyArray_DESCR
 from .utils cimport  check_numpy_read, check_numpy_write, \
@@ -20,10 +22,18 @@ from .utils cimport  check_numpy_read, check_numpy_write, \
 from .h5t cimport TypeID, typewrap, py_create, H5PY_NUMPY_STRING_TAG
 from .h5s cimport SpaceID
 from .h5p cimport PropID, propwrap
-from ._proxy cimport dset_rw, dset_rw_vlen_strings
+from ._proxy cimport dset_rw, dset_rw_vlen_strings, dset_read_vlen_pointers
 
 from collections import namedtuple
+import os
+import numpy as np
 from ._objects import phil, with_phil
+from .h5i import get_file_id
+from .h5t import NUMPY_RUNTIME_VERSION_TUPLE
+from .utils import decode_strings
+if NUMPY_RUNTIME_VERSION_TUPLE >= (2, 0, 0):
+    # This fails to import on NumPy < 2.0
+    from ._npystrings import decode_npystrings
 from cpython cimport PyBUF_ANY_CONTIGUOUS, \
                      PyBuffer_Release, \
                      PyBytes_AsString, \
@@ -66,6 +76,16 @@ StoreInfo = namedtuple('StoreInfo',
 
 # === Dataset chunk iterator ==================================================
 
+# Arrays filled in by DatasetID.get_chunk_index
+cdef struct _ChunkIndexBuffer:
+    int rank
+    hsize_t n
+    hsize_t capacity
+    hsize_t *offset
+    unsigned *filter_mask
+    haddr_t *addr
+    hsize_t *size
+
 ### {{if HDF5_VERSION >= (1, 12, 3) or (HDF5_VERSION >= (1, 10, 10) and HDF5_VERSION < (1, 10, 99))}}
 
 cdef class _ChunkVisitor:
@@ -111,8 +131,37 @@ cdef int _cb_chunk_info(const hsize_t *offset, unsigned filter_mask, haddr_t add
     if visit.retval is not None:
         return 1
     return 0
+
+
+cdef int _cb_chunk_index(const hsize_t *offset, unsigned filter_mask, haddr_t addr, hsize_t size, void *op_data) noexcept nogil:
+    """Callback function for DatasetID.get_chunk_index. (Not to be used directly.)
+
+    Copies the information for each chunk into the arrays in "op_data".
+    """
+    cdef _ChunkIndexBuffer *buf = <_ChunkIndexBuffer*>op_data
+    if addr == HADDR_UNDEF:
+        return 0
+    if buf.n >= buf.capacity:
+        return 1  # More chunks than H5Dget_num_chunks reported
+    memcpy(buf.offset + buf.n * buf.rank, offset, sizeof(hsize_t) * buf.rank)
+    buf.filter_mask[buf.n] = filter_mask
+    buf.addr[buf.n] = addr
+    buf.size[buf.n] = size
+    buf.n += 1
+    return 0
 ### {{endif}}
 
+def _pread(int fd, Py_ssize_t size, Py_ssize_t offset):
+    """Read size bytes from a file descriptor at offset, into a memoryview"""
+    cdef Py_ssize_t pos = 0
+    view = memoryview(bytearray(size))
+    while pos < size:
+        nread = os.preadv(fd, [view[pos:]], offset + pos)
+        if nread == 0:
+            raise OSError(f"Unexpected end of file reading {size} bytes at offset {offset}")
+        pos += nread
+    return view
+
 # === Dataset operations ======================================================
 
 @with_phil
@@ -167,6 +216,24 @@ cdef bint _is_numpy_vlen_string(hid_t obj):
         H5free_memory(ctag)
 
 
+cdef ndarray _check_offsets(offsets, hsize_t npoints, hsize_t nvalues):
+    # Check Arrow-style offsets for npoints sequences in an array of nvalues
+    # values, and get them as a contiguous int64 array.
+    cdef ndarray offsets_arr = np.require(offsets, dtype=np.int64, requirements='C')
+    if offsets_arr.ndim != 1:
+        raise ValueError("Offsets must be a one-dimensional array")
+    if <hsize_t>offsets_arr.shape[0] != npoints + 1:
+        raise ValueError(
+            f"Got offsets for {offsets_arr.shape[0] - 1} sequences, but "
+            f"the selection has {npoints} elements"
+        )
+    if offsets_arr[0] < 0 or offsets_arr[-1] > nvalues or np.any(np.diff(offsets_arr) < 0):
+        raise ValueError(
+            "Offsets must be increasing and within the values array"
+        )
+    return offsets_arr
+
+
 cdef class DatasetID(ObjectID):
 
     """
@@ -260,6 +327,284 @@ cdef class DatasetID(ObjectID):
             dset_rw(self_id, mtype_id, mspace_id, fspace_id, plist_id, data, 1)
 
 
+    def read_strings(self, SpaceID mspace not None, SpaceID fspace not None,
+                     tuple shape not None, encoding, errors='strict', dtype=None,
+                     PropID dxpl=None):
+        """ (SpaceID mspace, SpaceID fspace, TUPLE shape, STRING encoding,
+             STRING errors='strict', DTYPE dtype=None, PropDXID dxpl=None)
+            => NDARRAY
+
+            Read variable-length strings and decode them to str, like
+            bytes.decode(encoding, errors), returning an array of the given
+            shape (which must hold as many elements as mspace selects).
+
+            The result is an object array, or with dtype 'T' (NumPy 2.0 and
+            later), a NumPy StringDType array.  Strings are decoded straight
+            from the buffers HDF5 reads them into, without making a bytes
+            object for each one.
+        """
+        cdef ndarray ptrs
+        cdef hid_t plist_id
+        cdef TypeID dstype
+
+        dtype = np.dtype(object if dtype is None else dtype)
+        if dtype.kind not in 'OT':
+            raise TypeError(f"Strings can only be read as object or StringDType arrays, not {dtype}")
+        # Each element holds a char*, which decoding frees.
+        ptrs = np.zeros(shape, dtype=np.uintp)
+        plist_id = pdefault(dxpl)
+        with phil:
+            dstype = self.get_type()
+            if H5Tis_variable_str(dstype.id) <= 0:
+                raise TypeError("read_strings() needs a variable-length string dataset")
+            dset_read_vlen_pointers(self.id, mspace.id, fspace.id, plist_id, PyArray_DATA(ptrs))
+
+        if dtype.kind == 'T':
+            return decode_npystrings(ptrs, encoding, errors, True)
+        return decode_strings(ptrs, encoding, errors, True)
+
+    @with_phil
+    def read_ragged(self, SpaceID fspace not None, dtype, PropID dxpl=None):
+        """ (SpaceID fspace, DTYPE dtype, PropDXID dxpl=None)
+            => (NDARRAY values, NDARRAY offsets)
+
+            Read the variable-length sequences selected by fspace, in the
+            order HDF5 visits the selection, as one flat array of values
+            converted to dtype and an int64 array of offsets, with one more
+            entry than there are sequences.  Sequence i is
+            values[offsets[i]:offsets[i+1]], as in an Apache Arrow list array.
+        """
+        cdef TypeID mtype
+        cdef hid_t vtype = -1
+        cdef hid_t cspace = -1
+        cdef hid_t plist_id
+        cdef hsize_t npoints, i
+        cdef hvl_t *buf = NULL
+        cdef ndarray values, offsets
+        cdef char *values_data
+        cdef int64_t *offsets_data
+        cdef size_t itemsize
+        cdef int64_t total = 0
+
+        dtype = np.dtype(dtype)
+        if dtype.hasobject:
+            raise TypeError(f"Can't read ragged data as {dtype}")
+        itemsize = dtype.itemsize
+        mtype = py_create(dtype)
+        plist_id = pdefault(dxpl)
+
+        npoints = H5Sget_select_npoints(fspace.id)
+        offsets = np.zeros(npoints + 1, dtype=np.int64)
+        if npoints == 0:
+            return np.empty(0, dtype=dtype), offsets
+
+        try:
+            vtype = H5Tvlen_create(mtype.id)
+            cspace = H5Screate_simple(1, &npoints, NULL)
+            buf = <hvl_t *>emalloc(npoints * sizeof(hvl_t))
+            memset(buf, 0, npoints * sizeof(hvl_t))
+            H5Dread(self.id, vtype, cspace, fspace.id, plist_id, buf)
+
+            offsets_data = <int64_t *>PyArray_DATA(offsets)
+            for i in range(npoints):
+                total += buf[i].len
+                offsets_data[i + 1] = total
+            values = np.empty(total, dtype=dtype)
+            values_data = <char *>PyArray_DATA(values)
+            for i in range(npoints):
+                if buf[i].len:
+                    memcpy(values_data + offsets_data[i] * itemsize, buf[i].p, buf[i].len * itemsize)
+        finally:
+            if buf != NULL:
+                H5Dvlen_reclaim(vtype, cspace, H5P_DEFAULT, buf)
+                efree(buf)
+            if cspace > 0:
+                H5Sclose(cspace)
+            if vtype > 0:
+                H5Tclose(vtype)
+
+        return values, offsets
+
+
+    @with_phil
+    def write_ragged(self, SpaceID fspace not None, ndarray values not None,
+                     offsets not None, PropID dxpl=None):
+        """ (SpaceID fspace, NDARRAY values, NDARRAY offsets,
+             PropDXID dxpl=None)
+
+            Write variable-length sequences to the selection fspace, in the
+            order HDF5 visits it.  Sequence i is values[offsets[i]:offsets[i+1]],
+            as in an Apache Arrow list array, so offsets has one more entry
+            than the selection has elements.  values must be one-dimensional;
+            the sequences are passed to HDF5 in place, without copying.
+        """
+        cdef TypeID mtype
+        cdef hid_t vtype = -1
+        cdef hid_t cspace = -1
+        cdef hid_t plist_id
+        cdef hsize_t npoints, i
+        cdef hvl_t *buf = NULL
+        cdef ndarray offsets_arr
+        cdef char *values_data
+        cdef const int64_t *offsets_data
+        cdef size_t itemsize
+
+        if values.ndim != 1:
+            raise ValueError("Values must be a one-dimensional array")
+        if values.dtype.hasobject:
+            raise TypeError(f"Can't write ragged data from {values.dtype}")
+        values = np.require(values, requirements='C')
+        npoints = H5Sget_select_npoints(fspace.id)
+        offsets_arr = _check_offsets(offsets, npoints, values.shape[0])
+        if npoints == 0:
+            return
+
+        itemsize = values.dtype.itemsize
+        mtype = py_create(values.dtype)
+        plist_id = pdefault(dxpl)
+        values_data = <char *>PyArray_DATA(values)
+        offsets_data = <const int64_t *>PyArray_DATA(offsets_arr)
+
+        try:
+            vtype = H5Tvlen_create(mtype.id)
+            cspace = H5Screate_simple(1, &npoints, NULL)
+            buf = <hvl_t *>emalloc(npoints * sizeof(hvl_t))
+            for i in range(npoints):
+                buf[i].len = offsets_data[i + 1] - offsets_data[i]
+                buf[i].p = values_data + offsets_data[i] * itemsize if buf[i].len else NULL
+            H5Dwrite(self.id, vtype, cspace, fspace.id, plist_id, buf)
+        finally:
+            efree(buf)
+            if cspace > 0:
+                H5Sclose(cspace)
+            if vtype > 0:
+                H5Tclose(vtype)
+
+    @with_phil
+    def read_strings_buffers(self, SpaceID fspace not None, PropID dxpl=None):
+        """ (SpaceID fspace, PropDXID dxpl=None)
+            => (NDARRAY offsets, NDARRAY data)
+
+            Read the variable-length strings selected by fspace, in the order
+            HDF5 visits the selection, as the buffers of an Apache Arrow
+            string array: data is a uint8 array of all the encoded strings one
+            after another, and offsets an int64 array with one more entry than
+            there are strings.  String i is data[offsets[i]:offsets[i+1]].
+        """
+        cdef TypeID dstype
+        cdef hid_t mspace = -1
+        cdef hid_t plist_id
+        cdef hsize_t npoints, i
+        cdef ndarray ptrs, offsets, data
+        cdef char **ptrs_data = NULL
+        cdef int64_t *offsets_data
+        cdef char *data_data
+        cdef int64_t total = 0
+
+        dstype = self.get_type()
+        if H5Tis_variable_str(dstype.id) <= 0:
+            raise TypeError("read_strings_buffers() needs a variable-length string dataset")
+        plist_id = pdefault(dxpl)
+
+        npoints = H5Sget_select_npoints(fspace.id)
+        offsets = np.zeros(npoints + 1, dtype=np.int64)
+        if npoints == 0:
+            return offsets, np.empty(0, dtype=np.uint8)
+
+        # Each element holds a char*, freed below.
+        ptrs = np.zeros(npoints, dtype=np.uintp)
+        ptrs_data = <char **>PyArray_DATA(ptrs)
+        try:
+            mspace = H5Screate_simple(1, &npoints, NULL)
+            dset_read_vlen_pointers(self.id, mspace, fspace.id, plist_id, ptrs_data)
+
+            offsets_data = <int64_t *>PyArray_DATA(offsets)
+            for i in range(npoints):
+                if ptrs_data[i] != NULL:
+                    total += strlen(ptrs_data[i])
+                offsets_data[i + 1] = total
+            data = np.empty(total, dtype=np.uint8)
+            data_data = <char *>PyArray_DATA(data)
+            for i in range(npoints):
+                if ptrs_data[i] != NULL:
+                    memcpy(data_data + offsets_data[i], ptrs_data[i],
+                           offsets_data[i + 1] - offsets_data[i])
+        finally:
+            for i in range(npoints):
+                free(ptrs_data[i])
+            if mspace > 0:
+                H5Sclose(mspace)
+
+        return offsets, data
+
+
+    @with_phil
+    def write_strings_buffers(self, SpaceID fspace not None, offsets not None,
+                              ndarray data not None, PropID dxpl=None):
+        """ (SpaceID fspace, NDARRAY offsets, NDARRAY data, PropDXID dxpl=None)
+
+            Write variable-length strings to the selection fspace, in the
+            order HDF5 visits it, from the buffers of an Apache Arrow string
+            array: string i is data[offsets[i]:offsets[i+1]], where data is a
+            one-dimensional uint8 array of encoded strings.  The bytes are
+            stored as they are; they can't include NUL characters.
+        """
+        cdef TypeID dstype
+        cdef hid_t strtype = -1
+        cdef hid_t cspace = -1
+        cdef hid_t plist_id
+        cdef hsize_t npoints, i
+        cdef ndarray offsets_arr
+        cdef const int64_t *offsets_data
+        cdef const char *data_data
+        cdef char **ptrs = NULL
+        cdef char *strings = NULL
+        cdef char *cur
+        cdef size_t size
+
+        if data.ndim != 1 or data.dtype != np.uint8:
+            raise TypeError("String data must be a one-dimensional uint8 array")
+        dstype = self.get_type()
+        if H5Tis_variable_str(dstype.id) <= 0:
+            raise TypeError("write_strings_buffers() needs a variable-length string dataset")
+
+        data = np.require(data, requirements='C')
+        npoints = H5Sget_select_npoints(fspace.id)
+        offsets_arr = _check_offsets(offsets, npoints, data.shape[0])
+        if npoints == 0:
+            return
+        if np.any(data[offsets_arr[0]:offsets_arr[-1]] == 0):
+            raise ValueError("Strings can't contain NUL characters")
+
+        plist_id = pdefault(dxpl)
+        offsets_data = <const int64_t *>PyArray_DATA(offsets_arr)
+        data_data = <const char *>PyArray_DATA(data)
+
+        try:
+            # HDF5 wants a char* to a NUL-terminated copy of each string
+            ptrs = <char **>emalloc(npoints * sizeof(char *))
+            strings = <char *>emalloc(offsets_data[npoints] - offsets_data[0] + npoints)
+            cur = strings
+            for i in range(npoints):
+                size = offsets_data[i + 1] - offsets_data[i]
+                memcpy(cur, data_data + offsets_data[i], size)
+                cur[size] = 0
+                ptrs[i] = cur
+                cur += size + 1
+
+            strtype = H5Tcopy(H5T_C_S1)
+            H5Tset_size(strtype, H5T_VARIABLE)
+            H5Tset_cset(strtype, H5Tget_cset(dstype.id))
+            cspace = H5Screate_simple(1, &npoints, NULL)
+            H5Dwrite(self.id, strtype, cspace, fspace.id, plist_id, ptrs)
+        finally:
+            efree(strings)
+            efree(ptrs)
+            if cspace > 0:
+                H5Sclose(cspace)
+            if strtype > 0:
+                H5Tclose(strtype)
+
     @with_phil
     def write(self, SpaceID mspace not None, SpaceID fspace not None,
               ndarray arr_obj not None, TypeID mtype=None,
@@ -600,6 +945,116 @@ cdef class DatasetID(ObjectID):
 
         return filters, retval
 
+    def read_direct_chunks(self, offsets, *, hsize_t max_gap=65536, hsize_t max_read=16777216,
+                           index=None, PropID dxpl=None):
+        """ (offsets, *, max_gap=65536, max_read=16777216, index=None, PropID dxpl=None) => (LIST filter_masks, LIST data)
+
+        Read the raw data of several chunks, like read_direct_chunk, given a
+        sequence of chunk offsets.  Each offset must be the logical position
+        of the first element of a chunk; ValueError is raised otherwise.
+
+        Returns a list of filter masks and a list of memoryviews holding the
+        raw data of each chunk, in the same order as `offsets`.  For chunks
+        which have not been written, the filter mask is 0 and the data is
+        None.
+
+        For files opened with the default (sec2) driver, chunks which are no
+        more than `max_gap` bytes apart in the file are fetched together, with
+        one positional read covering all of them, as long as that read is no
+        more than `max_read` bytes (a larger chunk is still read by itself).
+        The file is read without holding the HDF5 lock.  With other drivers, each chunk is read with
+        H5Dread_chunk, using `dxpl` if given.
+
+        The location of each chunk is looked up with
+        H5Dget_chunk_info_by_coord, unless `index` is given.  This should be a
+        structured array from get_chunk_index() (or Dataset.chunk_index()),
+        which avoids asking HDF5 again when reading many chunks.
+
+        .. versionadded:: 3.17
+        """
+        cdef hid_t space_id
+        cdef int rank
+        cdef hsize_t *coord = NULL
+        cdef Py_ssize_t i, n, start, stop
+        cdef unsigned filter_mask
+        cdef haddr_t addr
+        cdef hsize_t size
+        cdef unsigned intent
+
+        offsets = [tuple(o) for o in offsets]
+        n = len(offsets)
+        filter_masks = [0] * n
+        data = [None] * n
+        stored = []  # (address, size, position) for each written chunk
+
+        with phil:
+            space_id = H5Dget_space(self.id)
+            rank = H5Sget_simple_extent_ndims(space_id)
+            H5Sclose(space_id)
+
+            chunks = self.get_create_plist().get_chunk()
+            for i in range(n):
+                if len(offsets[i]) != rank:
+                    raise TypeError(
+                        f"offsets length ({len(offsets[i])}) must match dataset rank ({rank})"
+                    )
+                if any(o % c for o, c in zip(offsets[i], chunks)):
+                    raise ValueError(
+                        f"offset {offsets[i]} is not the start of a chunk (chunk shape {chunks})"
+                    )
+
+            if index is not None:
+                positions = {tuple(o): k for k, o in enumerate(index['offset'].tolist())}
+                for i in range(n):
+                    k = positions.get(offsets[i])
+                    if k is not None:
+                        filter_masks[i] = int(index['filter_mask'][k])
+                        stored.append((int(index['byte_offset'][k]), int(index['size'][k]), i))
+            else:
+                coord = <hsize_t*>emalloc(sizeof(hsize_t) * max(rank, 1))
+                try:
+                    for i in range(n):
+                        convert_tuple(offsets[i], coord, rank)
+                        H5Dget_chunk_info_by_coord(self.id, coord, &filter_mask, &addr, &size)
+                        if addr != HADDR_UNDEF:
+                            filter_masks[i] = filter_mask
+                            stored.append((addr, size, i))
+                finally:
+                    efree(coord)
+
+            fid = get_file_id(self)
+            if fid.get_access_plist().get_driver() != H5FD_SEC2 or not hasattr(os, 'preadv'):
+                for addr, size, i in stored:
+                    data[i] = memoryview(self.read_direct_chunk(offsets[i], dxpl)[1])
+                return filter_masks, data
+
+            # Chunks in the chunk cache may not be in the file yet
+            H5Fget_intent(fid.id, &intent)
+            if intent & H5F_ACC_RDWR:
+                H5Dflush(self.id)
+            fd = fid.get_vfd_handle()
+            # Addresses are relative to the end of the user block
+            base = fid.get_create_plist().get_userblock()
+
+        stored.sort()
+        start = 0
+        while start < len(stored):
+            range_start = stored[start][0]
+            range_end = range_start + stored[start][1]
+            stop = start + 1
+            while stop < len(stored) and stored[stop][0] <= range_end + max_gap:
+                next_end = max(range_end, stored[stop][0] + stored[stop][1])
+                if next_end - range_start > max_read:
+                    break
+                range_end = next_end
+                stop += 1
+            buf = _pread(fd, range_end - range_start, base + range_start)
+            for addr, size, i in stored[start:stop]:
+                data[i] = buf[addr - range_start:addr - range_start + size]
+            start = stop
+
+        return filter_masks, data
+
     @with_phil
     def get_num_chunks(self, SpaceID space=None):
         """ (SpaceID space=None) => INT num_chunks
@@ -684,6 +1139,73 @@ cdef class DatasetID(ObjectID):
                          byte_offset if byte_offset != HADDR_UNDEF else None,
                          size)
 
+    @with_phil
+    def get_chunk_index(self):
+        """ () => NDARRAY
+
+        Retrieve storage information about all the chunks written to the
+        dataset, as a structured array with one record per chunk and fields:
+
+        - offset: logical position of the chunk's first element (uint64,
+          one per dimension)
+        - filter_mask: filters skipped when the chunk was written (uint32)
+        - byte_offset: chunk file address (uint64)
+        - size: chunk size in bytes (uint64)
+
+        Records are in the order HDF5 stores them.  With HDF5 1.10.10 or
+        1.12.3 and later, this is a single pass over H5Dchunk_iter;
+        otherwise, H5Dget_chunk_info is called for each chunk.
+
+        .. versionadded:: 3.17
+        """
+        cdef hid_t space_id
+        cdef int rank
+        cdef hsize_t nchunks, i
+        cdef _ChunkIndexBuffer buf
+        cdef ndarray offset, filter_mask, addr, size
+
+        space_id = H5Dget_space(self.id)
+        try:
+            rank = H5Sget_simple_extent_ndims(space_id)
+            H5Dget_num_chunks(self.id, space_id, &nchunks)
+
+            offset = np.empty((nchunks, rank), dtype=np.uint64)
+            filter_mask = np.empty(nchunks, dtype=np.uint32)
+            addr = np.empty(nchunks, dtype=np.uint64)
+            size = np.empty(nchunks, dtype=np.uint64)
+            buf.rank = rank
+            buf.n = 0
+            buf.capacity = nchunks
+            buf.offset = <hsize_t*>PyArray_DATA(offset)
+            buf.filter_mask = <unsigned*>PyArray_DATA(filter_mask)
+            buf.addr = <haddr_t*>PyArray_DATA(addr)
+            buf.size = <hsize_t*>PyArray_DATA(size)
+
+            ### {{if HDF5_VERSION >= (1, 12, 3) or (HDF5_VERSION >= (1, 10, 10) and HDF5_VERSION < (1, 10, 99))}}
+            H5Dchunk_iter(self.id, H5P_DEFAULT, <H5D_chunk_iter_op_t>_cb_chunk_index, <void*>&buf)
+            ### {{else}}
+            for i in range(nchunks):
+                H5Dget_chunk_info(self.id, space_id, i, buf.offset + buf.n * rank,
+                                  buf.filter_mask + buf.n, buf.addr + buf.n,
+                                  buf.size + buf.n)
+                if buf.addr[buf.n] != HADDR_UNDEF:
+                    buf.n += 1
+            ### {{endif}}
+        finally:
+            H5Sclose(space_id)
+
+        index = np.empty(buf.n, dtype=[
+            ('offset', np.uint64, (rank,)),
+            ('filter_mask', np.uint32),
+            ('byte_offset', np.uint64),
+            ('size', np.uint64),
+        ])
+        index['offset'] = offset[:buf.n]
+        index['filter_mask'] = filter_mask[:buf.n]
+        index['byte_offset'] = addr[:buf.n]
+        index['size'] = size[:buf.n]
+        return index
+
     ### {{if HDF5_VERSION >= (1, 12, 3) or (HDF5_VERSION >= (1, 10, 10) and HDF5_VERSION < (1, 10, 99))}}
     @with_phil
     def chunk_iter(self, object func, PropID dxpl=None):
@@ -12,9 +12,17 @@
 """
 
 from libc.stdint cimport uintptr_t
+from libc.errno cimport errno, E2BIG
 from ._objects import phil, with_phil
 
 
+cdef extern from "lzf.h":
+    unsigned int lzf_compress(const void *in_data, unsigned int in_len,
+                              void *out_data, unsigned int out_len) nogil
+    unsigned int lzf_decompress(const void *in_data, unsigned int in_len,
+                                void *out_data, unsigned int out_len) nogil
+
+
 # === Public constants and data structures ====================================
 
 CLASS_T_VERS = H5Z_CLASS_T_VERS
@@ -132,3 +140,93 @@ def unregister_filter(int filter_code):
 
 def _register_lzf():
     register_lzf()
+
+
+# === In-process filter codecs ================================================
+
+# These implement the same transformations as the LZF filter and the
+# HDF5 Fletcher32 filter, so raw chunks can be decoded and encoded outside of
+# the library (see DatasetID.read_direct_chunk and write_direct_chunk).
+# They don't call HDF5, and release the GIL while working.
+
+def lzf_compress_buffer(const unsigned char[::1] src not None,
+                        unsigned char[::1] out not None):
+    """(BUFFER src, BUFFER out) => INT nbytes
+
+    Compress src into the writable buffer out with LZF, as the "lzf" filter
+    does. Returns the number of bytes written, or 0 if the compressed data
+    would not fit in out.
+
+    .. versionadded:: 3.17
+    """
+    cdef unsigned int nbytes
+    if src.shape[0] == 0 or out.shape[0] == 0:
+        return 0
+    with nogil:
+        nbytes = lzf_compress(&src[0], <unsigned int>src.shape[0],
+                              &out[0], <unsigned int>out.shape[0])
+    return nbytes
+
+
+def lzf_decompress_buffer(const unsigned char[::1] src not None,
+                          unsigned char[::1] out not None):
+    """(BUFFER src, BUFFER out) => INT nbytes
+
+    Decompress LZF data from src into the writable buffer out. Returns the
+    number of bytes written, or 0 if out is too small to hold the result.
+    Raises ValueError if src is not valid LZF data.
+
+    .. versionadded:: 3.17
+    """
+    cdef unsigned int nbytes
+    cdef int err = 0
+    if src.shape[0] == 0 or out.shape[0] == 0:
+        return 0
+    with nogil:
+        nbytes = lzf_decompress(&src[0], <unsigned int>src.shape[0],
+                                &out[0], <unsigned int>out.shape[0])
+        if nbytes == 0:
+            err = errno
+    if nbytes == 0 and err != E2BIG:
+        raise ValueError("Invalid data for LZF decompression")
+    return nbytes
+
+
+def fletcher32(const unsigned char[::1] data not None):
+    """(BUFFER data) => INT checksum
+
+    Compute the Fletcher32 checksum of data, using the same algorithm as the
+    HDF5 Fletcher32 filter.  The filter stores this value as 4 little-endian
+    bytes after the data.
+
+    .. versionadded:: 3.17
+    """
+    cdef size_t length = data.shape[0]
+    cdef size_t remaining = length // 2
+    cdef size_t tlen, pos = 0
+    cdef uint32_t sum1 = 0, sum2 = 0
+
+    with nogil:
+        while remaining:
+            tlen = 360 if remaining > 360 else remaining
+            remaining -= tlen
+            while tlen:
+                sum1 += ((<uint32_t>data[pos]) << 8) | (<uint32_t>data[pos + 1])
+                pos += 2
+                sum2 += sum1
+                tlen -= 1
+            sum1 = (sum1 & 0xffff) + (sum1 >> 16)
+            sum2 = (sum2 & 0xffff) + (sum2 >> 16)
+
+        # Check for odd number of bytes
+        if length % 2:
+            sum1 += (<uint32_t>data[pos]) << 8
+            sum2 += sum1
+            sum1 = (sum1 & 0xffff) + (sum1 >> 16)
+            sum2 = (sum2 & 0xffff) + (sum2 >> 16)
+
+        # Second reduction step to reduce sums to 16 bits
+        sum1 = (sum1 & 0xffff) + (sum1 >> 16)
+        sum2 = (sum2 & 0xffff) + (sum2 >> 16)
+
+    return (sum2 << 16) | sum1
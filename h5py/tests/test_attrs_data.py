@@ -221,6 +221,17 @@ class TestTypes(BaseAttrs):
         self.assertEqual(out[0], data[0])
         self.assertEqual(out[1], data[1])
 
+    def test_vlen_string_array_decode(self):
+        """ Vlen string arrays are decoded as UTF-8, escaping invalid bytes """
+        name = make_name()
+        dt = h5py.string_dtype()
+        data = np.array([b'f\xc3\xa0ilte', b'\xff', b''], dtype=dt).reshape(3, 1)
+        self.f.attrs[name] = data
+        out = self.f.attrs[name]
+        self.assertEqual(h5py.check_string_dtype(out.dtype), h5py.check_string_dtype(dt))
+        self.assertEqual(out.shape, (3, 1))
+        self.assertEqual(out.ravel().tolist(), ['fàilte', '\udcff', ''])
+
     def test_string_scalar(self):
         """ Storage of variable-length byte string scalars (auto-creation) """
         name = make_name()
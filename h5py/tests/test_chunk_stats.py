@@ -0,0 +1,334 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2020 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Tests for per-chunk statistics and the queries using them.
+"""
+
+import numpy as np
+import pytest
+
+import h5py
+
+from .common import make_name
+
+
+def sorted_data(n):
+    rng = np.random.default_rng(12345)
+    return np.sort(rng.random(n) * 50)
+
+
+def check_where(dset, cond, expected, **kwargs):
+    got = dset.where(cond, **kwargs)
+    want = np.nonzero(expected)
+    assert len(got) == len(want)
+    for a, b in zip(got, want):
+        np.testing.assert_array_equal(a, b)
+
+
+def count_reads(monkeypatch):
+    reads = []
+    orig_getitem = h5py.Dataset.__getitem__
+
+    def spy(dset, args, **kwargs):
+        reads.append(args)
+        return orig_getitem(dset, args, **kwargs)
+
+    monkeypatch.setattr(h5py.Dataset, '__getitem__', spy)
+    return reads
+
+
+def test_build(writable_file):
+    data = sorted_data(1000)
+    dset = writable_file.create_dataset(make_name(), data=data, chunks=(100,))
+    assert dset.chunk_stats() is None
+    stats = dset.build_chunk_stats()
+    assert stats.name == dset.name + '_chunk_stats'
+    records = dset.chunk_stats()
+    assert records.shape == (10,)
+    np.testing.assert_array_equal(records['min'], data.reshape(10, 100).min(axis=1))
+    np.testing.assert_array_equal(records['max'], data.reshape(10, 100).max(axis=1))
+    assert not records['nulls'].any()
+
+    # Building again replaces the statistics
+    name = stats.name
+    dset[0] = -1
+    assert dset.build_chunk_stats().name == name
+    assert dset.chunk_stats()['min'][0] == -1
+
+
+def test_build_unwritten(writable_file):
+    dset = writable_file.create_dataset(
+        make_name(), shape=(20, 20), dtype='f4', chunks=(10, 10), fillvalue=-1
+    )
+    dset[12:15, 3] = 7
+    dset.build_chunk_stats()
+    records = dset.chunk_stats()
+    np.testing.assert_array_equal(records['min'], [-1, -1, -1, -1])
+    np.testing.assert_array_equal(records['max'], [-1, -1, 7, -1])
+
+
+def test_build_nan(writable_file):
+    data = np.arange(40, dtype='f8').reshape(4, 10)
+    data[1, 3:5] = np.nan
+    data[2] = np.nan
+    dset = writable_file.create_dataset(make_name(), data=data, chunks=(1, 10))
+    dset.build_chunk_stats()
+    records = dset.chunk_stats()
+    np.testing.assert_array_equal(records['nulls'], [0, 2, 10, 0])
+    assert records['min'][1] == 10
+    assert np.isnan(records['min'][2])
+    # The chunk of NaNs never matches
+    assert dset.select_chunks() == [(slice(i, i + 1), slice(0, 10)) for i in (0, 1, 3)]
+    check_where(dset, '>= 0', data >= 0)
+
+
+def test_build_errors(writable_file):
+    data = np.zeros(10, dtype=[('a', 'f4'), ('s', 'S3')])
+    contiguous = writable_file.create_dataset(make_name(), data=np.zeros(10))
+    with pytest.raises(TypeError):
+        contiguous.build_chunk_stats()
+    strings = writable_file.create_dataset(make_name('s'), data=[b'a', b'b'], chunks=(1,))
+    with pytest.raises(TypeError):
+        strings.build_chunk_stats()
+    compound = writable_file.create_dataset(make_name('c'), data=data, chunks=(5,))
+    with pytest.raises(TypeError):
+        compound.build_chunk_stats(fields=['s'])
+    with pytest.raises(ValueError):
+        compound.build_chunk_stats(fields=['x'])
+    writable_file.create_group(make_name('taken'))
+    with pytest.raises(ValueError, match='exists'):
+        compound.build_chunk_stats(name=make_name('taken'))
+
+
+@pytest.mark.parametrize('cond, expected', [
+    pytest.param('> 40', lambda a: a > 40, id='gt'),
+    pytest.param('>=40', lambda a: a >= 40, id='ge'),
+    pytest.param(' < 5.5 ', lambda a: a < 5.5, id='lt'),
+    pytest.param('<= 5', lambda a: a <= 5, id='le'),
+    pytest.param((10, 12), lambda a: (a >= 10) & (a <= 12), id='range'),
+    pytest.param((None, 3), lambda a: a <= 3, id='open-range'),
+])
+def test_where(writable_file, monkeypatch, cond, expected):
+    data = sorted_data(2000)
+    dset = writable_file.create_dataset(make_name(), data=data, chunks=(100,))
+    dset.build_chunk_stats()
+    reads = count_reads(monkeypatch)
+    check_where(dset, cond, expected(data))
+    # The data is sorted, so only a few chunks can match
+    assert 0 < len(reads) < 20
+
+
+def test_where_equal(writable_file):
+    data = np.arange(60).reshape(6, 10) % 7
+    dset = writable_file.create_dataset(make_name(), data=data, chunks=(4, 4))
+    dset.build_chunk_stats()
+    check_where(dset, '== 3', data == 3)
+    check_where(dset, '== 30', data == 30)
+
+
+def test_where_without_stats(writable_file, monkeypatch):
+    data = sorted_data(1000)
+    dset = writable_file.create_dataset(make_name(), data=data, chunks=(100,))
+    reads = count_reads(monkeypatch)
+    check_where(dset, '> 40', data > 40)
+    assert len(reads) == 10
+
+
+def test_where_invalid(writable_file):
+    dset = writable_file.create_dataset(make_name(), data=np.zeros(10), chunks=(5,))
+    with pytest.raises(ValueError):
+        dset.where('~ 3')
+    with pytest.raises(ValueError):
+        dset.where('> x')
+    with pytest.raises(TypeError):
+        dset.where(3)
+    with pytest.raises(ValueError):
+        dset.where('> 3', field='a')
+
+
+def test_select_chunks_2d(writable_file):
+    data = np.zeros((30, 40), dtype='i2')
+    data[12, 35] = 9
+    dset = writable_file.create_dataset(make_name(), data=data, chunks=(10, 20))
+    assert len(dset.select_chunks(5)) == 6
+    dset.build_chunk_stats()
+    assert dset.select_chunks(5) == [(slice(10, 20), slice(20, 40))]
+    assert dset.select_chunks(hi=5) == [
+        (slice(i, i + 10), slice(j, j + 20)) for i in (0, 10, 20) for j in (0, 20)
+    ]
+    assert dset.select_chunks(10) == []
+
+
+def test_compound(writable_file):
+    rng = np.random.default_rng(1)
+    dt = np.dtype([('temp', 'f4'), ('id', 'i4'), ('name', 'S4')])
+    data = np.zeros(500, dtype=dt)
+    data['temp'] = np.sort(rng.random(500) * 100)
+    data['id'] = np.arange(500)[::-1]
+    dset = writable_file.create_dataset(make_name(), data=data, chunks=(50,))
+    dset.build_chunk_stats(fields='temp')
+    assert dset.chunk_stats().dtype.names == ('temp',)
+    assert len(dset.select_chunks(90, field='temp')) < 3
+    check_where(dset, '> 90', data['temp'] > 90, field='temp')
+    # No statistics for the field: every chunk is read
+    assert len(dset.select_chunks(490, field='id')) == 10
+    check_where(dset, '>= 490', data['id'] >= 490, field='id')
+    with pytest.raises(ValueError, match='field'):
+        dset.select_chunks(1)
+
+
+def test_update_on_write(writable_file):
+    data = sorted_data(1000)
+    dset = writable_file.create_dataset(
+        make_name(), data=data, chunks=(100,), compression='gzip'
+    )
+    dset.build_chunk_stats()
+    dset[150] = 99
+    dset[800:820] = -5
+    dset.write_direct(np.full(10, 77.0), dest_sel=np.s_[500:510])
+    data[150] = 99
+    data[800:820] = -5
+    data[500:510] = 77
+    records = dset.chunk_stats()
+    np.testing.assert_array_equal(records['min'], data.reshape(10, 100).min(axis=1))
+    np.testing.assert_array_equal(records['max'], data.reshape(10, 100).max(axis=1))
+    check_where(dset, '> 60', data > 60)
+    check_where(dset, '< 0', data < 0)
+
+
+def test_update_on_fill_and_write_parallel(writable_file):
+    data = np.zeros((40, 40), dtype='i4')
+    dset = writable_file.create_dataset(make_name(), data=data, chunks=(10, 10))
+    dset.build_chunk_stats()
+    dset.fill(5, np.s_[:10])
+    dset.write_parallel(np.full((10, 40), 6, dtype='i4'), np.s_[20:30], threads=2)
+    data[:10] = 5
+    data[20:30] = 6
+    records = dset.chunk_stats()
+    np.testing.assert_array_equal(records['max'], data[::10, ::10].ravel())
+    check_where(dset, '== 6', data == 6)
+
+
+def test_update_on_map_blocks(writable_file):
+    data = np.arange(100, dtype='i4').reshape(10, 10)
+    dset = writable_file.create_dataset(
+        make_name(), data=data, chunks=(5, 5), compression='gzip'
+    )
+    dset.build_chunk_stats()
+    dset.map_blocks(np.negative)
+    np.testing.assert_array_equal(dset.chunk_stats()['max'], [-0, -5, -50, -55])
+    check_where(dset, '< -90', -data < -90)
+
+
+def test_resize(writable_file):
+    dset = writable_file.create_dataset(
+        make_name(), shape=(0, 4), dtype='f8', chunks=(10, 4), maxshape=(None, 4)
+    )
+    dset.build_chunk_stats()
+    assert dset.chunk_stats().shape == (0,)
+    data = np.arange(100, dtype='f8').reshape(25, 4)
+    dset.resize((25, 4))
+    dset[:] = data
+    np.testing.assert_array_equal(dset.chunk_stats()['max'], [39, 79, 99])
+    check_where(dset, '> 90', data > 90)
+
+    dset.resize((12, 4))
+    np.testing.assert_array_equal(dset.chunk_stats()['max'], [39, 47])
+
+
+def test_resize_stale(writable_file):
+    dset = writable_file.create_dataset(
+        make_name(), data=np.arange(20.).reshape(4, 5), chunks=(2, 2), maxshape=(4, None)
+    )
+    dset.build_chunk_stats()
+    dset.resize((4, 10))
+    assert dset.chunk_stats() is None
+    assert len(dset.select_chunks(100)) == 10
+    dset.build_chunk_stats()
+    assert dset.select_chunks(100) == []
+
+
+def test_build_after_write(writable_file):
+    dset = writable_file.create_dataset(make_name(), data=np.zeros(100), chunks=(10,))
+    dset[5] = 1
+    dset.build_chunk_stats()
+    dset[50] = 9
+    assert dset.chunk_stats()['max'][5] == 9
+
+
+def test_build_through_other_handle(writable_file):
+    """ Writes through a handle opened before the statistics were built
+    still update them """
+    name = make_name()
+    writable_file.create_dataset(name, data=np.zeros(100), chunks=(10,))
+    dset = writable_file[name]
+    dset[0] = 1
+    writable_file[name].build_chunk_stats()
+    dset[5] = 1000
+    assert writable_file[name].where('> 500')[0].tolist() == [5]
+
+
+def test_partial_chunks_updated_once(writable_file, monkeypatch):
+    dset = writable_file.create_dataset(
+        make_name(), data=np.zeros(100, dtype='i4'), chunks=(10,), compression='gzip'
+    )
+    dset.build_chunk_stats()
+    regions = []
+    orig_read_block = h5py._hl.chunkstats._read_block
+
+    def spy(dset, fields, region):
+        regions.append(region)
+        return orig_read_block(dset, fields, region)
+
+    monkeypatch.setattr(h5py._hl.chunkstats, '_read_block', spy)
+    dset.fill(3, np.s_[5:35])
+    dset.write_parallel(np.full(30, 4, dtype='i4'), np.s_[55:85], threads=2)
+    assert sorted(r[0].start for r in regions) == [0, 10, 20, 30, 50, 60, 70, 80]
+    np.testing.assert_array_equal(
+        dset.chunk_stats()['max'], [3, 3, 3, 3, 0, 4, 4, 4, 4, 0]
+    )
+
+
+@pytest.mark.parametrize('key, expected', [
+    ([0, 99], [0, 90]),
+    (np.s_[5::40], [0, 40, 80]),
+    (np.s_[15:25], [10, 20]),
+])
+def test_update_touched_chunks(writable_file, monkeypatch, key, expected):
+    """ Scattered writes only recompute the chunks they touch """
+    dset = writable_file.create_dataset(make_name(), data=np.zeros(100), chunks=(10,))
+    dset.build_chunk_stats()
+    regions = []
+    orig_read_block = h5py._hl.chunkstats._read_block
+
+    def spy(dset, fields, region):
+        regions.append(region)
+        return orig_read_block(dset, fields, region)
+
+    monkeypatch.setattr(h5py._hl.chunkstats, '_read_block', spy)
+    dset[key] = 7
+    assert [r[0].start for r in regions] == expected
+    assert dset.where('== 7')[0].tolist() == np.arange(100)[key].tolist()
+
+
+def test_update_touched_chunks_2d(writable_file):
+    data = np.zeros((40, 30))
+    dset = writable_file.create_dataset(make_name(), data=data, chunks=(10, 10))
+    dset.build_chunk_stats()
+    points = np.zeros(data.shape, dtype=bool)
+    points[[3, 25, 39], [28, 0, 15]] = True  # Selected as points
+    mask = points.copy()
+    mask[12:14, 5:17] = True  # Selected as hyperslabs
+    for key, value in [(points, 3), (mask, 1), (np.s_[[1, 38], 2:22], 2)]:
+        dset[key] = value
+        data[key] = value
+    maxes = data.reshape(4, 10, 3, 10).max(axis=(1, 3)).ravel()
+    np.testing.assert_array_equal(dset.chunk_stats()['max'], maxes)
+
@@ -0,0 +1,467 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2020 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Tests for chunk-level I/O done outside of the HDF5 library.
+"""
+
+import numpy as np
+import pytest
+
+import h5py
+from h5py._hl.filters import FilterPipeline
+
+from .common import make_name
+
+
+FILTER_OPTS = [
+    pytest.param({}, id='none'),
+    pytest.param({'compression': 'gzip'}, id='gzip'),
+    pytest.param({'compression': 'lzf'}, id='lzf'),
+    pytest.param({'compression': 'gzip', 'shuffle': True,
+                  'fletcher32': True}, id='gzip-shuffle-fletcher32'),
+    pytest.param({'compression': 'lzf', 'shuffle': True}, id='lzf-shuffle'),
+]
+
+
+def make_data(shape, dtype='<i4'):
+    rng = np.random.default_rng(12345)
+    # Small values, so the data compresses
+    return rng.integers(0, 50, size=shape).astype(dtype)
+
+
+@pytest.mark.parametrize('opts', FILTER_OPTS)
+def test_pipeline_decode(writable_file, opts):
+    data = make_data((20, 30), '>f8')
+    ds = writable_file.create_dataset(make_name(), data=data, chunks=(8, 16), **opts)
+    pipeline = FilterPipeline.from_dcpl(ds.id.get_create_plist(), 8, ds.chunks)
+
+    filter_mask, raw = ds.id.read_direct_chunk((8, 16))
+    chunk = np.frombuffer(pipeline.decode(raw, filter_mask), dtype='>f8')
+    chunk = chunk.reshape(ds.chunks)
+    # Edge chunks are stored in full, so compare only the part in the dataset
+    np.testing.assert_array_equal(chunk[:, :14], data[8:16, 16:])
+
+
+@pytest.mark.parametrize('opts', FILTER_OPTS)
+def test_pipeline_encode(writable_file, opts):
+    data = make_data((16, 16))
+    ds = writable_file.create_dataset(
+        make_name(), shape=data.shape, dtype=data.dtype, chunks=(8, 8), **opts
+    )
+    pipeline = FilterPipeline.from_dcpl(ds.id.get_create_plist(), 4, ds.chunks)
+
+    for i in (0, 8):
+        for j in (0, 8):
+            chunk = np.ascontiguousarray(data[i:i + 8, j:j + 8])
+            ds.id.write_direct_chunk((i, j), *reversed(pipeline.encode(chunk)))
+
+    np.testing.assert_array_equal(ds[()], data)
+
+
+def test_pipeline_unsupported(writable_file):
+    ds = writable_file.create_dataset(
+        make_name(), shape=(10,), dtype='i4', chunks=(5,), scaleoffset=0
+    )
+    assert FilterPipeline.from_dcpl(ds.id.get_create_plist(), 4, ds.chunks) is None
+
+
+def test_pipeline_fletcher32_mismatch(writable_file):
+    ds = writable_file.create_dataset(
+        make_name(), data=np.arange(10), chunks=(5,), fletcher32=True
+    )
+    pipeline = FilterPipeline.from_dcpl(ds.id.get_create_plist(), 8, ds.chunks)
+    filter_mask, raw = ds.id.read_direct_chunk((0,))
+    raw = bytearray(raw)
+    raw[0] ^= 0xff
+    with pytest.raises(OSError):
+        pipeline.decode(raw, filter_mask)
+
+
+@pytest.mark.parametrize('opts', FILTER_OPTS)
+@pytest.mark.parametrize('sel', [
+    np.s_[()],
+    np.s_[...],
+    np.s_[3:40:3, 5],
+    np.s_[7, 2:29, ::4],
+    np.s_[1, 2, 3],
+    np.s_[-10:],
+    np.s_[5:5],
+])
+def test_read_threads(writable_file, opts, sel):
+    data = make_data((41, 29, 13), '>i2')
+    ds = writable_file.create_dataset(make_name(), data=data, chunks=(8, 7, 5), **opts)
+    out = ds.read(sel, threads=3)
+    expected = ds[sel]
+    assert type(out) is type(expected)
+    assert out.dtype == expected.dtype
+    np.testing.assert_array_equal(out, expected)
+
+
+def test_read_threads_unallocated(writable_file):
+    ds = writable_file.create_dataset(
+        make_name(), shape=(50,), dtype='f4', chunks=(10,), fillvalue=7,
+        compression='gzip',
+    )
+    ds[12:25] = 1
+    expected = np.full(50, 7, dtype='f4')
+    expected[12:25] = 1
+    np.testing.assert_array_equal(ds.read(threads=2), expected)
+
+
+def test_read_threads_fallback(writable_file):
+    # szip/scaleoffset, fancy indexing, compound types: HDF5 does the work
+    data = make_data((20, 10))
+    ds = writable_file.create_dataset(
+        make_name('a'), data=data, chunks=(5, 5), scaleoffset=0
+    )
+    np.testing.assert_array_equal(ds.read(np.s_[2:8], threads=2), data[2:8])
+
+    ds = writable_file.create_dataset(
+        make_name('b'), data=data, chunks=(5, 5), compression='gzip'
+    )
+    np.testing.assert_array_equal(
+        ds.read(np.s_[[1, 4, 9], :], threads=2), data[[1, 4, 9], :]
+    )
+
+    cdata = np.zeros(10, dtype=[('a', 'i4'), ('b', 'f8')])
+    ds = writable_file.create_dataset(
+        make_name('c'), data=cdata, chunks=(5,), compression='gzip'
+    )
+    np.testing.assert_array_equal(ds.read(threads=2), cdata)
+
+
+def test_read_threads_invalid(writable_file):
+    ds = writable_file.create_dataset(make_name(), data=np.arange(10), chunks=(5,))
+    with pytest.raises(ValueError):
+        ds.read(threads=0)
+
+
+@pytest.mark.parametrize('opts', FILTER_OPTS)
+@pytest.mark.parametrize('sel', [
+    np.s_[()],
+    np.s_[3:40:3, 5],
+    np.s_[7, 2:29, ::4],
+    np.s_[8:32, :14, 5:],
+    np.s_[1, 2, 3],
+    np.s_[5:5],
+])
+def test_write_parallel(writable_file, opts, sel):
+    data = make_data((41, 29, 13), '>i2')
+    ds = writable_file.create_dataset(
+        make_name(), shape=data.shape, dtype=data.dtype, chunks=(8, 7, 5),
+        fillvalue=-1, **opts
+    )
+    ds[:10] = 3  # Some chunks written already, and in the chunk cache
+    expected = np.full(data.shape, -1, dtype=data.dtype)
+    expected[:10] = 3
+    expected[sel] = data[sel]
+
+    ds.write_parallel(data[sel], sel, threads=3)
+    np.testing.assert_array_equal(ds[()], expected)
+    np.testing.assert_array_equal(ds.read(threads=2), expected)
+
+
+def test_write_parallel_direct(writable_file, monkeypatch):
+    ds = writable_file.create_dataset(
+        make_name(), shape=(25, 20), dtype='f4', chunks=(10, 10), compression='gzip'
+    )
+    encoded = []
+    orig_encode = FilterPipeline.encode
+
+    def spy(pipeline, chunk):
+        encoded.append(chunk.copy())
+        return orig_encode(pipeline, chunk)
+
+    monkeypatch.setattr(FilterPipeline, 'encode', spy)
+    # Chunks at the end of the dataset are padded; chunks partly selected
+    # at the start are written through HDF5.
+    data = make_data((20, 20), 'f4')
+    ds.write_parallel(data, np.s_[5:])
+    assert len(encoded) == 4
+    np.testing.assert_array_equal(encoded[0], data[5:15, :10])
+    np.testing.assert_array_equal(encoded[3][:5], data[15:, 10:])
+    np.testing.assert_array_equal(encoded[3][5:], 0)
+    np.testing.assert_array_equal(ds[5:], data)
+    np.testing.assert_array_equal(ds[:5], 0)
+
+
+def test_write_parallel_broadcast(writable_file):
+    ds = writable_file.create_dataset(
+        make_name(), shape=(30, 4), dtype='i8', chunks=(10, 4), compression='gzip'
+    )
+    ds.write_parallel(np.arange(4, dtype='i4'), threads=2)
+    np.testing.assert_array_equal(ds[()], np.tile(np.arange(4), (30, 1)))
+
+
+def test_write_parallel_fallback(writable_file):
+    ds = writable_file.create_dataset(
+        make_name('a'), shape=(20,), dtype='i4', chunks=(5,), scaleoffset=0
+    )
+    ds.write_parallel(np.arange(20), threads=2)
+    np.testing.assert_array_equal(ds[()], np.arange(20))
+
+    # Float data into an integer dataset isn't a safe cast: HDF5 converts it
+    ds = writable_file.create_dataset(
+        make_name('b'), shape=(20,), dtype='i4', chunks=(5,), compression='gzip'
+    )
+    ds.write_parallel(np.arange(20) + 0.25, threads=2)
+    np.testing.assert_array_equal(ds[()], np.arange(20))
+
+    with pytest.raises(ValueError):
+        ds.write_parallel(np.arange(20), threads=0)
+
+
+@pytest.mark.parametrize('opts', FILTER_OPTS)
+def test_create_parallel_compress(writable_file, opts):
+    data = make_data((41, 29))
+    ds = writable_file.create_dataset(
+        make_name(), data=data, chunks=(8, 7), parallel_compress=2, **opts
+    )
+    np.testing.assert_array_equal(ds[()], data)
+
+
+@pytest.mark.parametrize('opts', FILTER_OPTS)
+@pytest.mark.parametrize('sel', [
+    np.s_[()],
+    np.s_[3:40:3, 5],
+    np.s_[8:32, :14, 5:],
+    np.s_[1, 2, 3],
+])
+def test_fill(writable_file, opts, sel):
+    ds = writable_file.create_dataset(
+        make_name(), shape=(41, 29, 13), dtype='>i2', chunks=(8, 7, 5),
+        fillvalue=-1, **opts
+    )
+    ds[:10] = 3  # Some chunks written already, and in the chunk cache
+    expected = np.full(ds.shape, -1, dtype='>i2')
+    expected[:10] = 3
+    expected[sel] = 9
+
+    ds.fill(9, sel)
+    np.testing.assert_array_equal(ds[()], expected)
+
+
+def test_fill_encodes_once(writable_file, monkeypatch):
+    ds = writable_file.create_dataset(
+        make_name(), shape=(25, 20), dtype='f4', chunks=(10, 10), compression='gzip'
+    )
+    encoded = []
+    orig_encode = FilterPipeline.encode
+
+    def spy(pipeline, chunk):
+        encoded.append(chunk.copy())
+        return orig_encode(pipeline, chunk)
+
+    monkeypatch.setattr(FilterPipeline, 'encode', spy)
+    ds.fill(2.5)
+    # One full chunk, and one for the edge of the dataset, padded with zeros
+    assert len(encoded) == 2
+    np.testing.assert_array_equal(encoded[0], 2.5)
+    np.testing.assert_array_equal(encoded[1][:5], 2.5)
+    np.testing.assert_array_equal(encoded[1][5:], 0)
+    np.testing.assert_array_equal(ds[()], 2.5)
+
+
+def test_fill_fillvalue(writable_file):
+    ds = writable_file.create_dataset(
+        make_name(), shape=(40,), dtype='i4', chunks=(10,), fillvalue=7,
+        compression='gzip',
+    )
+    ds[12:25] = 1
+    ds.fill(7, np.s_[5:])
+    # Unwritten chunks are left alone
+    assert [tuple(o) for o in ds.chunk_index()['offset']] == [(10,), (20,)]
+    np.testing.assert_array_equal(ds[()], 7)
+
+    ds.fill(7)
+    assert ds.id.get_num_chunks() == 2
+    np.testing.assert_array_equal(ds[()], 7)
+
+
+REDUCE_SELECTIONS = [
+    np.s_[()],
+    np.s_[3:40:3, 5],
+    np.s_[7, 2:29, ::4],
+    np.s_[[1, 5, 9]],
+]
+
+
+@pytest.mark.parametrize('opts', [
+    pytest.param({'chunks': (8, 7, 5), 'compression': 'gzip'}, id='gzip'),
+    pytest.param({'chunks': (8, 7, 5)}, id='chunked'),
+    pytest.param({}, id='contiguous'),
+])
+@pytest.mark.parametrize('sel', REDUCE_SELECTIONS)
+@pytest.mark.parametrize('op', ['sum', 'min', 'max', 'mean', 'var', 'std'])
+def test_reduce(writable_file, monkeypatch, opts, sel, op):
+    monkeypatch.setattr(h5py._hl.dataset, 'ITER_BLOCK_SIZE', 1000)
+    data = make_data((41, 29, 13), '<f4') + 1e4
+    ds = writable_file.create_dataset(make_name(), data=data, **opts)
+    expected_data = data[sel]
+    for axis in [None, 0, -1, tuple(range(expected_data.ndim))]:
+        res = ds.reduce(op, axis, sel, workers=3)
+        func = getattr(np, op)
+        assert np.asarray(res).dtype == func(expected_data, axis=axis).dtype
+        # NumPy's float32 variance is less precise than ours; compare to float64
+        np.testing.assert_allclose(res, func(expected_data.astype('f8'), axis=axis), rtol=1e-4)
+
+
+def test_reduce_decodes_chunks(writable_file, monkeypatch):
+    data = make_data((50, 20), 'i2')
+    ds = writable_file.create_dataset(
+        make_name(), data=data, chunks=(10, 10), compression='gzip'
+    )
+    decoded = []
+    orig_decode = FilterPipeline.decode
+
+    def spy(pipeline, buf, filter_mask=0):
+        decoded.append(len(buf))
+        return orig_decode(pipeline, buf, filter_mask)
+
+    monkeypatch.setattr(FilterPipeline, 'decode', spy)
+    assert ds.reduce('sum', workers=2) == data.sum()
+    np.testing.assert_array_equal(ds.reduce('max', axis=1), data.max(axis=1))
+    assert len(decoded) == 20
+
+
+def test_reduce_unallocated(writable_file):
+    ds = writable_file.create_dataset(
+        make_name(), shape=(50,), dtype='f4', chunks=(10,), fillvalue=2,
+        compression='gzip',
+    )
+    ds[12:25] = 1
+    assert ds.reduce('sum') == 13 + 2 * 37
+
+
+def test_reduce_var_precision(writable_file):
+    """Variances of blocks are merged without cancellation"""
+    data = 1e9 + np.random.default_rng(0).random(100_000)
+    ds = writable_file.create_dataset(make_name(), data=data, chunks=(1000,))
+    np.testing.assert_allclose(ds.reduce('var'), data.var(), rtol=1e-6)
+    np.testing.assert_allclose(ds.reduce(h5py.reducers.Var(ddof=1)), data.var(ddof=1), rtol=1e-6)
+
+
+def test_reduce_histogram(writable_file):
+    data = make_data((40, 30), 'f8')
+    ds = writable_file.create_dataset(make_name(), data=data, chunks=(7, 8))
+    counts, edges = ds.reduce(h5py.reducers.Histogram(5, (0, 50)))
+    expected, expected_edges = np.histogram(data, 5, (0, 50))
+    np.testing.assert_array_equal(counts, expected)
+    np.testing.assert_array_equal(edges, expected_edges)
+
+    counts, _ = ds.reduce(h5py.reducers.Histogram([0, 10, 45]), sel=np.s_[5:])
+    np.testing.assert_array_equal(counts, np.histogram(data[5:], [0, 10, 45])[0])
+    with pytest.raises(ValueError):
+        h5py.reducers.Histogram(5)
+    with pytest.raises(ValueError):
+        ds.reduce(h5py.reducers.Histogram(5, (0, 50)), axis=0)
+
+
+def test_reduce_custom(writable_file):
+    class CountNonzero(h5py.reducers.Reducer):
+        def map(self, block, axis):
+            return np.count_nonzero(block, axis=axis)
+
+        def combine(self, a, b):
+            return a + b
+
+    data = make_data((40, 30))
+    ds = writable_file.create_dataset(make_name(), data=data, chunks=(7, 8))
+    assert ds.reduce(CountNonzero()) == np.count_nonzero(data)
+    np.testing.assert_array_equal(
+        ds.reduce(CountNonzero(), axis=0, sel=np.s_[::2]),
+        np.count_nonzero(data[::2], axis=0),
+    )
+
+
+def test_reducer_incomplete():
+    """ A Reducer subclass missing combine() can't be instantiated """
+    class CountNonzero(h5py.reducers.Reducer):
+        def map(self, block, axis):
+            return np.count_nonzero(block, axis=axis)
+
+    with pytest.raises(TypeError):
+        CountNonzero()
+
+
+def test_reduce_invalid(writable_file):
+    ds = writable_file.create_dataset(make_name(), data=np.arange(10), chunks=(5,))
+    with pytest.raises(ValueError, match='op'):
+        ds.reduce('median')
+    with pytest.raises(ValueError, match='workers'):
+        ds.reduce('sum', workers=0)
+    with pytest.raises(ValueError, match='axis'):
+        ds.reduce('sum', axis=1)
+
+
+@pytest.mark.parametrize('out_opts', [
+    pytest.param({'chunks': (8, 7), 'compression': 'gzip'}, id='gzip'),
+    pytest.param({'chunks': (5, 29), 'compression': 'lzf', 'shuffle': True}, id='lzf-other-chunks'),
+    pytest.param({'chunks': (8, 7)}, id='chunked'),
+    pytest.param({}, id='contiguous'),
+])
+@pytest.mark.parametrize('block', [None, (6, 10)])
+def test_map_blocks(writable_file, out_opts, block):
+    data = make_data((41, 29))
+    src = writable_file.create_dataset(make_name(), data=data, chunks=(8, 7), compression='gzip')
+    out = writable_file.create_dataset(make_name('out'), shape=data.shape, dtype='f8', **out_opts)
+    res = src.map_blocks(lambda x: x / 2 + 1, out, block=block, workers=3)
+    assert res is out
+    np.testing.assert_array_equal(out[()], data / 2 + 1)
+
+
+def test_map_blocks_in_place(writable_file):
+    data = make_data((50, 20))
+    ds = writable_file.create_dataset(make_name(), data=data, chunks=(10, 10), compression='gzip')
+    ds.map_blocks(np.negative, workers=2)
+    np.testing.assert_array_equal(ds[()], -data)
+
+    scalar = writable_file.create_dataset(make_name('scalar'), data=3)
+    scalar.map_blocks(lambda x: x + 1)
+    assert scalar[()] == 4
+
+
+def test_map_blocks_direct(writable_file, monkeypatch):
+    """Blocks matching the output chunks are compressed on the pool"""
+    data = make_data((25, 20))
+    src = writable_file.create_dataset(make_name(), data=data)
+    out = writable_file.create_dataset(
+        make_name('out'), shape=data.shape, dtype='i4', chunks=(10, 10), compression='gzip'
+    )
+    encoded = []
+    orig_encode = FilterPipeline.encode
+
+    def spy(pipeline, chunk):
+        encoded.append(chunk.shape)
+        return orig_encode(pipeline, chunk)
+
+    monkeypatch.setattr(FilterPipeline, 'encode', spy)
+    src.map_blocks(lambda x: x * 3, out)
+    assert encoded == [(10, 10)] * 6
+    np.testing.assert_array_equal(out[()], data * 3)
+
+
+def test_map_blocks_errors(writable_file):
+    data = make_data((30, 10))
+    src = writable_file.create_dataset(make_name(), data=data, chunks=(5, 10))
+    out = writable_file.create_dataset(make_name('out'), shape=(30, 9), dtype='i4')
+    with pytest.raises(ValueError, match='shape'):
+        src.map_blocks(np.negative, out)
+    with pytest.raises(ValueError, match='block'):
+        src.map_blocks(np.negative, block=(5,))
+    with pytest.raises(ValueError, match='shape'):
+        src.map_blocks(lambda x: x[1:])
+
+    def fail(x):
+        raise ZeroDivisionError
+
+    with pytest.raises(ZeroDivisionError):
+        src.map_blocks(fail, workers=2)
+    np.testing.assert_array_equal(src[()], data)
@@ -20,10 +20,12 @@ import pathlib
 import os
 import sys
 import numpy as np
+from numpy.lib.recfunctions import repack_fields
 import platform
 import pytest
 import threading
 from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
 from h5py import File, Dataset
 from h5py._hl.base import is_empty_dataspace, product
@@ -284,6 +286,31 @@ class TestReadDirectly:
         with pytest.raises(TypeError):
             dset.read_direct(arr)
 
+    def test_strided(self, writable_file):
+        data = np.arange(60, dtype='int64').reshape(6, 10)
+        dset = writable_file.create_dataset(make_name(), data=data)
+        arr = np.zeros((12, 10), dtype='int64')
+        dset.read_direct(arr[::2])
+        np.testing.assert_array_equal(arr[::2], data)
+        np.testing.assert_array_equal(arr[1::2], 0)
+
+        arr = np.zeros((5, 20), dtype='int64')
+        dest = arr[1:, ::3]  # shape (4, 7)
+        dset.read_direct(dest, np.s_[1:3, 2:9], np.s_[2:4, :])
+        expected = np.zeros((5, 20), dtype='int64')
+        expected[1:, ::3][2:4] = data[1:3, 2:9]
+        np.testing.assert_array_equal(arr, expected)
+
+    def test_strided_broadcast(self, writable_file):
+        data = np.arange(60, dtype='int64').reshape(6, 10)
+        dset = writable_file.create_dataset(make_name(), data=data)
+        arr = np.zeros((8, 20), dtype='int64')
+        dest = arr[::2, ::2]  # shape (4, 10)
+        dset.read_direct(dest, np.s_[2, 0:10], np.s_[:, 0:10])
+        np.testing.assert_array_equal(dest, np.broadcast_to(data[2], (4, 10)))
+        np.testing.assert_array_equal(arr[1::2], 0)
+        np.testing.assert_array_equal(arr[:, 1::2], 0)
+
     def test_zero_length(self, writable_file):
         shape = (0, 20)
         dset = writable_file.create_dataset(make_name(), shape, dtype=np.int64)
@@ -335,6 +362,17 @@ class TestWriteDirectly:
         with pytest.raises(TypeError):
             dset.write_direct(arr)
 
+    def test_strided(self, writable_file):
+        dset = writable_file.create_dataset(make_name(), (4, 5), dtype='int32', fillvalue=-1)
+        arr = np.arange(200).reshape(10, 20)
+        dset.write_direct(arr[::3, 2:12:2])
+        np.testing.assert_array_equal(dset[()], arr[::3, 2:12:2])
+
+        dset.write_direct(arr[1::2, ::4], np.s_[1:3, 2:], np.s_[:2, :3])
+        expected = arr[::3, 2:12:2].copy()
+        expected[:2, :3] = arr[1::2, ::4][1:3, 2:]
+        np.testing.assert_array_equal(dset[()], expected)
+
 
 class TestCreateRequire(BaseDataset):
 
@@ -1315,6 +1353,48 @@ class TestIter(BaseDataset):
         with self.assertRaises(TypeError):
             [x for x in dset]
 
+    def test_iter_chunked(self):
+        """ Iterating over a chunked dataset reads whole chunks """
+        data = np.arange(100, dtype='i4').reshape((25, 4))
+        dset = self.f.create_dataset(
+            make_name(), data=data, chunks=(10, 2), compression='gzip'
+        )
+        orig_getitem = type(dset).__getitem__
+
+        def iter_reads(block_size):
+            reads = []
+
+            def spy(ds, args, **kwargs):
+                reads.append(args)
+                return orig_getitem(ds, args, **kwargs)
+
+            with mock.patch.object(type(dset), '__getitem__', spy), \
+                    mock.patch.object(h5py._hl.dataset, 'ITER_BLOCK_SIZE', block_size):
+                rows = list(dset)
+            self.assertArrayEqual(np.array(rows), data)
+            return reads
+
+        # Rows are 16 bytes: as many chunks as fit in the block size...
+        self.assertEqual(iter_reads(400), [slice(0, 20), slice(20, 25)])
+        # ... but at least one
+        self.assertEqual(iter_reads(100), [slice(0, 10), slice(10, 20), slice(20, 25)])
+
+    def test_iter_rows(self):
+        """ iter_rows reads blocks of the requested size """
+        data = np.arange(7, dtype='f8')
+        dset = self.f.create_dataset(make_name(), data=data)
+        for block_rows in (1, 3, 7, 20):
+            rows = list(dset.iter_rows(block_rows=block_rows))
+            self.assertEqual(rows, list(data))
+            self.assertIsInstance(rows[0], np.float64)
+        with self.assertRaises(ValueError):
+            dset.iter_rows(block_rows=0)
+
+    def test_iter_empty(self):
+        """ Iterating over a dataset with no rows yields nothing """
+        dset = self.f.create_dataset(make_name(), shape=(0, 3), dtype='i2')
+        self.assertEqual(list(dset), [])
+
 
 class TestStrings(BaseDataset):
 
@@ -1496,6 +1576,117 @@ class TestStrings(BaseDataset):
             ds.asstr()[:1], np.array([data], dtype=object)
         )
 
+    def test_asstr_array_errors(self):
+        """ Errors policy applies to every element of an array read """
+        data = np.array([b'ok', b'f\xe0ilte', b'', b'\xff'], dtype=object)
+        ds = self.f.create_dataset(make_name(), data=data, dtype=h5py.string_dtype('ascii'))
+        with self.assertRaises(UnicodeDecodeError):
+            ds.asstr()[:]
+        np.testing.assert_array_equal(
+            ds.asstr(errors='ignore')[:], np.array(['ok', 'filte', '', ''], dtype=object)
+        )
+        out = ds.asstr(errors='surrogateescape')[1:]
+        self.assertEqual([s.encode('ascii', 'surrogateescape') for s in out], list(data[1:]))
+        np.testing.assert_array_equal(
+            ds.asstr('latin-1')[:], np.array([b.decode('latin-1') for b in data], dtype=object)
+        )
+
+    def test_asstr_selections(self):
+        """ Vlen strings are decoded for any selection """
+        data = np.array([f'fàilte {i}' for i in range(24)], dtype=object).reshape(4, 6)
+        ds = self.f.create_dataset(make_name(), data=data, dtype=h5py.string_dtype())
+        wrap = ds.asstr()
+        for sel in [np.s_[()], np.s_[...], np.s_[1:3, ::2], np.s_[[3, 0], 2],
+                    np.s_[data == 'fàilte 7'], np.s_[2, 1:1], np.s_[2, 5]]:
+            out = wrap[sel]
+            np.testing.assert_array_equal(out, data[sel])
+            if isinstance(out, np.ndarray):
+                self.assertEqual(out.dtype, object)
+            else:
+                self.assertIsInstance(out, str)
+
+    def test_asstr_unwritten(self):
+        """ Unwritten vlen strings (NULL pointers) decode as empty strings """
+        ds = self.f.create_dataset(make_name(), (3,), maxshape=(None,), dtype=h5py.string_dtype())
+        ds[0] = 'x'
+        ds.resize((5,))
+        np.testing.assert_array_equal(ds.asstr()[:], np.array(['x', '', '', '', ''], dtype=object))
+
+    def test_asstr_fixed_array(self):
+        """ Fixed-length strings keep embedded NULs, but not trailing ones """
+        data = np.array([b'ab', b'a\x00b', b'', 'cù'.encode()], dtype='S4')
+        ds = self.f.create_dataset(make_name(), data=data)
+        np.testing.assert_array_equal(
+            ds.asstr('utf-8')[:], np.array(['ab', 'a\x00b', '', 'cù'], dtype=object)
+        )
+
+    def test_asstr_bad_dtype(self):
+        ds = self.f.create_dataset(make_name(), (10,), dtype=h5py.string_dtype())
+        with self.assertRaises(TypeError):
+            ds.asstr(dtype='f4')
+
+    def test_read_strings_lowlevel(self):
+        """ DatasetID.read_strings decodes a selection of vlen strings """
+        data = np.array(['a', 'bé', 'c€'], dtype=object)
+        ds = self.f.create_dataset(make_name(), data=data, dtype=h5py.string_dtype())
+        fspace = ds.id.get_space()
+        fspace.select_hyperslab((1,), (2,))
+        out = ds.id.read_strings(h5py.h5s.create_simple((2,)), fspace, (2,), 'utf-8')
+        np.testing.assert_array_equal(out, data[1:])
+        fixed = self.f.create_dataset(make_name('fixed'), data=np.array([b'a'], dtype='S1'))
+        with self.assertRaises(TypeError):
+            fixed.id.read_strings(h5py.h5s.create_simple((1,)), fixed.id.get_space(), (1,), 'ascii')
+
+    def test_read_strings_buffers(self):
+        data = np.array(['a', 'bé', '', 'c€d'], dtype=object)
+        ds = self.f.create_dataset(make_name(), (5,), dtype=h5py.string_dtype())
+        ds[:4] = data
+        offsets, buf = ds.read_strings_buffers()
+        self.assertEqual(offsets.dtype, np.dtype('int64'))
+        self.assertEqual(buf.dtype, np.dtype('uint8'))
+        np.testing.assert_array_equal(offsets, [0, 1, 4, 4, 9, 9])
+        self.assertEqual(bytes(buf), 'abéc€d'.encode())
+
+        # Selections, with repeated and reordered indices
+        offsets, buf = ds.read_strings_buffers(np.s_[[3, 1, 1]])
+        np.testing.assert_array_equal(offsets, [0, 5, 8, 11])
+        self.assertEqual(bytes(buf), 'c€dbébé'.encode())
+        offsets, buf = ds.read_strings_buffers(np.s_[5:])
+        np.testing.assert_array_equal(offsets, [0])
+        self.assertEqual(buf.shape, (0,))
+
+    def test_write_strings_buffers(self):
+        ds = self.f.create_dataset(make_name(), (2, 3), dtype=h5py.string_dtype())
+        buf = np.frombuffer('xxabcdé'.encode(), dtype=np.uint8)
+        # offsets[0] needn't be 0
+        ds.write_strings_buffers(np.s_[1], [2, 3, 3, 8], buf)
+        np.testing.assert_array_equal(
+            ds.asstr()[:], np.array([['', '', ''], ['a', '', 'bcdé']], dtype=object)
+        )
+        ds.write_strings_buffers(np.s_[0, :2], [0, 2, 4], b'hiyo')
+        self.assertEqual(ds[0, 1], b'yo')
+        offsets, buf = ds.read_strings_buffers()
+        ds.write_strings_buffers((), offsets, buf)
+        self.assertEqual(ds[1, 2], 'bcdé'.encode())
+
+    def test_strings_buffers_errors(self):
+        ds = self.f.create_dataset(make_name(), (4,), dtype=h5py.string_dtype())
+        with self.assertRaises(ValueError):
+            ds.write_strings_buffers(np.s_[:2], [0, 2], b'ab')  # Too few offsets
+        with self.assertRaises(ValueError):
+            ds.write_strings_buffers(np.s_[:2], [0, 2, 1], b'ab')  # Decreasing
+        with self.assertRaises(ValueError):
+            ds.write_strings_buffers(np.s_[:2], [0, 1, 3], b'ab')  # Past the end
+        with self.assertRaises(ValueError):
+            ds.write_strings_buffers(np.s_[:2], [0, 1, 2], b'a\x00')
+        with self.assertRaises(TypeError):
+            ds.write_strings_buffers(np.s_[:2], [0, 1, 2], np.array([1, 2], dtype='i4'))
+        fixed = self.f.create_dataset(make_name('fixed'), data=np.array([b'a'], dtype='S1'))
+        with self.assertRaises(TypeError):
+            fixed.read_strings_buffers()
+        with self.assertRaises(TypeError):
+            fixed.id.read_strings_buffers(fixed.id.get_space())
+
     def test_unicode_write_error(self):
         """Encoding error when writing a non-ASCII string to an ASCII vlen dataset"""
         dt = h5py.string_dtype('ascii')
@@ -1554,6 +1745,17 @@ class TestCompound(BaseDataset):
         self.assertTrue(np.all(outdata == testdata))
         self.assertEqual(outdata.dtype, testdata.dtype)
 
+    def test_field_and_slice(self):
+        """ Field names can be mixed with slices when reading """
+        dt = np.dtype([('a', 'i4'), ('b', 'f8'), ('c', 'u1')])
+        data = np.zeros(5, dtype=dt)
+        data['a'] = np.arange(5)
+        data['b'] = np.arange(5) / 2
+        dset = self.f.create_dataset(make_name(), data=data)
+        self.assertArrayEqual(dset['a', 1:3], data['a'][1:3])
+        self.assertArrayEqual(dset[1:3, 'b'], data['b'][1:3])
+        self.assertArrayEqual(dset['a', 'b', ::2], repack_fields(data[['a', 'b']][::2]))
+
     def test_assign(self):
         dt = np.dtype([ ('weight', (np.float64, 3)),
                          ('endpoint_type', np.uint8), ])
@@ -1978,6 +2180,63 @@ class TestVlen(BaseDataset):
 
         assert all(ds[0] == y[::2]), f"{ds[0]} != {y[::2]}"
 
+    def test_read_ragged(self):
+        """ Sequences are read as flat values and Arrow-style offsets """
+        ds = self.f.create_dataset(make_name(), (3, 2), dtype=h5py.vlen_dtype('f4'))
+        seqs = [np.arange(i % 4, dtype='f4') * i for i in range(6)]
+        for i, seq in enumerate(seqs):
+            ds[i // 2, i % 2] = seq
+        values, offsets = ds.read_ragged()
+        self.assertEqual(values.dtype, np.dtype('f4'))
+        self.assertEqual(offsets.dtype, np.dtype('i8'))
+        np.testing.assert_array_equal(offsets, [0, 0, 1, 3, 6, 6, 7])
+        np.testing.assert_array_equal(values, np.concatenate(seqs))
+
+        # Selections, in the order requested
+        values, offsets = ds.read_ragged(np.s_[[2, 0, 2], 1], dtype='f8')
+        self.assertEqual(values.dtype, np.dtype('f8'))
+        expected = [seqs[5], seqs[1], seqs[5]]
+        np.testing.assert_array_equal(offsets, [0, 1, 2, 3])
+        np.testing.assert_array_equal(values, np.concatenate(expected))
+        values, offsets = ds.read_ragged(np.s_[1:1])
+        np.testing.assert_array_equal(offsets, [0])
+        self.assertEqual(values.shape, (0,))
+
+    def test_write_ragged(self):
+        ds = self.f.create_dataset(make_name(), (5,), dtype=h5py.vlen_dtype('i4'))
+        values = np.arange(10, dtype='i8')
+        ds.write_ragged(np.s_[1:4], values, [2, 5, 5, 9])
+        np.testing.assert_array_equal(ds[0], [])
+        np.testing.assert_array_equal(ds[1], [2, 3, 4])
+        np.testing.assert_array_equal(ds[2], [])
+        np.testing.assert_array_equal(ds[3], [5, 6, 7, 8])
+        self.assertEqual(ds[3].dtype, np.dtype('i4'))
+
+        # Lists of values, and scalar datasets
+        scalar = self.f.create_dataset(make_name('scalar'), (), dtype=h5py.vlen_dtype('i2'))
+        scalar.write_ragged((), [1, 2], [0, 2])
+        np.testing.assert_array_equal(scalar[()], [1, 2])
+        values, offsets = scalar.read_ragged()
+        np.testing.assert_array_equal(values, [1, 2])
+        np.testing.assert_array_equal(offsets, [0, 2])
+
+    def test_ragged_errors(self):
+        ds = self.f.create_dataset(make_name(), (4,), dtype=h5py.vlen_dtype('i4'))
+        with self.assertRaises(ValueError):
+            ds.write_ragged(np.s_[:2], [1, 2], [0, 2])  # Too few offsets
+        with self.assertRaises(ValueError):
+            ds.write_ragged(np.s_[:2], [1, 2], [0, 2, 1])  # Decreasing
+        with self.assertRaises(ValueError):
+            ds.write_ragged(np.s_[:2], [1, 2], [0, 1, 3])  # Past the end
+        with self.assertRaises(ValueError):
+            ds.write_ragged(np.s_[:2], np.ones((2, 2)), [0, 1, 2])
+        strings = self.f.create_dataset(make_name('str'), (4,), dtype=h5py.string_dtype())
+        with self.assertRaises(TypeError):
+            strings.read_ragged()
+        plain = self.f.create_dataset(make_name('plain'), (4,), dtype='i4')
+        with self.assertRaises(TypeError):
+            plain.write_ragged((), [1], [0, 1, 1, 1, 1])
+
     def test_asstr_array_dtype(self):
         dt = h5py.string_dtype(encoding='ascii')
         fill_value = b'bar'
@@ -2065,6 +2324,67 @@ def test_chunk_iter():
         dsid.chunk_iter(callback)
 
 
+def test_get_chunk_index():
+    """DatasetID.get_chunk_index() matches get_chunk_info()"""
+    from io import BytesIO
+    buf = BytesIO()
+    name = make_name()
+    with h5py.File(buf, 'w') as f:
+        ds = f.create_dataset(name, shape=(100, 60), chunks=(10, 20), dtype='i4',
+                              compression='gzip')
+        ds[:50] = 1
+        ds[95:, 45] = 3
+
+    buf.seek(0)
+    with h5py.File(buf, 'r') as f:
+        dsid = f[name].id
+        index = dsid.get_chunk_index()
+        assert index.dtype.names == ('offset', 'filter_mask', 'byte_offset', 'size')
+        assert len(index) == dsid.get_num_chunks() == 16
+        by_offset = {tuple(int(x) for x in rec['offset']): rec for rec in index}
+        for j in range(16):
+            si = dsid.get_chunk_info(j)
+            rec = by_offset[si.chunk_offset]
+            assert rec['filter_mask'] == si.filter_mask
+            assert rec['byte_offset'] == si.byte_offset
+            assert rec['size'] == si.size
+
+
+def test_chunk_index(tmp_path):
+    """Dataset.chunk_index() sorts, caches and looks up chunks"""
+    path = tmp_path / 'chunks.h5'
+    with h5py.File(path, 'w') as f:
+        ds = f.create_dataset('x', shape=(100, 60), chunks=(10, 20), dtype='i4')
+        ds[95:, 45] = 3
+        ds[:20] = 1  # Written after, but sorted first
+        index = ds.chunk_index()
+        assert [tuple(o) for o in index['offset']] == [
+            (0, 0), (0, 20), (0, 40), (10, 0), (10, 20), (10, 40), (90, 40)
+        ]
+        assert (index['size'] > 0).all()
+        assert '_chunk_index' not in ds._cache_props
+
+        with pytest.raises(TypeError):
+            f.create_dataset('contig', shape=(10,), dtype='i4').chunk_index()
+
+    with h5py.File(path, 'r') as f:
+        ds = f['x']
+        index = ds.chunk_index()
+        assert ds.chunk_index() is index
+        assert not index.flags.writeable
+
+        found = ds.chunk_index([(0, 0), (99, 59), (65, 21)])
+        assert [tuple(o) for o in found['offset']] == [(0, 0), (90, 40), (60, 20)]
+        np.testing.assert_array_equal(found['byte_offset'][:2], index['byte_offset'][[0, -1]])
+        np.testing.assert_array_equal(found['size'], [index['size'][0], index['size'][-1], 0])
+
+        assert ds.chunk_index((10, 25))['offset'].tolist() == [10, 20]
+        with pytest.raises(ValueError):
+            ds.chunk_index([(100, 0)])
+        with pytest.raises(ValueError):
+            ds.chunk_index([(0, 0, 0)])
+
+
 def test_empty_shape(writable_file):
     ds = writable_file.create_dataset(make_name(), dtype='int32')
     assert ds.shape is None
@@ -2363,3 +2683,575 @@ def test_store_regionrefs(writable_file):
     refs_ds = writable_file.create_dataset(make_name("refs"), shape=(1,), dtype=h5py.ref_dtype)
     with pytest.raises(TypeError, match="convert"):
         refs_ds[0] = ds1.regionref[:6]
+
+
+def test_read_many(writable_file):
+    data = np.arange(200).reshape(40, 5)
+    ds = writable_file.create_dataset(make_name(), data=data)
+    sels = [
+        np.s_[10:12], np.s_[3, 2], np.s_[0:3, ::2], np.s_[30:40:3, 1],
+        np.s_[20], np.s_[15:15], h5py.MultiBlockSlice(start=13, count=2, stride=3),
+    ]
+    out = ds.read_many(sels)
+    assert len(out) == len(sels)
+    for arr, sel in zip(out, sels, strict=True):
+        expected = ds[sel]
+        assert type(arr) is type(expected)
+        np.testing.assert_array_equal(arr, expected)
+
+    # The results are views into one buffer
+    assert not out[0].flags.owndata
+    assert not out[2].flags.owndata
+
+
+@pytest.mark.parametrize('sels', [
+    [np.s_[0:10], np.s_[5:15]],             # Overlapping
+    [np.s_[0:10, 0], np.s_[0:10, 1]],       # Interleaved in file order
+    [np.s_[[1, 3]], np.s_[5]],              # Fancy indexing
+])
+def test_read_many_fallback(writable_file, sels):
+    data = np.arange(200).reshape(40, 5)
+    ds = writable_file.create_dataset(make_name(), data=data)
+    for arr, sel in zip(ds.read_many(sels), sels, strict=True):
+        np.testing.assert_array_equal(arr, data[sel])
+
+
+def test_read_many_fields(writable_file):
+    data = np.zeros(10, dtype=[('a', 'i4'), ('b', 'f8')])
+    data['a'] = np.arange(10)
+    ds = writable_file.create_dataset(make_name(), data=data)
+    a, b = ds.read_many([np.s_[2:4], ('a', np.s_[6:8])])
+    np.testing.assert_array_equal(a, data[2:4])
+    np.testing.assert_array_equal(b, data['a'][6:8])
+
+
+def test_read_many_vlen_str(writable_file):
+    data = np.array(['a', 'bc', 'def', 'ghij'], dtype=object)
+    ds = writable_file.create_dataset(
+        make_name(), data=data, dtype=h5py.string_dtype()
+    )
+    out = ds.read_many([np.s_[2:], np.s_[0]])
+    np.testing.assert_array_equal(out[0], [b'def', b'ghij'])
+    assert out[1] == b'a'
+
+
+class TestReadOut:
+    """
+        Feature: Dataset.read() can fill a caller-provided buffer
+    """
+
+    @pytest.mark.parametrize('sel', [
+        np.s_[()], np.s_[2:5], np.s_[1, ::2], np.s_[[0, 3, 4], 1:3], np.s_[3, 2],
+    ])
+    def test_numeric(self, writable_file, sel):
+        data = np.arange(40, dtype='f8').reshape(8, 5)
+        ds = writable_file.create_dataset(make_name(), data=data)
+        expected = data[sel]
+        out = np.empty(np.shape(expected), dtype='f8')
+        res = ds.read(sel, out=out)
+        assert res is out
+        np.testing.assert_array_equal(out, expected)
+
+    def test_convert(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), data=np.arange(10, dtype='i8'))
+        out = np.zeros(4, dtype='f4')
+        ds.read(np.s_[2:6], out=out)
+        np.testing.assert_array_equal(out, [2, 3, 4, 5])
+
+    def test_buffer(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), data=np.arange(10, dtype='u1'))
+        buf = bytearray(5)
+        res = ds.read(np.s_[5:], out=buf)
+        assert bytes(buf) == bytes(range(5, 10))
+        assert not res.flags.owndata
+
+    def test_mask(self, writable_file):
+        data = np.arange(10)
+        ds = writable_file.create_dataset(make_name(), data=data)
+        mask = data % 3 == 0
+        out = np.zeros(4, dtype=data.dtype)
+        ds.read(mask, out=out)
+        np.testing.assert_array_equal(out, data[mask])
+
+    def test_fields(self, writable_file):
+        data = np.zeros(6, dtype=[('a', 'i4'), ('b', 'f8'), ('c', 'i2', (2,))])
+        data['a'] = np.arange(6)
+        data['b'] = np.arange(6) / 2
+        data['c'][:, 1] = 7
+        ds = writable_file.create_dataset(make_name(), data=data)
+
+        out = np.zeros(3, dtype='f8')
+        ds.read(np.s_['b', 1:4], out=out)
+        np.testing.assert_array_equal(out, data['b'][1:4])
+
+        out = np.zeros(6, dtype=[('b', 'f8'), ('a', 'i4')])
+        ds.read(np.s_['a', 'b'], out=out)
+        np.testing.assert_array_equal(out['a'], data['a'])
+        np.testing.assert_array_equal(out['b'], data['b'])
+
+        out = np.zeros((2, 2), dtype='i2')
+        ds.read(np.s_['c', :2], out=out)
+        np.testing.assert_array_equal(out, data['c'][:2])
+
+    def test_scalar(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), data=42.0)
+        out = np.zeros((), dtype='f8')
+        ds.read(out=out)
+        assert out[()] == 42.0
+
+    def test_threads(self, writable_file):
+        data = np.arange(100, dtype='i4').reshape(10, 10)
+        ds = writable_file.create_dataset(
+            make_name(), data=data, chunks=(3, 3), compression='gzip'
+        )
+        out = np.zeros((5, 10), dtype='i4')
+        assert ds.read(np.s_[2:7], out=out, threads=2) is out
+        np.testing.assert_array_equal(out, data[2:7])
+
+    def test_wrong_shape(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), data=np.arange(10))
+        with pytest.raises(ValueError, match='shape'):
+            ds.read(np.s_[:5], out=np.zeros(4, dtype=ds.dtype))
+        with pytest.raises(ValueError, match='shape'):
+            ds.read(np.s_[[1, 2]], out=np.zeros(3, dtype=ds.dtype))
+
+    def test_not_writable(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), data=np.arange(10, dtype='u1'))
+        with pytest.raises(ValueError, match='writable'):
+            ds.read(np.s_[:5], out=np.frombuffer(bytes(5), dtype='u1'))
+
+    def test_strided(self, writable_file):
+        data = np.arange(40, dtype='f8').reshape(8, 5)
+        ds = writable_file.create_dataset(make_name(), data=data)
+        big = np.zeros((8, 10))
+        res = ds.read(out=big[:, 1::2])
+        assert res.base is big
+        np.testing.assert_array_equal(big[:, 1::2], data)
+        np.testing.assert_array_equal(big[:, ::2], 0)
+
+        out = np.zeros((3, 12, 2), dtype='i4')
+        ds.read(np.s_[2:5, 1:3], out=out[:, 4:6, 1])
+        np.testing.assert_array_equal(out[:, 4:6, 1], data[2:5, 1:3])
+        assert np.count_nonzero(out) == np.count_nonzero(data[2:5, 1:3])
+
+    def test_not_strided(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), data=np.arange(12).reshape(3, 4))
+        with pytest.raises(ValueError, match='C order'):
+            ds.read(out=np.zeros((4, 3), dtype=ds.dtype).T)
+        with pytest.raises(ValueError, match='shape'):
+            ds.read(out=np.zeros((3, 8), dtype=ds.dtype)[:, ::3])
+
+
+class TestAppender:
+
+    def make_dset(self, f, shape=(0, 3), maxshape=(None, 3), chunks=(4, 3), **kwargs):
+        return f.create_dataset(make_name(), shape=shape, maxshape=maxshape,
+                                chunks=chunks, dtype='i4', **kwargs)
+
+    def test_append(self, writable_file):
+        ds = self.make_dset(writable_file, compression='gzip')
+        data = np.arange(3 * 30).reshape(30, 3)
+        with ds.appender() as app:
+            app.append(data[0])  # A single row
+            for i in range(1, 30, 5):
+                app.append(data[i:i + 5])
+            assert len(app) == 30
+        assert ds.shape == (30, 3)
+        np.testing.assert_array_equal(ds[()], data)
+        with pytest.raises(ValueError):
+            app.append(data[0])
+
+    def test_whole_chunks(self, writable_file):
+        """Data is written a chunk at a time, and the extent grows geometrically"""
+        ds = self.make_dset(writable_file)
+        app = ds.appender()
+        app.append(np.ones((3, 3)))
+        assert ds.shape == (0, 3)  # Still buffered
+        app.append(np.ones((2, 3)))
+        assert ds.shape[0] >= 4
+        np.testing.assert_array_equal(ds[:4], 1)
+        app.append(np.ones((20, 3)))
+        assert ds.shape[0] >= 24
+        app.close()
+        assert ds.shape == (25, 3)
+        np.testing.assert_array_equal(ds[()], 1)
+
+    def test_existing_data(self, writable_file):
+        """Appending after existing data which doesn't end on a chunk boundary"""
+        ds = self.make_dset(writable_file, shape=(6, 3))
+        ds[()] = -1
+        with ds.appender() as app:
+            app.append(np.arange(9).reshape(3, 3))
+            app.append(np.arange(9).reshape(3, 3))
+        assert ds.shape == (12, 3)
+        np.testing.assert_array_equal(ds[:6], -1)
+        np.testing.assert_array_equal(ds[6:9], np.arange(9).reshape(3, 3))
+        np.testing.assert_array_equal(ds[9:], np.arange(9).reshape(3, 3))
+
+    def test_axis(self, writable_file):
+        ds = self.make_dset(writable_file, shape=(2, 0), maxshape=(2, 10), chunks=(2, 3))
+        with ds.appender(axis=1) as app:
+            app.append([1, 2])
+            app.append(np.full((2, 6), 3))
+        assert ds.shape == (2, 7)
+        np.testing.assert_array_equal(ds[:, 0], [1, 2])
+        np.testing.assert_array_equal(ds[:, 1:], 3)
+
+    def test_maxshape(self, writable_file):
+        ds = writable_file.create_dataset(
+            make_name(), shape=(0,), maxshape=(10,), chunks=(4,), dtype='i4'
+        )
+        with ds.appender() as app:
+            app.append(np.arange(6))
+            with pytest.raises(ValueError, match='maximum length'):
+                app.append(np.arange(6, 12))
+            # Nothing from the failed call is kept
+            assert len(app) == 6
+            app.append(np.arange(6, 10))
+        np.testing.assert_array_equal(ds[()], np.arange(10))
+
+    def test_flush_rows(self, writable_file):
+        ds = self.make_dset(writable_file)
+        with ds.appender(flush_rows=3) as app:
+            app.append(np.ones((2, 3)))
+            assert ds.shape == (0, 3)
+            app.append(np.ones((2, 3)))
+            assert ds.shape == (4, 3)
+            app.append(np.full((3, 3), 2))
+            assert ds.shape == (7, 3)  # Exact, not grown geometrically
+            np.testing.assert_array_equal(ds[4:], 2)
+            app.append(np.full((1, 3), 5))  # Completes a chunk
+            assert ds.shape == (8, 3)
+            app.append(np.full((1, 3), 6))
+            assert ds.shape == (8, 3)
+        assert ds.shape == (9, 3)
+        np.testing.assert_array_equal(ds[7:], [[5] * 3, [6] * 3])
+
+    def test_flush_interval(self, writable_file):
+        ds = self.make_dset(writable_file)
+        with ds.appender(flush_interval=0) as app:
+            app.append(np.ones((1, 3)))
+            assert ds.shape == (1, 3)
+
+    def test_invalid(self, writable_file):
+        ds = self.make_dset(writable_file)
+        with pytest.raises(ValueError):
+            ds.appender(axis=2)
+        with pytest.raises(ValueError):
+            ds.appender().append(np.ones((2, 4)))
+        contig = writable_file.create_dataset(make_name('c'), shape=(2, 3), dtype='i4')
+        with pytest.raises(TypeError):
+            contig.appender()
+
+
+class TestFill:
+
+    def test_fill(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), shape=(30, 4), dtype='i4')
+        ds.fill(5)
+        np.testing.assert_array_equal(ds[()], 5)
+        ds.fill(-2, np.s_[3:25:4, 1:3])
+        expected = np.full((30, 4), 5)
+        expected[3:25:4, 1:3] = -2
+        np.testing.assert_array_equal(ds[()], expected)
+        ds.fill(8, 7)
+        expected[7] = 8
+        np.testing.assert_array_equal(ds[()], expected)
+
+    def test_fill_blocks(self, writable_file, monkeypatch):
+        """Contiguous data is written in blocks of rows"""
+        monkeypatch.setattr(h5py._hl.dataset, 'ITER_BLOCK_SIZE', 80)
+        ds = writable_file.create_dataset(make_name(), shape=(25, 5), dtype='i4')
+        writes = []
+        orig_setitem = Dataset.__setitem__
+
+        def spy(dset, args, val):
+            writes.append(np.shape(val))
+            return orig_setitem(dset, args, val)
+
+        monkeypatch.setattr(Dataset, '__setitem__', spy)
+        ds.fill(1, np.s_[1:])
+        assert writes == [(4, 5)] * 6
+        np.testing.assert_array_equal(ds[1:], 1)
+        np.testing.assert_array_equal(ds[0], 0)
+
+    def test_fill_other_types(self, writable_file):
+        ds = writable_file.create_dataset(
+            make_name('s'), shape=(6,), dtype=h5py.string_dtype(), chunks=(2,)
+        )
+        ds.fill('abc', np.s_[1:])
+        assert ds.asstr()[()].tolist() == [''] + ['abc'] * 5
+
+        dt = np.dtype([('a', 'i4'), ('b', 'f8')])
+        ds = writable_file.create_dataset(make_name('c'), shape=(5,), dtype=dt)
+        ds.fill((1, 2.5))
+        np.testing.assert_array_equal(ds[()], np.array([(1, 2.5)] * 5, dtype=dt))
+
+        ds = writable_file.create_dataset(make_name('f'), shape=(5, 3), dtype='f8')
+        ds.fill(3, [0, 2, 3])
+        np.testing.assert_array_equal(ds[[0, 2, 3]], 3)
+        np.testing.assert_array_equal(ds[1], 0)
+
+    def test_fill_not_scalar(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), shape=(5,), dtype='i4')
+        with pytest.raises(ValueError):
+            ds.fill([1, 2, 3, 4, 5])
+
+        ds = writable_file.create_dataset(make_name('a'), shape=(5,), dtype='(2,)i4')
+        with pytest.raises(TypeError):
+            ds.fill(1)
+
+
+class TestStridedWrite:
+    """
+        Feature: Non-contiguous arrays are written without copying them
+    """
+
+    @pytest.mark.parametrize('view', [
+        np.s_[::2, 1:5], np.s_[:, 2:7], np.s_[3, 1:18:4], np.s_[1:9:3, ::-1],
+    ])
+    def test_write_view(self, writable_file, view):
+        arr = np.arange(200, dtype='f8').reshape(10, 20)
+        expected = arr[view]
+        ds = writable_file.create_dataset(make_name(), shape=expected.shape, dtype='f8')
+        ds[()] = expected
+        np.testing.assert_array_equal(ds[()], expected)
+
+    def test_in_place(self, writable_file, monkeypatch):
+        monkeypatch.setattr(h5py._hl.dataset, 'STRIDED_COPY_LIMIT', 0)
+        arr = np.arange(200, dtype='i4').reshape(10, 20)
+        ds = writable_file.create_dataset(make_name(), shape=(10, 20), dtype='i8')
+        with mock.patch.object(
+            h5py._hl.selections, 'strided_memory',
+            wraps=h5py._hl.selections.strided_memory,
+        ) as spy:
+            ds[2:7, ::2] = arr[::2, ::2]
+            ds[0] = arr[1:10:2, 0:20:5].reshape(-1)  # a copy, not strided
+        spy.assert_called_once()
+        expected = np.zeros((10, 20), dtype='i8')
+        expected[2:7, ::2] = arr[::2, ::2]
+        expected[0] = arr[1:10:2, 0:20:5].reshape(-1)
+        np.testing.assert_array_equal(ds[()], expected)
+
+    def test_broadcast(self, writable_file):
+        arr = np.arange(40, dtype='f4').reshape(4, 10)
+        ds = writable_file.create_dataset(make_name(), shape=(6, 5), dtype='f4')
+        ds[()] = arr[1, ::2]
+        np.testing.assert_array_equal(ds[()], np.broadcast_to(arr[1, ::2], (6, 5)))
+
+
+class TestAsMmap:
+    """
+        Feature: Contiguous datasets can be memory-mapped
+    """
+
+    @pytest.mark.parametrize('dt', ['<i4', '>f8', 'S5', [('a', 'u1'), ('b', '<f8')]])
+    def test_read(self, writable_file, dt):
+        data = np.arange(24).astype(dt).reshape(4, 6)
+        ds = writable_file.create_dataset(make_name(), data=data)
+        m = ds.as_mmap()
+        assert isinstance(m, np.memmap)
+        assert m.dtype == ds.dtype
+        np.testing.assert_array_equal(m, data)
+        assert not m.flags.writeable
+
+    def test_scalar(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), data=3.5)
+        assert ds.as_mmap()[()] == 3.5
+
+    def test_userblock(self, tmp_path):
+        with File(tmp_path / 'ub.h5', 'w', userblock_size=512) as f:
+            ds = f.create_dataset('x', data=np.arange(10))
+            np.testing.assert_array_equal(ds.as_mmap(), np.arange(10))
+
+    def test_write(self, tmp_path):
+        path = tmp_path / 'w.h5'
+        with File(path, 'w') as f:
+            m = f.create_dataset('x', data=np.zeros(5, dtype='i2')).as_mmap('r+')
+            m[2] = 7
+            m.flush()
+            del m
+        with File(path, 'r') as f:
+            np.testing.assert_array_equal(f['x'][()], [0, 0, 7, 0, 0])
+            with pytest.raises(ValueError, match='writing'):
+                f['x'].as_mmap('r+')
+
+    def test_not_contiguous(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), shape=(10,), dtype='i4', chunks=(5,))
+        with pytest.raises(TypeError, match='contiguous'):
+            ds.as_mmap()
+        ds = writable_file.create_dataset(make_name('vlen'), data=['a', 'b'], dtype=h5py.string_dtype())
+        with pytest.raises(TypeError, match='type'):
+            ds.as_mmap()
+
+    def test_not_allocated(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), shape=(10,), dtype='i4')
+        with pytest.raises(ValueError, match='allocated'):
+            ds.as_mmap()
+        with pytest.raises(ValueError, match='mode'):
+            ds.as_mmap('w+')
+
+    def test_zero_size(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), shape=(0, 3), dtype='f4')
+        arr = ds.as_mmap()
+        assert arr.shape == (0, 3)
+        assert arr.dtype == np.dtype('f4')
+        assert not arr.flags.writeable
+        assert ds.as_mmap('c').flags.writeable
+        empty = writable_file.create_dataset(make_name('empty'), data=h5py.Empty('f4'))
+        with pytest.raises(TypeError, match='Empty'):
+            empty.as_mmap()
+
+    def test_core_driver(self):
+        with File('in-memory.h5', 'w', driver='core', backing_store=False) as f:
+            ds = f.create_dataset('x', data=np.arange(10))
+            with pytest.raises(ValueError, match='core'):
+                ds.as_mmap()
+
+    def test_external_one_segment(self, tmp_path):
+        with File(tmp_path / 'ext.h5', 'w') as f:
+            ds = f.create_dataset('x', (4, 5), dtype='<i2', efile_prefix='${ORIGIN}',
+                                  external=[('raw.bin', 100, h5f.UNLIMITED)])
+            ds[()] = np.arange(20).reshape(4, 5)
+            m = ds.as_mmap()
+            assert isinstance(m, np.memmap)
+            np.testing.assert_array_equal(m, np.arange(20).reshape(4, 5))
+
+    @pytest.mark.parametrize('key', [
+        np.s_[()], np.s_[5], np.s_[-1, 3], np.s_[10:50:3, 2], np.s_[::-2],
+        np.s_[48:3:-5, ::2], np.s_[30:10], np.s_[..., 1], np.s_[[1, 5, 40]],
+    ])
+    def test_external_segments(self, tmp_path, key):
+        data = np.arange(600, dtype='<f4').reshape(60, 10)
+        with File(tmp_path / 'ext.h5', 'w') as f:
+            # Uneven segments, which split rows between files
+            external = [('a.bin', 0, 1000), ('b.bin', 16, 900), ('a.bin', 1000, h5f.UNLIMITED)]
+            ds = f.create_dataset('x', data.shape, dtype='<f4', external=external,
+                                  efile_prefix=str(tmp_path))
+            ds[()] = data
+            m = ds.as_mmap()
+            assert isinstance(m, h5py._hl.dataset.ExternalMmap)
+            assert m.shape == data.shape and len(m) == 60
+            res = m[key]
+            assert res.shape == data[key].shape
+            np.testing.assert_array_equal(res, data[key])
+            np.testing.assert_array_equal(np.asarray(m), data)
+
+    def test_external_segments_readonly(self, writable_file, tmp_path):
+        external = [('a.bin', 0, 40), ('b.bin', 0, h5f.UNLIMITED)]
+        ds = writable_file.create_dataset(make_name(), (20,), dtype='f4', external=external,
+                                          efile_prefix=str(tmp_path))
+        ds[()] = 1
+        with pytest.raises(ValueError, match="'r\\+'"):
+            ds.as_mmap('r+')
+        np.testing.assert_array_equal(ds.as_mmap('c')[()], 1)
+
+    def test_external_too_short(self, tmp_path):
+        with File(tmp_path / 'ext.h5', 'w') as f:
+            ds = f.create_dataset('x', (10,), dtype='f8', efile_prefix='${ORIGIN}',
+                                  external=[('raw.bin', 0, h5f.UNLIMITED)])
+            ds[:5] = 1
+            with pytest.raises(ValueError, match='too short'):
+                ds.as_mmap()
+
+
+class TestLazy:
+    """
+        Feature: dset.lazy builds up a selection without reading data
+    """
+
+    @pytest.mark.parametrize('keys', [
+        [np.s_[100:190], np.s_[::2], np.s_[:, 3]],
+        [np.s_[::-3, 5:1:-1], np.s_[2:]],
+        [np.s_[5]],
+        [np.s_[..., ::-7], np.s_[1:-1]],
+        [np.s_[-1, -1]],
+        [np.s_[10:0]],
+    ])
+    def test_compose(self, writable_file, keys):
+        data = np.arange(20000, dtype='i2').reshape(200, 100)
+        ds = writable_file.create_dataset(make_name(), data=data, chunks=(7, 30))
+        view = ds.lazy
+        expected = data
+        for key in keys:
+            view = view[key]
+            expected = expected[key]
+        assert view.shape == expected.shape
+        assert view.dtype == ds.dtype
+        np.testing.assert_array_equal(view.read(), expected)
+        np.testing.assert_array_equal(np.asarray(view), expected)
+
+    def test_single_read(self, writable_file, monkeypatch):
+        data = np.arange(1000).reshape(100, 10)
+        ds = writable_file.create_dataset(make_name(), data=data)
+        reads = []
+        orig_getitem = Dataset.__getitem__
+
+        def spy(dset, args, **kwargs):
+            reads.append(args)
+            return orig_getitem(dset, args, **kwargs)
+
+        monkeypatch.setattr(Dataset, '__getitem__', spy)
+        view = ds.lazy[10:90][::2][:, 3]
+        assert reads == []
+        np.testing.assert_array_equal(view.read(), data[10:90:2, 3])
+        assert reads == [(slice(10, 90, 2), 3)]
+
+    def test_fields(self, writable_file):
+        data = np.zeros(10, dtype=[('a', 'i4'), ('b', 'f8'), ('c', 'u1')])
+        data['a'] = np.arange(10)
+        data['b'] = np.arange(10) / 2
+        ds = writable_file.create_dataset(make_name(), data=data)
+        view = ds.lazy['a', 'b'][2:8]
+        assert view.dtype.names == ('a', 'b')
+        view = view['b'][::2]
+        assert view.dtype == np.dtype('f8')
+        np.testing.assert_array_equal(view.read(), data['b'][2:8:2])
+        with pytest.raises(ValueError):
+            view['a']
+        with pytest.raises(ValueError):
+            ds.lazy['a', 'b']['c']
+
+    def test_errors(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), data=np.zeros((4, 5)))
+        with pytest.raises(IndexError):
+            ds.lazy[1][5]
+        with pytest.raises(IndexError):
+            ds.lazy[1, 2, 3]
+        with pytest.raises(TypeError):
+            ds.lazy[[0, 1]]
+        with pytest.raises(IndexError):
+            ds.lazy[1, 2][0]  # Scalar view
+        with pytest.raises(TypeError):
+            len(ds.lazy[1, 2])
+
+    @pytest.mark.parametrize('chunks', [(7, 30), None])
+    @pytest.mark.parametrize('axis', [None, 0, 1, -1, (0, 1)])
+    def test_reductions(self, writable_file, monkeypatch, chunks, axis):
+        monkeypatch.setattr(h5py._hl.dataset, 'ITER_BLOCK_SIZE', 1000)
+        data = np.arange(20000, dtype='i2').reshape(200, 100)
+        ds = writable_file.create_dataset(make_name(), data=data, chunks=chunks)
+        view = ds.lazy[3:190:2, ::-3]
+        expected = data[3:190:2, ::-3]
+        for name in ['sum', 'min', 'max', 'mean']:
+            res = getattr(view, name)(axis=axis)
+            exp = getattr(expected, name)(axis=axis)
+            assert np.asarray(res).dtype == exp.dtype
+            np.testing.assert_allclose(res, exp)
+
+    def test_reduce_chunk_blocks(self, writable_file, monkeypatch):
+        """Reductions read whole chunks along the first axis of the view"""
+        monkeypatch.setattr(h5py._hl.dataset, 'ITER_BLOCK_SIZE', 1)
+        data = np.arange(20000, dtype='i2').reshape(200, 100)
+        ds = writable_file.create_dataset(make_name(), data=data, chunks=(7, 30))
+        reads = []
+        orig_getitem = Dataset.__getitem__
+
+        def spy(dset, args, **kwargs):
+            reads.append(args[0])
+            return orig_getitem(dset, args, **kwargs)
+
+        monkeypatch.setattr(Dataset, '__getitem__', spy)
+        assert ds.lazy[3:30:2].sum() == data[3:30:2].sum()
+        assert reads == [slice(3, 7, 2), slice(7, 15, 2), slice(15, 21, 2),
+                         slice(21, 29, 2), slice(29, 31, 2)]
@@ -0,0 +1,114 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2020 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Tests for the asyncio dataset methods.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from h5py._hl import aio
+
+from .common import make_name
+
+
+def test_aread(writable_file):
+    data = np.arange(100).reshape(10, 10)
+    ds = writable_file.create_dataset(make_name(), data=data)
+
+    async def main():
+        return await asyncio.gather(
+            ds.aread(np.s_[2:5]), ds.aread(np.s_[:, 3]), ds.aread(np.s_[4, 4]),
+            ds.aread(),
+        )
+
+    a, b, c, d = asyncio.run(main())
+    np.testing.assert_array_equal(a, data[2:5])
+    np.testing.assert_array_equal(b, data[:, 3])
+    assert c == data[4, 4]
+    np.testing.assert_array_equal(d, data)
+
+
+def test_aread_threads(writable_file):
+    data = np.arange(100).reshape(10, 10)
+    ds = writable_file.create_dataset(
+        make_name(), data=data, chunks=(3, 3), compression='gzip'
+    )
+    out = asyncio.run(ds.aread(np.s_[1:9], threads=2))
+    np.testing.assert_array_equal(out, data[1:9])
+
+
+def test_awrite(writable_file):
+    ds = writable_file.create_dataset(make_name(), shape=(10,), dtype='i8')
+
+    async def main():
+        await asyncio.gather(*[ds.awrite(i, i * 2) for i in range(10)])
+
+    asyncio.run(main())
+    np.testing.assert_array_equal(ds[()], np.arange(10) * 2)
+
+
+def test_aread_error(writable_file):
+    ds = writable_file.create_dataset(make_name(), data=np.arange(10))
+    with pytest.raises(IndexError):
+        asyncio.run(ds.aread(20))
+
+
+def test_aiter_chunks(writable_file):
+    data = np.arange(100).reshape(10, 10)
+    ds = writable_file.create_dataset(make_name(), data=data, chunks=(4, 5))
+
+    async def main():
+        return [item async for item in ds.aiter_chunks()]
+
+    items = asyncio.run(main())
+    assert [s for s, _ in items] == list(ds.iter_chunks())
+    for slices, block in items:
+        np.testing.assert_array_equal(block, data[slices])
+
+
+def test_aiter_chunks_cancel(writable_file):
+    ds = writable_file.create_dataset(
+        make_name(), data=np.arange(100), chunks=(10,)
+    )
+
+    async def main():
+        seen = 0
+        async for _ in ds.aiter_chunks():
+            seen += 1
+            if seen == 3:
+                break
+        return seen
+
+    assert asyncio.run(main()) == 3
+
+
+def test_aiter_chunks_not_chunked(writable_file):
+    ds = writable_file.create_dataset(make_name(), data=np.arange(10))
+    with pytest.raises(TypeError):
+        ds.aiter_chunks()
+
+
+def test_worker_bounded():
+    worker = aio.IOWorker(max_pending=2)
+    queued = []
+
+    def job(i):
+        queued.append(worker._queue.qsize())
+        return i
+
+    async def main():
+        return await asyncio.gather(*[worker.run(job, i) for i in range(20)])
+
+    assert sorted(asyncio.run(main())) == list(range(20))
+    # A slot is freed when the worker takes a call off the queue
+    assert max(queued) <= 2
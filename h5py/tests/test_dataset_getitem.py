@@ -478,21 +478,21 @@ class Test1DFloat(TestCase):
             self.dset[[100]]
 
     def test_indexlist_nonmonotonic(self):
-        """ we require index list values to be strictly increasing """
+        """ index lists in any order can be read, but not written """
+        self.assertNumpyBehavior(self.dset, self.data, np.s_[[1,3,2]])
         with self.assertRaises(TypeError):
-            self.dset[[1,3,2]]
+            self.dset[[1,3,2]] = np.zeros(3)
 
     def test_indexlist_monotonic_negative(self):
         # This should work: indices are logically increasing
         self.assertNumpyBehavior(self.dset, self.data,  np.s_[[0, 2, -2]])
-
-        with self.assertRaises(TypeError):
-            self.dset[[-2, -3]]
+        self.assertNumpyBehavior(self.dset, self.data,  np.s_[[-2, -3]])
 
     def test_indexlist_repeated(self):
-        """ we forbid repeated index values """
+        """ repeated index values can be read, but not written """
+        self.assertNumpyBehavior(self.dset, self.data, np.s_[[1,1,2]])
         with self.assertRaises(TypeError):
-            self.dset[[1,1,2]]
+            self.dset[[1,1,2]] = np.zeros(3)
 
     def test_mask_true(self):
         self.assertNumpyBehavior(
@@ -685,3 +685,229 @@ class TestZeroSizeSelectionResizableDataset(TestCase):
         sel = np.s_[0:0]
         with self.assertRaises(TypeError, msg="Can't broadcast (4,) -> (0,)"):
             self.dset1[sel] = np.arange(4)
+
+
+def _fast_read_data(dtype):
+    data = np.zeros((6, 4), dtype=dtype)
+    if dtype.names is not None:
+        data['a'] = np.arange(24).reshape(6, 4)
+        data['b'] = data['a'] / 4
+        data['s'] = b'xyz'
+        data['v'][..., 1] = 3
+    elif dtype.subdtype is not None:
+        data[...] = np.arange(data.size).reshape(data.shape)
+    else:
+        data[...] = (np.arange(24) % 2).astype(dtype).reshape(6, 4)
+    return data
+
+
+@pytest.mark.parametrize('dtype', [
+    np.dtype([('a', '<i4'), ('b', '>f8'), ('s', 'S3'), ('v', 'i2', (2,))]),
+    h5py.enum_dtype({'OFF': 0, 'ON': 1}, basetype='u1'),
+    np.dtype('?'),
+    np.dtype('S4'),
+    np.dtype(('>i4', (3,))),
+], ids=['compound', 'enum', 'bool', 'string', 'array'])
+@pytest.mark.parametrize('sel', [
+    np.s_[()], np.s_[...], np.s_[2], np.s_[1, 3], np.s_[1:5:2, ::3], np.s_[:, 2:2],
+], ids=['empty-tuple', 'ellipsis', 'int', 'int-int', 'slices', 'zero-length'])
+def test_fast_read_types(writable_file, dtype, sel):
+    """ The Cython fast reader handles fixed-size non-numeric types """
+    data = _fast_read_data(dtype)
+    ds = writable_file.create_dataset(make_name(), shape=(6, 4), dtype=dtype)
+    ds[...] = data
+    assert ds._fast_read_ok
+
+    expected = data[sel]
+    with h5py._objects.phil:
+        fast = ds._fast_reader.read(sel if isinstance(sel, tuple) else (sel,))
+    for res in (ds[sel], fast):
+        assert type(res) is type(expected)
+        np.testing.assert_array_equal(res, expected)
+        if isinstance(expected, np.ndarray):
+            assert res.dtype == expected.dtype
+
+
+def test_fast_read_enum_dtype(writable_file):
+    dt = h5py.enum_dtype({'OFF': 0, 'ON': 1}, basetype='u1')
+    ds = writable_file.create_dataset(make_name(), shape=(4,), dtype=dt)
+    assert h5py.check_enum_dtype(ds[:2].dtype) == {'OFF': 0, 'ON': 1}
+
+
+def test_fast_read_fields(writable_file):
+    """ Subsets of fields are read with a cached fast reader """
+    data = _fast_read_data(
+        np.dtype([('a', '<i4'), ('b', '>f8'), ('s', 'S3'), ('v', 'i2', (2,))])
+    )
+    name = make_name()
+    writable_file[name] = data
+    ds = writable_file[name]
+
+    np.testing.assert_array_equal(ds['b', 1:3], data['b'][1:3])
+    np.testing.assert_array_equal(ds['v', 2, 1], data['v'][2, 1])
+    res = ds['s', 'a', ::2]
+    assert res.dtype.names == ('s', 'a')
+    np.testing.assert_array_equal(res['a'], data['a'][::2])
+    np.testing.assert_array_equal(res['s'], data['s'][::2])
+    # Falls back for other selections
+    np.testing.assert_array_equal(ds['a', [0, 2, 3]], data['a'][[0, 2, 3]])
+
+
+def test_fast_read_fields_cached(tmp_path):
+    path = tmp_path / 'fields.h5'
+    data = np.zeros(5, dtype=[('a', 'i4'), ('b', 'f8')])
+    with h5py.File(path, 'w') as f:
+        f['x'] = data
+    with h5py.File(path, 'r') as f:
+        ds = f['x']
+        ds['a', 1]
+        ds['a', 2:4]
+        ds['b', 'a', 0]
+        assert len(ds._cache_props['_fields_readers']) == 2
+
+
+@pytest.mark.parametrize('dtype', [
+    h5py.string_dtype(),
+    np.dtype([('a', 'i4'), ('s', h5py.string_dtype())]),
+    h5py.vlen_dtype('i4'),
+], ids=['vlen-str', 'compound-vlen', 'vlen'])
+def test_fast_read_not_ok(writable_file, dtype):
+    ds = writable_file.create_dataset(make_name(), shape=(3,), dtype=dtype)
+    assert not ds._fast_read_ok
+
+
+_rng = np.random.default_rng(42)
+
+
+@pytest.mark.parametrize('index', [
+    np.arange(5, 900),
+    np.arange(3, 1000, 7),
+    np.sort(_rng.choice(1000, 150, replace=False)),
+    np.unique(np.concatenate([np.arange(s, s + 20) for s in _rng.choice(980, 12)])),
+    np.array([0, 1, 2, 10, 12, 14, 16, 17, 18, 19, 999]),
+], ids=['dense', 'strided', 'sparse', 'clustered', 'mixed'])
+@pytest.mark.parametrize('shape, arg', [
+    ((1000,), lambda ix: np.s_[ix]),
+    ((1000, 3), lambda ix: np.s_[ix, 1:]),
+    ((4, 1000), lambda ix: np.s_[1::2, ix]),
+    ((2, 1000, 3), lambda ix: np.s_[1, ix, 2]),
+], ids=['1d', 'first', 'last', 'middle'])
+def test_fancy_index_patterns(writable_file, index, shape, arg):
+    """ Fancy selections are built from runs of indices, or points """
+    data = np.arange(np.prod(shape)).reshape(shape)
+    ds = writable_file.create_dataset(make_name(), data=data)
+    sel = arg(index)
+    np.testing.assert_array_equal(ds[sel], data[sel])
+
+    ds[sel] = -data[sel]
+    data[sel] *= -1
+    np.testing.assert_array_equal(ds[...], data)
+
+
+class TestOrthogonalIndex:
+    """
+        Feature: Dataset.oindex selects the outer product of index lists
+    """
+
+    data = np.arange(6 * 7 * 8).reshape(6, 7, 8)
+
+    @pytest.fixture
+    def dset(self, writable_file):
+        return writable_file.create_dataset(make_name(), data=self.data)
+
+    @pytest.mark.parametrize('sel, expected', [
+        (np.s_[[1, 3, 4], :, [0, 5]],
+         lambda a: a[[1, 3, 4]][:, :, [0, 5]]),
+        (np.s_[[0, 1, 2, 5], [2, 3, 4, 6], [1, 3, 5, 7]],
+         lambda a: a[np.ix_([0, 1, 2, 5], [2, 3, 4, 6], [1, 3, 5, 7])]),
+        (np.s_[2, [0, 6], 1:7:2],
+         lambda a: a[2, [0, 6], 1:7:2]),
+        (np.s_[[1, 2], ..., [4]],
+         lambda a: a[[1, 2]][..., [4]]),
+        (np.s_[[True, False, True, False, False, True], [1], :],
+         lambda a: a[[0, 2, 5]][:, [1]]),
+        (np.s_[[], [1, 2]],
+         lambda a: a[[]][:, [1, 2]]),
+        (np.s_[3, 4, [1, 2]],
+         lambda a: a[3, 4, [1, 2]]),
+        (np.s_[1:4],
+         lambda a: a[1:4]),
+    ])
+    def test_read(self, dset, sel, expected):
+        np.testing.assert_array_equal(dset.oindex[sel], expected(self.data))
+
+    def test_points(self, writable_file):
+        # Scattered indices with little data each use a point selection
+        data = np.arange(1000 * 1000).reshape(1000, 1000)
+        ds = writable_file.create_dataset(make_name(), data=data)
+        rows = np.arange(3, 1000, 37)
+        cols = np.array([0, 2, 17, 18, 19, 500, 990])
+        np.testing.assert_array_equal(
+            ds.oindex[rows, cols], data[np.ix_(rows, cols)]
+        )
+
+    def test_write(self, dset):
+        data = self.data.copy()
+        new = -np.arange(2 * 7 * 3).reshape(2, 7, 3)
+        dset.oindex[[0, 4], :, [1, 2, 6]] = new
+        data[np.ix_([0, 4], np.arange(7), [1, 2, 6])] = new
+        np.testing.assert_array_equal(dset[...], data)
+
+    def test_fields(self, writable_file):
+        data = np.zeros((4, 5), dtype=[('x', 'i4'), ('y', 'f8')])
+        data['x'] = np.arange(20).reshape(4, 5)
+        ds = writable_file.create_dataset(make_name(), data=data)
+        res = ds.oindex['x', [0, 3], [1, 2, 4]]
+        np.testing.assert_array_equal(res, data['x'][np.ix_([0, 3], [1, 2, 4])])
+
+    def test_scalar(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), data=42)
+        assert ds.oindex[()] == 42
+
+    def test_unsorted(self, dset):
+        np.testing.assert_array_equal(
+            dset.oindex[[3, 1, 3], 2, [7, 0, 0, 5]],
+            self.data[np.ix_([3, 1, 3], [2], [7, 0, 0, 5])][:, 0],
+        )
+
+    def test_errors(self, dset):
+        with pytest.raises(TypeError, match='increasing'):
+            dset.oindex[[3, 1], [1]] = np.zeros((2, 1, 8))
+        with pytest.raises(IndexError):
+            dset.oindex[[6], [1]]
+        # Normal indexing still only allows one list
+        with pytest.raises(TypeError):
+            dset[[1, 2], [1, 2]]
+
+
+@pytest.mark.parametrize('sel', [
+    np.s_[[7, 2, 2, 9, 0], :],
+    np.s_[1:3, [4, -1, 0, 4]],
+    np.s_[_rng.integers(0, 10, 50), 2],
+    np.s_[2, [3, 3, 3]],
+], ids=['rows', 'cols-negative', 'random', 'all-same'])
+def test_unsorted_index(writable_file, sel):
+    """ Index arrays may be unsorted, with duplicates, when reading """
+    data = np.arange(50).reshape(10, 5)
+    ds = writable_file.create_dataset(make_name(), data=data)
+    expected = data[sel]
+
+    np.testing.assert_array_equal(ds[sel], expected)
+    # Python path, with type conversion
+    np.testing.assert_array_equal(ds.astype('f4')[sel], expected)
+
+    out = np.zeros(expected.shape, dtype=data.dtype)
+    assert ds.read(sel, out=out) is out
+    np.testing.assert_array_equal(out, expected)
+    out = np.zeros(expected.shape, dtype='f8')
+    assert ds.read(sel, out=out) is out
+    np.testing.assert_array_equal(out, expected)
+    with pytest.raises(ValueError, match='shape'):
+        ds.read(sel, out=np.zeros(expected.shape + (1,), dtype=data.dtype))
+
+
+def test_unsorted_index_fields(writable_file):
+    data = np.zeros(10, dtype=[('a', 'i4'), ('b', 'f4')])
+    data['a'] = np.arange(10)
+    ds = writable_file.create_dataset(make_name(), data=data)
+    np.testing.assert_array_equal(ds['a', [5, 1, 5]], [5, 1, 5])
@@ -183,3 +183,90 @@ class TestReadDirectChunkToOut:
         out = array[:, :, ::2]  # Array is not contiguous
         with pytest.raises(ValueError):
             dataset.id.read_direct_chunk((0, 0), out=out)
+
+
+class TestReadDirectChunks:
+
+    def _make_file(self, path, **kwargs):
+        data = numpy.arange(40 * 30, dtype='i4').reshape(40, 30)
+        with h5py.File(path, 'w', **kwargs) as f:
+            ds = f.create_dataset('x', shape=(40, 30), chunks=(10, 10),
+                                  dtype='i4', compression='gzip')
+            ds[:30] = data[:30]  # Leave the last row of chunks unwritten
+        offsets = [(i, j) for i in range(0, 40, 10) for j in range(0, 30, 10)]
+        return offsets[::-1]
+
+    @pytest.mark.parametrize('use_index', [False, True])
+    @pytest.mark.parametrize('userblock_size', [0, 512])
+    def test_read_chunks(self, tmp_path, use_index, userblock_size):
+        path = tmp_path / 'chunks.h5'
+        offsets = self._make_file(path, userblock_size=userblock_size)
+        with h5py.File(path, 'r') as f:
+            dsid = f['x'].id
+            index = dsid.get_chunk_index() if use_index else None
+            masks, data = dsid.read_direct_chunks(offsets, index=index)
+            for offset, mask, raw in zip(offsets, masks, data, strict=True):
+                if offset[0] == 30:
+                    assert mask == 0 and raw is None
+                else:
+                    assert isinstance(raw, memoryview)
+                    assert (mask, bytes(raw)) == dsid.read_direct_chunk(offset)
+
+    def test_coalesce(self, tmp_path, monkeypatch):
+        path = tmp_path / 'chunks.h5'
+        with h5py.File(path, 'w') as f:
+            # Interleave the chunks of two datasets in the file
+            x = f.create_dataset('x', shape=(40,), chunks=(10,), dtype='i4')
+            y = f.create_dataset('y', shape=(40,), chunks=(10,), dtype='i4')
+            for i in range(0, 40, 10):
+                x.id.write_direct_chunk((i,), numpy.arange(i, i + 10, dtype='i4').tobytes())
+                y.id.write_direct_chunk((i,), numpy.zeros(10, dtype='i4').tobytes())
+
+        preads = []
+        orig_preadv = h5py.h5d.os.preadv
+
+        def spy(fd, buffers, offset):
+            preads.append(offset)
+            return orig_preadv(fd, buffers, offset)
+
+        monkeypatch.setattr(h5py.h5d.os, 'preadv', spy)
+        offsets = [(30,), (0,), (20,), (10,)]
+        with h5py.File(path, 'r') as f:
+            dsid = f['x'].id
+            # Chunks are 40 bytes, 80 bytes apart
+            for max_gap, max_read, nreads in [
+                (1024, 1024, 1), (0, 1024, 4), (1024, 120, 2), (1024, 100, 4), (1024, 10, 4),
+            ]:
+                preads.clear()
+                _, data = dsid.read_direct_chunks(offsets, max_gap=max_gap, max_read=max_read)
+                assert len(preads) == nreads
+                for (i,), raw in zip(offsets, data, strict=True):
+                    assert bytes(raw) == numpy.arange(i, i + 10, dtype='i4').tobytes()
+
+    def test_core_driver(self, tmp_path):
+        f = h5py.File(tmp_path / 'core.h5', 'w', driver='core', backing_store=False)
+        ds = f.create_dataset('x', data=numpy.arange(20), chunks=(5,))
+        masks, data = ds.id.read_direct_chunks([(5,), (15,)])
+        f.close()
+        assert masks == [0, 0]
+        assert bytes(data[0]) == numpy.arange(5, 10).tobytes()
+        assert bytes(data[1]) == numpy.arange(15, 20).tobytes()
+
+    def test_unflushed(self, tmp_path):
+        with h5py.File(tmp_path / 'chunks.h5', 'w') as f:
+            ds = f.create_dataset('x', data=numpy.arange(20), chunks=(5,))
+            ds[5:10] = 7  # May still be in the chunk cache
+            _, data = ds.id.read_direct_chunks([(5,)])
+            assert bytes(data[0]) == numpy.full(5, 7).tobytes()
+
+    @pytest.mark.parametrize('use_index', [False, True])
+    def test_unaligned(self, writable_file, use_index):
+        ds = writable_file.create_dataset(make_name(), data=numpy.arange(20), chunks=(5,))
+        index = ds.id.get_chunk_index() if use_index else None
+        with pytest.raises(ValueError):
+            ds.id.read_direct_chunks([(5,), (7,)], index=index)
+
+    def test_wrong_rank(self, writable_file):
+        ds = writable_file.create_dataset(make_name(), shape=(20,), chunks=(5,), dtype='i4')
+        with pytest.raises(TypeError):
+            ds.id.read_direct_chunks([(0, 0)])
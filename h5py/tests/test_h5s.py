@@ -64,3 +64,39 @@ def test_modify_select():
     np.testing.assert_array_equal(
         s1.get_select_hyper_blocklist(), s2.get_select_hyper_blocklist()
     )
+
+
+def test_fancy_runs():
+    # Consecutive indices are selected as one block
+    s = Helper((100,))[np.r_[3:11, 50:62]]
+    assert s.get_select_type() == h5s.SEL_HYPERSLABS
+    np.testing.assert_array_equal(
+        s.get_select_hyper_blocklist(), [[[3], [10]], [[50], [61]]]
+    )
+    # Evenly spaced indices are selected with a stride
+    s = Helper((100, 4))[np.arange(0, 100, 3), :]
+    assert s.get_select_type() == h5s.SEL_HYPERSLABS
+    np.testing.assert_array_equal(
+        s.get_select_hyper_blocklist(),
+        Helper((100, 4))[0:100:3, :].get_select_hyper_blocklist(),
+    )
+
+
+def test_fancy_points():
+    # Scattered indices with little data each are selected as points
+    idx = [1, 4, 9, 16, 25, 36, 49]
+    s = Helper((50, 2))[idx, 1]
+    assert s.get_select_type() == h5s.SEL_POINTS
+    np.testing.assert_array_equal(
+        s.get_select_elem_pointlist(), [[i, 1] for i in idx]
+    )
+    # ... but not when each index selects a bigger block
+    s = Helper((50, 20))[idx, :]
+    assert s.get_select_type() == h5s.SEL_HYPERSLABS
+
+
+def test_fancy_no_points():
+    space = h5s.create_simple((50,))
+    Selector(space, allow_points=False).make_selection(([1, 4, 9, 16],))
+    assert space.get_select_type() == h5s.SEL_HYPERSLABS
+    assert space.get_select_npoints() == 4
@@ -84,3 +84,29 @@ def test_unregister_filter(request):
     if h5py.h5z.filter_avail(h5py.h5z.FILTER_LZF):
         res = h5py.h5z.unregister_filter(h5py.h5z.FILTER_LZF)
         assert res
+
+
+def test_lzf_buffer_roundtrip():
+    data = bytes(range(256)) * 64
+    comp = bytearray(len(data))
+    ncomp = h5z.lzf_compress_buffer(data, comp)
+    assert 0 < ncomp < len(data)
+
+    out = bytearray(len(data))
+    nout = h5z.lzf_decompress_buffer(bytes(comp[:ncomp]), out)
+    assert nout == len(data)
+    assert bytes(out) == data
+
+    # Output too small: no error, but nothing written
+    assert h5z.lzf_decompress_buffer(bytes(comp[:ncomp]), bytearray(10)) == 0
+
+
+def test_lzf_buffer_incompressible():
+    data = bytes(range(16))
+    assert h5z.lzf_compress_buffer(data, bytearray(len(data))) == 0
+
+
+def test_fletcher32():
+    # HDF5 sums big-endian 16-bit words; an odd final byte is zero-padded
+    assert h5z.fletcher32(b'') == 0
+    assert h5z.fletcher32(b'abcde') == 0x4FF029C7
@@ -184,3 +184,42 @@ def test_resized_read(writable_file):
         [s.encode() for s in l] + [b''] * 7, dtype=object
     ))
     np.testing.assert_array_equal(d.astype('T')[:], np.array(l + [''] * 7, dtype='T'))
+
+
+def test_asstr_dtype_T(writable_file):
+    data = np.array(["fàilte", "", "ok", "\U0001F600"], dtype=object)
+    ds = writable_file.create_dataset(make_name(), data=data, dtype=h5py.string_dtype())
+    a = ds.asstr(dtype="T")[:]
+    assert a.dtype.kind == "T"
+    np.testing.assert_array_equal(a, data.astype("T"))
+    np.testing.assert_array_equal(ds.asstr(dtype="T")[[3, 0]], data[[3, 0]].astype("T"))
+    assert ds.asstr(dtype="T")[0] == "fàilte"
+
+    # Errors policy and other encodings
+    np.testing.assert_array_equal(
+        ds.asstr("ascii", "replace", dtype="T")[:1], np.array(["f\ufffd\ufffdilte"], dtype="T")
+    )
+    with pytest.raises(UnicodeDecodeError):
+        ds.asstr("ascii", dtype="T")[:]
+    np.testing.assert_array_equal(
+        ds.asstr("latin-1", dtype="T")[:1], np.array(["fÃ\xa0ilte"], dtype="T")
+    )
+
+
+def test_asstr_dtype_T_invalid_utf8(writable_file):
+    data = np.array([b"ok", b"\xc0\xaf", b"\xed\xa0\x80", b"a\xc3"], dtype=object)
+    ds = writable_file.create_dataset(make_name(), data=data, dtype=h5py.string_dtype())
+    with pytest.raises(UnicodeDecodeError):
+        ds.asstr(dtype="T")[:]
+    np.testing.assert_array_equal(
+        ds.asstr(errors="replace", dtype="T")[:],
+        np.array([b.decode("utf-8", "replace") for b in data], dtype="T"),
+    )
+
+
+def test_asstr_dtype_T_fixed(writable_file):
+    data = np.array([b"ab", "cù".encode(), b""], dtype="S4")
+    ds = writable_file.create_dataset(make_name(), data=data)
+    a = ds.asstr("utf-8", dtype="T")[:]
+    assert a.dtype.kind == "T"
+    np.testing.assert_array_equal(a, np.array(["ab", "cù", ""], dtype="T"))
@@ -12,6 +12,8 @@
 """
 
 import numpy as np
+import pytest
+
 import h5py
 import h5py._hl.selections as sel
 import h5py._hl.selections2 as sel2
@@ -140,3 +142,151 @@ class TestSelection(BaseSelection):
         # args is a single Selection instance, but args shape doesn't match Shape
         with self.assertRaises(TypeError):
             sel.select((100,), st3, dset)
+
+
+def _check_mask(mask):
+    selection = sel.select(mask.shape, mask)
+    assert selection.nselect == np.count_nonzero(mask)
+    assert selection.mshape == (np.count_nonzero(mask),)
+    if not isinstance(selection, sel.PointSelection):
+        # Check the hyperslabs cover exactly the True elements
+        selected = np.zeros(mask.shape, dtype=bool)
+        for start, end in selection.id.get_select_hyper_blocklist():
+            selected[tuple(slice(a, b + 1) for a, b in zip(start, end))] = True
+        np.testing.assert_array_equal(selected, mask)
+    return selection
+
+
+def _spy_slabs(monkeypatch):
+    """ Record the hyperslabs passed to _selector.select_hyperslabs """
+    calls = []
+    orig = sel._selector.select_hyperslabs
+
+    def spy(space, slabs):
+        calls.append(slabs)
+        return orig(space, slabs)
+
+    monkeypatch.setattr(sel._selector, 'select_hyperslabs', spy)
+    return calls
+
+
+def test_mask_runs(monkeypatch):
+    """ Runs of True in a mask are selected as hyperslab blocks """
+    calls = _spy_slabs(monkeypatch)
+    mask = np.zeros((6, 20), dtype=bool)
+    mask[1:4, 2:9] = True
+    mask[1, 15:] = True
+    mask[5, :] = True
+    selection = _check_mask(mask)
+    assert selection.id.get_select_type() == h5py.h5s.SEL_HYPERSLABS
+    # Identical runs in consecutive rows are merged
+    (slabs,) = calls
+    np.testing.assert_array_equal(slabs[:, 0], [[1, 2], [1, 15], [5, 0]])
+    np.testing.assert_array_equal(slabs[:, 3], [[3, 7], [1, 5], [1, 20]])
+
+
+def test_mask_runs_3d(monkeypatch):
+    calls = _spy_slabs(monkeypatch)
+    mask = np.zeros((3, 4, 30), dtype=bool)
+    mask[:, 1:, 5:25] = True  # Blocks are not merged across the first axis
+    mask[1, 0, ::2] = True
+    _check_mask(mask)
+    (slabs,) = calls
+    assert len(slabs) == 18
+
+
+def test_mask_scattered():
+    """ Scattered True values are still selected as points """
+    mask = np.zeros(100, dtype=bool)
+    mask[::3] = True
+    assert isinstance(_check_mask(mask), sel.PointSelection)
+    assert isinstance(_check_mask(np.zeros((3, 4), dtype=bool)), sel.PointSelection)
+
+
+def test_mask_scattered_skips_runs(monkeypatch):
+    """ Scattered masks don't need the full run-length pass """
+    def fail(mask):
+        raise AssertionError("_mask_runs called")
+
+    monkeypatch.setattr(sel, '_mask_runs', fail)
+    mask = np.zeros((20, 30), dtype=bool)
+    mask[::2, ::3] = True
+    assert isinstance(_check_mask(mask), sel.PointSelection)
+
+
+def test_mask_batches(monkeypatch):
+    """ Large masks are scanned in pieces, which must give the same result """
+    rng = np.random.default_rng(0)
+    mask = rng.random((40, 50)) < 0.9
+    calls = _spy_slabs(monkeypatch)
+    _check_mask(mask)
+    monkeypatch.setattr(sel, 'MASK_BATCH_SIZE', 120)
+    _check_mask(mask)
+    np.testing.assert_array_equal(calls[0], calls[1])
+
+
+@pytest.mark.parametrize('shape', [(1000,), (40, 50), (3, 7, 20)])
+def test_min_blocks_batches(monkeypatch, shape):
+    """ The lower bound on blocks is the same when computed in pieces """
+    rng = np.random.default_rng(0)
+    mask = rng.random(shape) < 0.6
+    starts = mask.copy()
+    starts[..., 1:] &= ~mask[..., :-1]
+    expected = starts.copy()
+    if mask.ndim > 1:
+        expected[..., 1:, :] &= ~starts[..., :-1, :]
+    for batch in (2**24, 120, 1):
+        monkeypatch.setattr(sel, 'MASK_BATCH_SIZE', batch)
+        assert sel._min_blocks(mask) == np.count_nonzero(expected)
+
+
+def test_mask_read_write(writable_file):
+    rng = np.random.default_rng(0)
+    data = np.arange(4 * 5 * 60).reshape(4, 5, 60)
+    ds = writable_file.create_dataset(make_name(), data=data)
+    for mask in [rng.random(data.shape) < p for p in (0.1, 0.5, 0.97)]:
+        np.testing.assert_array_equal(ds[mask], data[mask])
+        ds[mask] = -data[mask]
+        np.testing.assert_array_equal(ds[~mask], data[~mask])
+        ds[...] = data
+
+
+@pytest.mark.parametrize('view', [
+    np.s_[:, ::2],
+    np.s_[::2, 1:5],
+    np.s_[1:4, 3],
+    np.s_[:, None, 2:9:3],
+    np.s_[2:3, ::5],
+])
+def test_strided_memory(view):
+    arr = np.arange(60).reshape(5, 12)[view]
+    base, mspace = sel.strided_memory(arr)
+    assert base.flags.c_contiguous
+    assert base.ctypes.data == arr.ctypes.data
+    assert mspace.shape == base.shape
+    assert mspace.get_select_npoints() == arr.size
+
+    # The selected elements of base are the elements of arr
+    picked = np.zeros(base.shape, dtype=bool)
+    for start, end in mspace.get_select_hyper_blocklist():
+        picked[tuple(slice(s, e + 1) for s, e in zip(start, end))] = True
+    # base may extend past the end of the data, so only touch picked elements
+    np.testing.assert_array_equal(base[picked], arr.ravel())
+
+
+def test_strided_memory_3d():
+    arr = np.arange(60).reshape(5, 3, 4)[:, ::2, 1:3]
+    base, mspace = sel.strided_memory(arr)
+    assert mspace.get_select_npoints() == arr.size
+
+
+@pytest.mark.parametrize('view', [
+    np.s_[::-1],
+    np.s_[:, ::-2],
+])
+def test_strided_memory_unsupported(view):
+    arr = np.arange(60).reshape(5, 12)
+    assert sel.strided_memory(arr[view]) is None
+    assert sel.strided_memory(arr.T) is None
+    assert sel.strided_memory(np.broadcast_to(arr[0], (3, 12))) is None
+    assert sel.strided_memory(np.zeros((4, 3), dtype=object)[::2]) is None
@@ -22,3 +22,14 @@ cdef int require_tuple(object tpl, int none_allowed, int size, char* name) excep
 
 cdef object create_numpy_hsize(int rank, hsize_t* dims)
 cdef object create_hsize_array(object arr)
+
+cdef enum:
+    CODEC_OTHER
+    CODEC_UTF8
+    CODEC_ASCII
+    CODEC_LATIN1
+
+cdef int string_codec(object encoding) except -1
+cdef object decode_chars(const char* buf, Py_ssize_t size, int codec,
+                         const char* encoding, const char* errors)
+cdef Py_ssize_t fixed_length(const char* buf, Py_ssize_t itemsize)
@@ -11,8 +11,15 @@
 
 from numpy cimport ndarray, import_array,\
                    NPY_UINT16, NPY_UINT32, NPY_UINT64,  npy_intp,\
-                   PyArray_SimpleNew, PyArray_FROM_OTF,\
+                   PyArray_SimpleNew, PyArray_FROM_OTF, PyArray_DATA,\
                    NPY_ARRAY_C_CONTIGUOUS, NPY_ARRAY_NOTSWAPPED, NPY_ARRAY_FORCECAST
+from cpython.bytes cimport PyBytes_Check, PyBytes_AS_STRING, PyBytes_GET_SIZE
+from cpython.ref cimport PyObject, Py_INCREF, Py_XDECREF
+from cpython.unicode cimport PyUnicode_Decode, PyUnicode_DecodeUTF8,\
+                             PyUnicode_DecodeASCII, PyUnicode_DecodeLatin1
+
+import codecs
+import numpy as np
 
 # Initialization
 import_array()
@@ -186,3 +193,123 @@ cdef int require_tuple(object tpl, int none_allowed, int size, char* name) excep
     msg = b"%s must be a tuple%s%s." % (name, smsg, nmsg)
     PyErr_SetString(ValueError, msg)
     return -1
+
+
+# === String decoding =========================================================
+
+cdef int string_codec(object encoding) except -1:
+    # Find which of the codecs decode_chars() calls directly matches an
+    # encoding name.  Raises LookupError for unknown encodings.
+
+    name = codecs.lookup(encoding).name
+    if name == 'utf-8':
+        return CODEC_UTF8
+    if name == 'ascii':
+        return CODEC_ASCII
+    if name == 'iso8859-1':
+        return CODEC_LATIN1
+    return CODEC_OTHER
+
+
+cdef object decode_chars(const char* buf, Py_ssize_t size, int codec,
+                         const char* encoding, const char* errors):
+    # Decode size bytes from buf to a str, skipping the codec registry for
+    # the encodings HDF5 knows about.
+
+    if codec == CODEC_UTF8:
+        return PyUnicode_DecodeUTF8(buf, size, errors)
+    if codec == CODEC_ASCII:
+        return PyUnicode_DecodeASCII(buf, size, errors)
+    if codec == CODEC_LATIN1:
+        return PyUnicode_DecodeLatin1(buf, size, errors)
+    return PyUnicode_Decode(buf, size, encoding, errors)
+
+
+cdef Py_ssize_t fixed_length(const char* buf, Py_ssize_t itemsize):
+    # Length of a fixed-length string without its trailing NULs, as NumPy
+    # sees it.
+
+    while itemsize > 0 and buf[itemsize - 1] == 0:
+        itemsize -= 1
+    return itemsize
+
+
+def decode_strings(ndarray arr not None, encoding, errors='strict',
+                   bint pointers=False):
+    """(NDARRAY arr, STRING encoding, STRING errors='strict',
+        BOOL pointers=False) => NDARRAY
+
+    Decode an array of bytes to an object array of str with the same shape,
+    like calling bytes.decode(encoding, errors) on each element.  arr may
+    be an object array of bytes, as read from variable-length strings, or
+    a fixed-length bytes ('S') array.
+
+    If pointers is True, arr is instead a uintp array of char* pointers to
+    NUL-terminated strings (or NULL for empty strings), as read from
+    variable-length strings with the dataset's own type as the memory type.
+    The strings are freed as they are decoded, even if decoding fails.
+    """
+    cdef ndarray out
+    cdef PyObject** out_data
+    cdef PyObject** in_objs = NULL
+    cdef const char* in_chars = NULL
+    cdef char** in_ptrs = NULL
+    cdef Py_ssize_t i = 0, n, itemsize = 0
+    cdef int codec
+
+    if pointers:
+        if arr.dtype != np.uintp:
+            raise TypeError("Pointers must be passed as a uintp array")
+    elif arr.dtype.kind == 'S':
+        itemsize = arr.dtype.itemsize
+    elif arr.dtype.kind != 'O':
+        raise TypeError("Can't decode array of type %s" % arr.dtype)
+
+    arr = np.require(arr, requirements='C')
+    n = arr.size
+    if pointers:
+        in_ptrs = <char**>PyArray_DATA(arr)
+    elif itemsize:
+        in_chars = <const char*>PyArray_DATA(arr)
+    else:
+        in_objs = <PyObject**>PyArray_DATA(arr)
+
+    try:
+        codec = string_codec(encoding)
+        b_encoding = encoding.encode('ascii')
+        b_errors = errors.encode('ascii')
+        out = np.empty((<object>arr).shape, dtype=object)
+        out_data = <PyObject**>PyArray_DATA(out)
+
+        while i < n:
+            if pointers:
+                if in_ptrs[i] is NULL:
+                    s = ''
+                else:
+                    s = decode_chars(in_ptrs[i], strlen(in_ptrs[i]),
+                                     codec, b_encoding, b_errors)
+                    free(in_ptrs[i])
+                    in_ptrs[i] = NULL
+            elif itemsize:
+                s = decode_chars(in_chars + i * itemsize,
+                                 fixed_length(in_chars + i * itemsize, itemsize),
+                                 codec, b_encoding, b_errors)
+            else:
+                b = <object>in_objs[i]
+                if PyBytes_Check(b):
+                    s = decode_chars(PyBytes_AS_STRING(b), PyBytes_GET_SIZE(b),
+                                     codec, b_encoding, b_errors)
+                else:
+                    s = b.decode(encoding, errors)
+            Py_INCREF(s)
+            Py_XDECREF(out_data[i])
+            out_data[i] = <PyObject*>s
+            i += 1
+    finally:
+        if pointers:
+            while i < n:
+                free(in_ptrs[i])
+                in_ptrs[i] = NULL
+                i += 1
+
+    return out